@@ -149,6 +149,15 @@ if "single_style" not in st.session_state:
 style = st.sidebar.selectbox("Style:", ["European", "American"], index=["European", "American"].index(st.session_state.single_style))
 st.session_state.single_style = style
 
+# American Pricing Engine
+if "single_engine" not in st.session_state:
+    st.session_state.single_engine = 'Binomial'
+engine_labels = {"Binomial": "Binomial (CRR)", "BaroneAdesiWhaley": "Barone-Adesi-Whaley"}
+engine = st.sidebar.selectbox("American Engine:", list(engine_labels), format_func=engine_labels.get, 
+                              index=list(engine_labels).index(st.session_state.single_engine), disabled=style != 'American')
+st.session_state.single_engine = engine
+engine = engine if style == 'American' else None
+
 # Spot Step Slider
 if "single_spot_step" not in st.session_state:
     st.session_state.single_spot_step = 0.05
@@ -173,12 +182,33 @@ iv_step_raw_value = st.sidebar.slider('IV Step Slider:',
 iv_step = iv_step_raw_value / 100
 st.session_state.single_iv_step = iv_step
 
+# Days Forward Slider (frames of the scenario cube, no repricing)
+expiry_days = (expiration_date - datetime.today().date()).days
+cube_days = [int(d) for d in np.unique(np.linspace(0, expiry_days, min(expiry_days, 60) + 1).round())]
+days_forward = st.sidebar.select_slider('Days Forward:', options=cube_days, value=0)
+
+# Heatmap Metric
+heatmap_metrics = ['PnL', 'Delta', 'Gamma', 'Vega', 'Theta', 'Vanna', 'Charm']
+if "single_heatmap" not in st.session_state:
+    st.session_state.single_heatmap = 'PnL'
+heatmap_metric = st.sidebar.selectbox("Heatmap:", heatmap_metrics, index=heatmap_metrics.index(st.session_state.single_heatmap))
+st.session_state.single_heatmap = heatmap_metric
+
+# Heatmap Renderer
+heatmap_renderers = ['Interactive', 'Image']
+if "single_renderer" not in st.session_state:
+    st.session_state.single_renderer = 'Interactive'
+renderer = st.sidebar.selectbox("Heatmap Renderer:", heatmap_renderers, index=heatmap_renderers.index(st.session_state.single_renderer))
+st.session_state.single_renderer = renderer
+
 # --- Streamlit App Output --- 
 if all(v is not None for v in [spot, iv, px, strike, rate, time, dividend_yield, ticker, 
                                option_type, direction, spot_step, iv_step]):
     if all(v >= 0 for v in [spot, iv, px, strike, rate, time, dividend_yield]):
-        # Greek Calculation
-        bs = BlackScholes(k=strike, s=spot,r=rate, t=time, iv=iv, b=dividend_yield)
+        # Greek Calculation (memoized, with American Greeks from the selected engine)
+        greeks = option_greeks(k=strike, s=spot, r=rate, t=time, iv=iv, b=dividend_yield, 
+                               option_type=option_type, style=style, engine=engine)
+        delta, gamma, vega, volga, theta, rho, vanna, charm = [greeks[g] for g in ['delta', 'gamma', 'vega', 'volga', 'theta', 'rho', 'vanna', 'charm']]
 
         col1, col2 = st.columns([1,4])
         # Greeks Output
@@ -206,14 +236,14 @@ if all(v is not None for v in [spot, iv, px, strike, rate, time, dividend_yield,
                 }}
                 </style>
                 <div class="greeks-container">
-                    <p>Delta: <span>{bs.delta(option_type)*exposure:.2f}</span></p>
-                    <p>Gamma: <span>{bs.gamma()*exposure:.2f}</span></p>
-                    <p>Vega: <span>{bs.vega()*exposure:.2f}</span></p>
-                    <p>Volga: <span>{bs.volga()*exposure:.2f}</span></p>
-                    <p>Theta: <span>{bs.theta(option_type)*exposure:.2f}</span></p>
-                    <p>Rho: <span>{bs.rho(option_type)*exposure:.2f}</span></p>
-                    <p>Vanna: <span>{bs.vanna()*exposure:.2f}</span></p>
-                    <p>Charm: <span>{bs.charm(option_type)*exposure:.2f}</span></p>
+                    <p>Delta: <span>{delta*exposure:.2f}</span></p>
+                    <p>Gamma: <span>{gamma*exposure:.2f}</span></p>
+                    <p>Vega: <span>{vega*exposure:.2f}</span></p>
+                    <p>Volga: <span>{volga*exposure:.2f}</span></p>
+                    <p>Theta: <span>{theta*exposure:.2f}</span></p>
+                    <p>Rho: <span>{rho*exposure:.2f}</span></p>
+                    <p>Vanna: <span>{vanna*exposure:.2f}</span></p>
+                    <p>Charm: <span>{charm*exposure:.2f}</span></p>
                 </div>
                 """,
                 unsafe_allow_html=True,
@@ -222,12 +252,31 @@ if all(v is not None for v in [spot, iv, px, strike, rate, time, dividend_yield,
 
         # Graph Output
         with col2:
+                # Axis labels for the plot
                 matrix_instance = Matrix(spot=spot, px=px, iv=iv, k=strike, r=rate, t=time, b=dividend_yield, style=style, 
-                                         option_type=option_type, spot_step=spot_step, iv_step=iv_step)
-                matrix = matrix_instance.get_matrix(direction)
+                                         option_type=option_type, spot_step=spot_step, iv_step=iv_step, engine=engine, 
+                                         tol=Binomial.DEFAULT_TOL)
+
+                # Cubes are memoized by their inputs (cube_cache); moving the days slider only selects a frame
+                single = Strategy([Leg(option_type, strike, 1 if direction == 'Long' else -1, iv, px)], spot=spot, r=rate, t=time, 
+                                  b=dividend_yield, style=style, spot_step=spot_step, iv_step=iv_step, engine=engine, 
+                                  tol=Binomial.DEFAULT_TOL)
+                matrix = single.scenario_cube(days=cube_days).frame(days_forward)
+
+                # Greek grids at the same days forward, from the batch that prices that day's grid
+                if heatmap_metric != 'PnL':
+                    forward_instance = Matrix(spot=spot, px=px, iv=iv, k=strike, r=rate, t=max(time - days_forward / 365, MIN_TIME), 
+                                              b=dividend_yield, style=style, option_type=option_type, spot_step=spot_step, 
+                                              iv_step=iv_step, engine=engine, tol=Binomial.DEFAULT_TOL)
+                    matrix = forward_instance.get_grids(direction)[heatmap_metric.lower()]
 
-                fig = Plotting(matrix, matrix_instance, 'Single', ticker).plot(direction, option_type)
-                st.pyplot(fig, clear_figure=True)
+                plot_instance = Plotting(matrix, matrix_instance, 'Single', ticker)
+                if renderer == 'Interactive':
+                    st.plotly_chart(plot_instance.plot_interactive(direction, option_type, metric=heatmap_metric), use_container_width=True)
+                else:
+                    st.image(plot_instance.plot_image(direction, option_type, metric=heatmap_metric))
+                if days_forward:
+                    st.caption(f"{heatmap_metric} {days_forward} days forward ({expiry_days - days_forward} days to expiry)")
     else:
         st.warning("Inputs must be greater than or equal to zero...")
 else:
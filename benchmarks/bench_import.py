@@ -0,0 +1,55 @@
+"""
+Cold-start timing of the helpers package: each case runs in a fresh interpreter so nothing
+is already in sys.modules, and the median of several runs is reported along with the
+heavy third-party modules the case ended up importing.
+
+Run from the repository root: python benchmarks/bench_import.py
+"""
+import os
+import sys
+import json
+import statistics
+import importlib.util
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = {
+    'import helpers': "import helpers",
+    'from helpers import BlackScholes': "from helpers import BlackScholes",
+    'BlackScholes price (default kernels)': ("from helpers import BlackScholes\n"
+                                             "BlackScholes(k=650, s=600, r=0.04, t=0.5, iv=0.25, b=0.017).call_px()"),
+    'BlackScholes price (numba kernels)': ("from helpers import BlackScholes, set_kernel_backend\n"
+                                           "set_kernel_backend('numba')\n"
+                                           "BlackScholes(k=650, s=600, r=0.04, t=0.5, iv=0.25, b=0.017).call_px()"),
+    'Matrix grid': ("from helpers import Matrix\n"
+                    "Matrix(spot=600, px=20, iv=0.25, k=650, r=0.04, t=0.5, b=0.017, option_type='Call').get_matrix()"),
+    'from helpers import *': "from helpers import *",
+}
+HEAVY_MODULES = ['scipy.stats', 'scipy.special', 'pandas', 'matplotlib', 'yfinance', 'requests', 'numba']
+
+TIMER = """
+import sys, time, json
+start = time.perf_counter()
+exec({code!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{'elapsed': elapsed, 'modules': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def cold_start(code: str) -> dict:
+    result = subprocess.run([sys.executable, '-c', TIMER.format(code=code, heavy=HEAVY_MODULES)],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+if __name__ == '__main__':
+    runs = 5
+    print(f"{'case':<38}{'median':>10}  heavy modules loaded")
+    for name, code in CASES.items():
+        if 'numba' in name and importlib.util.find_spec('numba') is None:
+            continue
+        cold_start(code) # Warm the bytecode cache
+        samples = [cold_start(code) for _ in range(runs)]
+        median = statistics.median(sample['elapsed'] for sample in samples)
+        print(f"{name:<38}{median * 1e3:>7.0f} ms  {', '.join(samples[-1]['modules']) or '-'}")
@@ -0,0 +1,44 @@
+"""
+Per-contract timing of the scalar BlackScholes methods and the recursive Binomial
+path with the NumPy kernels and, when numba is installed, the JIT-compiled kernels.
+
+Run from the repository root: python benchmarks/bench_kernels.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import helpers
+from helpers import BlackScholes, Binomial, set_kernel_backend
+
+
+def bs_contract():
+    bs = BlackScholes(k=650, s=600, r=0.04, t=0.5, iv=0.25, b=0.017)
+    return (bs.call_px(), bs.delta('Call'), bs.gamma(), bs.vega(), bs.volga(), 
+            bs.theta('Call'), bs.rho('Call'), bs.vanna(), bs.charm('Call'))
+
+def binomial_contract():
+    return Binomial(k=650, s=600, r=0.04, t=0.5, iv=0.25, b=0.017, n=300, calc='recursive').put_px()
+
+def per_contract(func, number: int) -> float:
+    func() # Warm up (and JIT compile)
+    return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+
+if __name__ == '__main__':
+    backends = ['numpy'] + (['numba'] if helpers.NUMBA_AVAILABLE else [])
+    results = {}
+    for backend in backends:
+        set_kernel_backend(backend)
+        results[backend] = (per_contract(bs_contract, 2_000), per_contract(binomial_contract, 3 if backend == 'numpy' else 200))
+
+    print(f"{'backend':<8}{'BlackScholes (px + 8 Greeks)':>32}{'Binomial recursive (n=300)':>32}")
+    for backend, (bs_time, bn_time) in results.items():
+        print(f"{backend:<8}{bs_time * 1e6:>29.1f} us{bn_time * 1e3:>29.3f} ms")
+
+    if 'numba' in results:
+        print(f"speedup {results['numpy'][0] / results['numba'][0]:>31.1f}x{results['numpy'][1] / results['numba'][1]:>31.1f}x")
+    else:
+        print("numba is not installed; only the NumPy kernels were timed...")
@@ -0,0 +1,42 @@
+"""
+Pricing, market data and plotting helpers used by the dashboard pages, split into three layers
+that are imported the first time one of their names is used:
+
+- helpers.pricing: kernels, pricing engines, the IV solver, and the Matrix/Strategy grids (NumPy)
+- helpers.data: option chains, volatility analysis and surfaces, the scanner, and the yield curve (pandas)
+- helpers.plotting: heatmaps (matplotlib)
+
+`from helpers import BlackScholes` loads only the pricing core; `from helpers import *` loads all three.
+"""
+import importlib
+import numpy as np # Re-exported for the pages' star import
+
+_LAYERS = {
+    'pricing': ['NUMBA_AVAILABLE', 'KERNEL_BACKEND', 'set_kernel_backend', 'BlackScholes', 'Binomial',
+                'BaroneAdesiWhaley', 'ENGINES', 'american_accuracy_report', 'implied_volatility', 'LRUCache',
+                'matrix_cache', 'greeks_cache', 'cube_cache', 'grids_cache', 'option_greeks', 'GREEK_GRIDS',
+                'GRID_LEVEL_FLOOR', 'MIN_TIME',
+                'Matrix', 'Leg', 'Strategy', 'ScenarioCube'],
+    'data': ['FetchError', 'AsyncFetcher', 'OptionChain', 'ChainCache', 'Underlying', 'Volatility', 'SVISurface',
+             'SurfaceState', 'SurfaceStore', 'RateLimiter', 'RateLimitedTicker', 'scan_volatility',
+             'YieldCurveProvider', 'rates_provider', 'get_rates_value_dict', 'YieldCurve', 'interpolate_rates',
+             'day_filter'],
+    'plotting': ['Plotting'],
+}
+_EXPORTS = {name: layer for layer, names in _LAYERS.items() for name in names}
+
+__all__ = ['np'] + list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name in _LAYERS:
+        return importlib.import_module(f'{__name__}.{name}')
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f'{__name__}.{_EXPORTS[name]}'), name)
+        globals()[name] = value # Later lookups skip __getattr__
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS) | set(_LAYERS))
@@ -0,0 +1,1241 @@
+"""
+Data layer: option chain fetching and caching, volatility analysis, fitted and stored surfaces,
+the scanner, and the FRED yield curve. yfinance and requests are imported on the first fetch.
+"""
+import os
+import json
+import time
+import asyncio
+import threading
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .pricing import implied_volatility
+
+
+def _yf_ticker(ticker: str):
+    import yfinance as yf # Imported on the first quote request rather than with the package
+    return yf.Ticker(ticker)
+
+
+# --- Asynchronous Fetch Layer ---
+class FetchError(RuntimeError):
+    """Raised when some requests of a batch still fail after every retry; successes are kept in results"""
+    def __init__(self, results: dict, errors: dict):
+        self.results = results # {key: value} of the requests that succeeded
+        self.errors = errors # {key: exception} of the requests that failed
+        super().__init__(f"Failed to fetch {len(errors)} of {len(results) + len(errors)} requests: {list(errors)}...")
+
+
+def _run_coroutine(coro):
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor: # Already inside an event loop (ie notebooks)
+        return executor.submit(asyncio.run, coro).result()
+
+
+class AsyncFetcher:
+    """
+    Runs one request per key on an event loop, with at most max_concurrency requests in
+    flight, a timeout per attempt, and exponential backoff (backoff * 2**attempt seconds)
+    between retries. Only the failed keys are retried; exceptions in give_up_on are not.
+
+    The transport is the callable passed to run(), called as transport(key): coroutine
+    functions are awaited, and blocking callables (yfinance, requests) run on a pool of
+    max_concurrency threads owned by the batch, so a fake transport or a local server can
+    stand in for Yahoo and FRED.
+
+    A blocking request that times out is abandoned, not interrupted: its thread runs until
+    the call returns and keeps its concurrency slot until then, so hung requests never hold
+    more than max_concurrency threads and later requests wait for a free slot.
+    """
+    def __init__(self, max_concurrency: int = 8, timeout: float = 20, retries: int = 2, backoff: float = 0.5, 
+                 give_up_on: tuple = (LookupError, AssertionError)):
+        assert max_concurrency > 0 and timeout > 0 and retries >= 0 and backoff >= 0, "Fetcher limits must be positive..."
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout # Seconds per attempt
+        self.retries = retries # Attempts after the first one
+        self.backoff = backoff # Seconds before the first retry, doubled on every later one
+        self.give_up_on = give_up_on # Exceptions that are raised without retrying
+
+    # Internal helper method, fetches one key with timeouts and retries - not intended for external use
+    async def _fetch_one(self, semaphore, executor, transport, key):
+        for attempt in range(self.retries + 1):
+            try:
+                if asyncio.iscoroutinefunction(transport):
+                    async with semaphore:
+                        return await asyncio.wait_for(transport(key), self.timeout)
+
+                await semaphore.acquire()
+                future = asyncio.get_running_loop().run_in_executor(executor, transport, key)
+                future.add_done_callback(lambda _: semaphore.release()) # Held until the thread finishes, even after a timeout
+                return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+            except self.give_up_on:
+                raise
+            except Exception:
+                if attempt == self.retries:
+                    raise
+            await asyncio.sleep(self.backoff * 2**attempt) # Released the semaphore while backing off
+
+    async def gather(self, transport, keys) -> tuple[dict, dict]:
+        """Fetches every key concurrently and returns ({key: value}, {key: exception})"""
+        keys = list(keys)
+        semaphore = asyncio.BoundedSemaphore(self.max_concurrency)
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='fetch')
+        try:
+            outcomes = await asyncio.gather(*(self._fetch_one(semaphore, executor, transport, key) for key in keys), 
+                                            return_exceptions=True)
+        finally:
+            executor.shutdown(wait=False) # Abandoned (timed out) requests finish in the background
+
+        results, errors = {}, {}
+        for key, outcome in zip(keys, outcomes):
+            if isinstance(outcome, BaseException):
+                errors[key] = outcome
+            else:
+                results[key] = outcome
+        return results, errors
+
+    def run(self, transport, keys) -> dict:
+        """Blocking entry point; returns {key: value} or raises FetchError if any key still fails"""
+        results, errors = _run_coroutine(self.gather(transport, keys))
+        if errors:
+            raise FetchError(results, errors) from next(iter(errors.values()))
+        return results
+
+
+# --- Option Chain Cache Class ---
+OptionChain = namedtuple('OptionChain', ['calls', 'puts'])
+
+
+class ChainCache:
+    """
+    On-disk option chain cache, stored as one Parquet file per (ticker, expiry, fetch time)
+    under directory/TICKER/EXPIRY/. Chains younger than ttl seconds are served from disk,
+    the least recently used files are evicted beyond max_entries, and offline=True serves
+    the latest recorded snapshot (or the one at or before as_of) regardless of age.
+    Eviction runs in batches: the directory is walked only after evict_batch writes past
+    max_entries, so a scan's writes cost O(1) each rather than a walk per chain.
+    """
+    def __init__(self, directory: str = '.chain_cache', ttl: float = 900, max_entries: int = 20_000, 
+                 offline: bool = False, as_of: float = None):
+        assert ttl >= 0 and max_entries > 0, "ttl and max_entries must be positive..."
+        self.directory = directory
+        self.ttl = ttl # Seconds a fetched chain stays fresh
+        self.max_entries = max_entries # Number of chain files kept on disk (a 300-ticker scan writes about 6,000)
+        self.evict_batch = max(1, max_entries // 10) # Writes allowed past max_entries before the next eviction walk
+        self.offline = offline # Never fetch; serve recorded snapshots only
+        self.as_of = as_of # Unix time of the snapshot to replay (latest when None)
+        self._count = None # Chain files on disk as of the last walk, plus this instance's writes since
+        self._lock = threading.Lock()
+
+    def _ticker_dir(self, ticker: str) -> str:
+        return os.path.join(self.directory, ticker.upper())
+
+    # Internal helper method, finds the snapshot to serve as (fetch time, path) - not intended for external use
+    def _snapshot(self, ticker: str, expiry: str):
+        expiry_dir = os.path.join(self._ticker_dir(ticker), expiry)
+        if not os.path.isdir(expiry_dir):
+            return None
+
+        fetch_times = sorted(int(f.split('.')[0]) for f in os.listdir(expiry_dir) if f.endswith('.parquet'))
+        if self.as_of is not None:
+            fetch_times = [ft for ft in fetch_times if ft <= self.as_of]
+        if not fetch_times:
+            return None
+
+        return fetch_times[-1], os.path.join(expiry_dir, f"{fetch_times[-1]}.parquet")
+
+    def _is_fresh(self, fetch_time: float) -> bool:
+        return self.offline or self.as_of is not None or time.time() - fetch_time <= self.ttl
+
+    def get_record(self, ticker: str, name: str):
+        """Returns a small JSON record (ie 'expirations' or 'last_px') if it is fresh"""
+        path = os.path.join(self._ticker_dir(ticker), f"{name}.json")
+        if not os.path.exists(path):
+            return None
+
+        with open(path) as f:
+            record = json.load(f)
+        return record['value'] if self._is_fresh(record['fetched_at']) else None
+
+    def put_record(self, ticker: str, name: str, value):
+        os.makedirs(self._ticker_dir(ticker), exist_ok=True)
+        path = os.path.join(self._ticker_dir(ticker), f"{name}.json")
+        with open(path + '.tmp', 'w') as f:
+            json.dump({'fetched_at': time.time(), 'value': value}, f)
+        os.replace(path + '.tmp', path)
+
+    def get_chain(self, ticker: str, expiry: str):
+        snapshot = self._snapshot(ticker, expiry)
+        if snapshot is None or not self._is_fresh(snapshot[0]):
+            return None
+
+        fetch_time, path = snapshot
+        table = pd.read_parquet(path)
+        os.utime(path, (time.time(), fetch_time)) # Access time tracks recency for LRU eviction
+        is_call = table.pop('optionSide') == 'Call'
+        return OptionChain(table[is_call].reset_index(drop=True), table[~is_call].reset_index(drop=True))
+
+    def put_chain(self, ticker: str, expiry: str, calls: pd.DataFrame, puts: pd.DataFrame):
+        expiry_dir = os.path.join(self._ticker_dir(ticker), expiry)
+        os.makedirs(expiry_dir, exist_ok=True)
+        fetch_time = int(time.time())
+        path = os.path.join(expiry_dir, f"{fetch_time}.parquet")
+
+        table = pd.concat([calls.assign(optionSide='Call'), puts.assign(optionSide='Put')], ignore_index=True)
+        table.to_parquet(path + '.tmp', index=False)
+        os.replace(path + '.tmp', path)
+        os.utime(path, (time.time(), fetch_time))
+
+        with self._lock:
+            if self._count is not None:
+                self._count += 1
+            walk = self._count is None or self._count > self.max_entries + self.evict_batch
+        if walk:
+            self.evict()
+
+    def evict(self):
+        """Deletes the least recently used chain files beyond max_entries."""
+        if not os.path.isdir(self.directory):
+            return
+
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            entries += [os.path.join(root, f) for f in files if f.endswith('.parquet')]
+        with self._lock:
+            self._count = min(len(entries), self.max_entries)
+        if len(entries) <= self.max_entries:
+            return
+
+        entries.sort(key=lambda path: os.stat(path).st_atime)
+        for path in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(path)
+                if not os.listdir(os.path.dirname(path)):
+                    os.rmdir(os.path.dirname(path))
+            except (FileNotFoundError, OSError): # Already evicted (or refilled) by another session
+                pass
+
+
+# --- Volatility Analysis Classes --- 
+class Underlying:
+    def __init__(self, ticker: str, cache: ChainCache = None, transport=None):
+        assert isinstance(ticker, str)
+
+        self.transport = transport or _yf_ticker # Builds the ticker object that quotes are fetched from
+        self._ticker = ticker
+        self._stock = self.transport(self._ticker) if self._ticker else None
+        self.cache = cache # Optional on-disk chain cache
+
+    @property
+    def ticker(self):
+        return self._ticker
+    
+    @ticker.setter
+    def ticker(self, new_ticker):
+        if isinstance(new_ticker, str):
+            self._ticker = new_ticker.upper()
+            self._stock = self.transport(self._ticker)
+        else:
+            raise TypeError("Ticker must be a string.")
+        
+    @ticker.deleter
+    def ticker(self):
+        print(f"Deleting {self._ticker} from {self}.")
+        del self._ticker
+    
+    @property
+    def stock(self):
+        return self._stock if self._stock else None
+    
+    # Internal helper method, reads a record through the cache or fetches and records it - not intended for external use
+    def _cached_record(self, name: str, fetch):
+        value = self.cache.get_record(self.ticker, name) if self.cache else None
+        if value is None:
+            if self.cache and self.cache.offline:
+                raise LookupError(f"No recorded {name} for {self.ticker} in the offline cache...")
+            value = fetch()
+            if self.cache:
+                self.cache.put_record(self.ticker, name, value)
+        return value
+
+    def last_px(self) -> float:
+        """Returns the last available stock price"""
+        return self._cached_record('last_px', lambda: float(self.stock.history(period='1d')['Close'].iloc[-1]))
+
+    def expirations(self) -> tuple[str]:
+        """Returns the option expiration dates, from the cache when it is fresh"""
+        return tuple(self._cached_record('expirations', lambda: list(self.stock.options)))
+
+    def option_chain(self, date: str):
+        """Returns the option chain (calls and puts) for an expiration date, from the cache when it is fresh"""
+        chain = self.cache.get_chain(self.ticker, date) if self.cache else None
+        if chain is None:
+            if self.cache and self.cache.offline:
+                raise LookupError(f"No recorded {date} chain for {self.ticker} in the offline cache...")
+            chain = self.stock.option_chain(date)
+            chain = OptionChain(pd.DataFrame(chain.calls), pd.DataFrame(chain.puts))
+            if self.cache:
+                self.cache.put_chain(self.ticker, date, chain.calls, chain.puts)
+        return chain
+    
+
+class Volatility(Underlying):
+    def __init__(self, ticker: str, pct_band: float = 0.05, frwd_period: int = 15, 
+                 iv_source: str = 'vendor', style: str = 'European', cache: ChainCache = None, 
+                 fetcher: AsyncFetcher = None, transport=None):
+        assert iv_source in ['vendor', 'model'], "iv_source must be 'vendor' or 'model'..."
+        assert style in ['American', 'European'], "style must be 'American' or 'European'..."
+        super().__init__(ticker, cache, transport)
+        self.fetcher = fetcher or AsyncFetcher() # Fetches the chains of every expiration concurrently
+        self.pct_band = pct_band
+        self.frwd_period = frwd_period
+        self.iv_source = iv_source # 'vendor' uses yfinance's impliedVolatility, 'model' solves it from quotes
+        self.style = style # Exercise style used when solving model IVs
+        self.stock_px = self.last_px()
+        self._rates = None # YieldCurve used when solving model IVs
+        self._dividend_yield = None
+        self._expirations = None # Snapshot of expirations and chains, fetched once per instance
+        self._chains = None
+        self._chain_hashes = None # {expiry: hash of its quotes}, compared on refresh_chains
+        self._chain_table = None
+        self._spot_iv = None
+    
+    def expirations_dates(self) -> list[str]:
+        """Returns a list of expiration dates"""
+        if self._expirations is None:
+            self._expirations = self.expirations()
+        return self._expirations
+
+    def expirations_days(self) -> list[int]:
+        """Returns a list of expiration days"""
+        expirations_formatted = [datetime.strptime(date, '%Y-%m-%d') for date in self.expirations_dates()]
+        today = datetime.today()
+        return [(exp - today).days for exp in expirations_formatted]
+    
+    def cutoff_expiration_days_dates(self, cutoff=3) -> tuple[list, list]:
+        expiry_days_ls = self.expirations_days()
+        expiry_dates_ls = self.expirations_dates()
+
+        if isinstance(cutoff, int) and cutoff > 0:
+            cutoff_expiry_dates_ls, cutoff_expiry_days_ls = [], []
+            for i, date in enumerate(expiry_dates_ls):
+                if expiry_days_ls[i] < cutoff:
+                    continue
+                else:
+                    cutoff_expiry_dates_ls.append(date)
+                    cutoff_expiry_days_ls.append(expiry_days_ls[i])
+        
+        return cutoff_expiry_dates_ls, cutoff_expiry_days_ls
+
+    # Internal helper method, loads the rates and dividend yield used to solve model IVs - not intended for external use
+    def _load_model_inputs(self):
+        if self._rates is None:
+            self._rates = YieldCurve.from_provider()
+            self._dividend_yield = (self.stock.info.get('dividendYield') or 0.0) / 100
+
+    # Internal helper method, replaces the vendor IVs of a chain with IVs solved from its quotes - not intended for external use
+    def _solve_chain_iv(self, chain, date: str):
+        self._load_model_inputs()
+        t = (datetime.strptime(date, '%Y-%m-%d') - datetime.today()).days / 365
+        r = self._rates.rate(t)
+        calls, puts = chain.calls, chain.puts
+        quotes = pd.concat([calls, puts], ignore_index=True)
+        bid, ask = pd.to_numeric(quotes['bid'], errors='coerce'), pd.to_numeric(quotes['ask'], errors='coerce')
+        px = ((bid + ask) / 2).where((bid > 0) & (ask > 0), pd.to_numeric(quotes['lastPrice'], errors='coerce'))
+        option_type = np.r_[np.ones(len(calls), dtype=bool), np.zeros(len(puts), dtype=bool)]
+
+        iv = implied_volatility(px.to_numpy(), pd.to_numeric(quotes['strike'], errors='coerce').to_numpy(), 
+                                self.stock_px, r, t, self._dividend_yield, option_type, style=self.style)
+        calls['impliedVolatility'] = iv[:len(calls)]
+        puts['impliedVolatility'] = iv[len(calls):]
+        return chain
+
+    # Internal helper method, fetches one chain with the configured IV source - not intended for external use
+    def _option_chain(self, date: str):
+        chain = self.option_chain(date)
+        if self.iv_source == 'model':
+            chain = self._solve_chain_iv(chain, date)
+        return chain
+
+    # Internal helper method for spot_iv and spot_iv_surface - not intended for external use
+    def _fetch_option_chains(self) -> list:
+        if self._chains is not None:
+            return self._chains
+
+        cutoff_expiry_dates_ls = self.cutoff_expiration_days_dates()[0]
+        if self.iv_source == 'model':
+            self._load_model_inputs() # Loaded once, before the chains are fetched concurrently
+        chains = self.fetcher.run(self._option_chain, cutoff_expiry_dates_ls)
+
+        self._chains = [chains[date] for date in cutoff_expiry_dates_ls]
+        return self._chains
+
+    # Internal helper method, hashes the quotes of one chain - not intended for external use
+    @staticmethod
+    def _hash_chain(chain) -> int:
+        columns = ['strike', 'impliedVolatility', 'bid', 'ask', 'lastPrice', 'volume', 'openInterest']
+        table = pd.concat([pd.DataFrame(chain.calls).reindex(columns=columns), 
+                           pd.DataFrame(chain.puts).reindex(columns=columns)], ignore_index=True)
+        return int(pd.util.hash_pandas_object(table, index=False).sum())
+
+    def refresh_chains(self) -> list[str]:
+        """
+        Re-fetches the chain of every expiration (through the cache, so quotes are new once its
+        ttl has passed) and replaces only the chains whose quotes changed since the last fetch.
+        Returns the changed expirations; derived tables are rebuilt only when the list is not empty.
+        """
+        cutoff_expiry_dates_ls = self.cutoff_expiration_days_dates()[0]
+        if self._chains is None:
+            self._fetch_option_chains()
+        if self._chain_hashes is None:
+            self._chain_hashes = {date: self._hash_chain(chain) for date, chain in zip(cutoff_expiry_dates_ls, self._chains)}
+
+        chains = self.fetcher.run(self._option_chain, cutoff_expiry_dates_ls)
+        changed = [date for date in cutoff_expiry_dates_ls if self._hash_chain(chains[date]) != self._chain_hashes[date]]
+        for date in changed:
+            self._chains[cutoff_expiry_dates_ls.index(date)] = chains[date]
+            self._chain_hashes[date] = self._hash_chain(chains[date])
+
+        if changed:
+            self._chain_table = None
+            self._spot_iv = None
+        return changed
+
+    def spot_iv(self) -> tuple[list[float], list[float]]:
+        """Returns two lists (call and put) of spot IV for each expiration date"""
+        if self._spot_iv is not None:
+            return list(self._spot_iv[0]), list(self._spot_iv[1])
+
+        atm_df = self.atm_iv_table()
+        spot_call_iv_ls = atm_df.loc[atm_df['optionType'] == 'Call', 'volumeWeightedIV'].tolist()
+        spot_put_iv_ls = atm_df.loc[atm_df['optionType'] == 'Put', 'volumeWeightedIV'].tolist()
+
+        self._spot_iv = (spot_call_iv_ls, spot_put_iv_ls)
+        return list(spot_call_iv_ls), list(spot_put_iv_ls)
+    
+    # Internal helper method for forward_iv method - not intended for external use
+    def _forward_expiration_days(self) -> list[int]:
+        expiry_days_ls = self.cutoff_expiration_days_dates()[1]
+        expiry_days_ls = expiry_days_ls[:len(expiry_days_ls)-1]
+        forward_days_ls = list(np.array(expiry_days_ls) + self.frwd_period)
+        return [self.frwd_period] + forward_days_ls
+    
+    # Internal helper method for forward_iv method - not intended for external use
+    def _interpolate_spot_iv(self) -> tuple[list[tuple[int, float]], list[tuple[int, float]]]:
+        spot_call_iv_ls, spot_put_iv_ls = self.spot_iv()
+
+        expiry_days_ls = self.cutoff_expiration_days_dates()[1]
+        forward_days_ls = self._forward_expiration_days()
+
+        interpolated_call_iv = np.exp(np.interp(forward_days_ls, expiry_days_ls, np.log(spot_call_iv_ls)))
+        interpolated_put_iv = np.exp(np.interp(forward_days_ls, expiry_days_ls, np.log(spot_put_iv_ls)))
+
+        return list(zip(forward_days_ls, interpolated_call_iv)), list(zip(forward_days_ls, interpolated_put_iv))
+ 
+    def forward_iv(self) -> tuple[dict[int, float], dict[int, float]]:
+        """
+        Calculates and returns the forward IV term structure of expiration days.
+
+        For instance, if self.frwd_period=15 and one of the days in the expiration
+        list is 30, then this function will return the 15D 30D Forward IV for
+        that specific day.
+        """
+        expiry_days_ls = self.cutoff_expiration_days_dates()[1]
+        expiry_days_ls = expiry_days_ls[:len(expiry_days_ls)-1]
+        interp_spot_call_iv_ls, interp_spot_put_iv_ls = self._interpolate_spot_iv()
+
+        t1_call = interp_spot_call_iv_ls[0][0]
+        s1_call = interp_spot_call_iv_ls[0][1] ** 2
+        t1_put = interp_spot_put_iv_ls[0][0]
+        s1_put = interp_spot_put_iv_ls[0][1] ** 2
+
+        frwd_call_iv_dict = {}
+        frwd_put_iv_dict = {}
+        for i in range(len(expiry_days_ls)):
+
+            t2_call = interp_spot_call_iv_ls[i + 1][0]
+            s2_call = interp_spot_call_iv_ls[i + 1][1] ** 2
+            t2_put = interp_spot_put_iv_ls[i + 1][0]
+            s2_put = interp_spot_put_iv_ls[i + 1][1] ** 2
+
+            frwd_call_iv_dict[expiry_days_ls[i]] = np.sqrt(((s2_call*t2_call)-(s1_call*t1_call)) / (t2_call-t1_call))
+            frwd_put_iv_dict[expiry_days_ls[i]] = np.sqrt(((s2_put*t2_put)-(s1_put*t1_put)) / (t2_put-t1_put))
+
+        return frwd_call_iv_dict, frwd_put_iv_dict
+
+    def chain_table(self) -> pd.DataFrame:
+        """
+        Returns every fetched contract as one long table (calls and puts of each expiration),
+        assembled with a single concat: strike, impliedVolatility (%, float32), volume and
+        openInterest (float32), expiryDate (categorical), expiryDays (int32), optionType (categorical).
+        """
+        if self._chain_table is not None:
+            return self._chain_table
+
+        cutoff_expiry_dates_ls = self.cutoff_expiration_days_dates()[0]
+        columns = ['strike', 'impliedVolatility', 'volume', 'openInterest']
+        frames, expiry_codes, side_codes = [], [], []
+        for i, chain in enumerate(self._fetch_option_chains()):
+            for j, side in enumerate([chain.calls, chain.puts]):
+                frames.append(pd.DataFrame(side).reindex(columns=columns))
+                expiry_codes.append(np.full(len(frames[-1]), i, dtype=np.int32))
+                side_codes.append(np.full(len(frames[-1]), j, dtype=np.int8))
+
+        options_df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+        options_df = options_df.apply(pd.to_numeric, errors='coerce')
+        options_df['impliedVolatility'] = (options_df['impliedVolatility'] * 100).astype(np.float32)
+        options_df[['volume', 'openInterest']] = options_df[['volume', 'openInterest']].astype(np.float32)
+
+        expiry_codes = np.concatenate(expiry_codes) if expiry_codes else np.empty(0, dtype=np.int32)
+        expiry_dates = pd.to_datetime(pd.Series(cutoff_expiry_dates_ls, dtype=object))
+        expiry_days = (expiry_dates - pd.Timestamp(datetime.today().date())).dt.days.to_numpy(dtype=np.int32)
+        options_df['expiryDate'] = pd.Categorical.from_codes(expiry_codes, categories=list(expiry_dates.dt.date))
+        options_df['expiryDays'] = expiry_days[expiry_codes]
+        side_codes = np.concatenate(side_codes) if side_codes else np.empty(0, dtype=np.int8)
+        options_df['optionType'] = pd.Categorical.from_codes(side_codes, categories=['Call', 'Put'])
+
+        self._chain_table = options_df
+        return options_df
+
+    def atm_iv_table(self) -> pd.DataFrame:
+        """
+        Returns one row per expiration and side (calls then puts) with the IVs (decimals) of the
+        strikes inside the band spot * (1 +/- pct_band): volume-weighted (volumeWeightedIV),
+        open-interest-weighted (oiWeightedIV), and IV linearly interpolated to the spot from the
+        nearest quoted strikes (atmIV), plus the band and the contracts, volume and OI it holds.
+        """
+        options_df = self.chain_table()
+        low_band = self.stock_px - self.stock_px * self.pct_band
+        high_band = self.stock_px + self.stock_px * self.pct_band
+        n_groups = 2 * len(options_df['expiryDate'].cat.categories)
+
+        group = options_df['expiryDate'].cat.codes.to_numpy() * 2 + options_df['optionType'].cat.codes.to_numpy()
+        strike = options_df['strike'].to_numpy()
+        iv = options_df['impliedVolatility'].to_numpy(dtype=float) / 100
+        volume = np.nan_to_num(options_df['volume'].to_numpy(dtype=float))
+        open_interest = np.nan_to_num(options_df['openInterest'].to_numpy(dtype=float))
+        quoted = ~np.isnan(iv)
+        in_band = quoted & (strike > low_band) & (strike < high_band)
+
+        def band_sum(weights):
+            return np.bincount(group[in_band], weights=weights[in_band], minlength=n_groups)
+
+        band_volume, band_oi = band_sum(volume), band_sum(open_interest)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            volume_iv = np.where(band_volume > 0, band_sum(iv * volume) / band_volume, np.nan)
+            oi_iv = np.where(band_oi > 0, band_sum(iv * open_interest) / band_oi, np.nan)
+
+        # Nearest quoted strike at or below / at or above the spot in each group, then interpolate between them
+        order = np.lexsort((strike, group))
+        order = order[quoted[order]]
+        below = order[strike[order] <= self.stock_px]
+        above = order[strike[order] >= self.stock_px]
+        below = below[np.r_[group[below][1:] != group[below][:-1], True]] # Highest strike per group
+        above = above[np.r_[True, group[above][1:] != group[above][:-1]]] # Lowest strike per group
+        k_lo, iv_lo, k_hi, iv_hi = (np.full(n_groups, np.nan) for _ in range(4))
+        k_lo[group[below]], iv_lo[group[below]] = strike[below], iv[below]
+        k_hi[group[above]], iv_hi[group[above]] = strike[above], iv[above]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = np.where(k_hi > k_lo, (self.stock_px - k_lo) / (k_hi - k_lo), 0.0)
+        atm_iv = np.where(np.isnan(iv_lo), iv_hi, np.where(np.isnan(iv_hi), iv_lo, iv_lo + weight * (iv_hi - iv_lo)))
+
+        expiry_dates = options_df['expiryDate'].cat.categories
+        expiry_days = np.zeros(len(expiry_dates), dtype=np.int32)
+        expiry_days[options_df['expiryDate'].cat.codes.to_numpy()] = options_df['expiryDays'].to_numpy()
+        return pd.DataFrame({
+            'expiryDate': np.repeat(np.asarray(expiry_dates, dtype=object), 2),
+            'expiryDays': np.repeat(expiry_days, 2),
+            'optionType': np.tile(['Call', 'Put'], len(expiry_dates)),
+            'volumeWeightedIV': volume_iv,
+            'oiWeightedIV': oi_iv,
+            'atmIV': atm_iv,
+            'bandLow': low_band,
+            'bandHigh': high_band,
+            'contracts': np.bincount(group[in_band], minlength=n_groups),
+            'volume': band_volume,
+            'openInterest': band_oi
+        })
+
+    def spot_iv_surface(self, option_type: str = None):
+        """Returns a data frame that can be plotted to represent a volatility surface, for one side or both."""
+        options_df = self.chain_table()
+        if option_type is None:
+            return options_df.copy()
+        if option_type.upper() not in ['CALL', 'PUT']:
+            raise ValueError("Argument option_type should be: CALL or PUT")
+
+        return options_df[options_df['optionType'] == option_type.capitalize()].reset_index(drop=True)
+
+    def scan_metrics(self, tenor: int = 30, long_tenor: int = 90, skew_moneyness: float = 0.1) -> dict:
+        """
+        Returns the ranking metrics of the scanner (IVs as decimals): the ATM IV (mean of the call and
+        put atmIV) at tenor and long_tenor days, interpolated in total variance, the term slope
+        IV(long_tenor) - IV(tenor), and the skew IV(put, K = S * (1 - m)) - IV(call, K = S * (1 + m))
+        on the expiration nearest to tenor.
+        """
+        atm_df = self.atm_iv_table()
+        atm_iv = atm_df.groupby('expiryDays', sort=True)['atmIV'].mean().dropna()
+        days = atm_iv.index.to_numpy(dtype=float)
+        total_variance = atm_iv.to_numpy()**2 * days
+
+        def iv_at(d): # Linear in total variance between expirations, flat IV beyond them
+            if not len(days):
+                return np.nan
+            if d <= days[0] or d >= days[-1]:
+                return atm_iv.iloc[0 if d <= days[0] else -1]
+            return np.sqrt(np.interp(d, days, total_variance) / d)
+
+        options_df = self.chain_table()
+        options_df = options_df[options_df['impliedVolatility'] > 0]
+        skew = np.nan
+        if not options_df.empty:
+            expiry_days = np.unique(options_df['expiryDays'])
+            nearest = options_df[options_df['expiryDays'] == expiry_days[np.abs(expiry_days - tenor).argmin()]].sort_values('strike')
+            puts, calls = nearest[nearest['optionType'] == 'Put'], nearest[nearest['optionType'] == 'Call']
+            if not puts.empty and not calls.empty:
+                skew = (np.interp(self.stock_px * (1 - skew_moneyness), puts['strike'], puts['impliedVolatility']) 
+                        - np.interp(self.stock_px * (1 + skew_moneyness), calls['strike'], calls['impliedVolatility'])) / 100
+
+        front, back = iv_at(tenor), iv_at(long_tenor)
+        return {'ticker': self.ticker, 'spot': self.stock_px, 'atm_iv': front, 'long_iv': back, 
+                'term_slope': back - front, 'skew': skew, 'expirations': len(days)}
+
+    def record_surface(self, store: 'SurfaceStore' = None, overwrite: bool = False) -> bool:
+        """
+        Records today's surface in the historical store, unless today's snapshot is already there
+        (overwrite=True appends a newer one). Returns whether a snapshot was written.
+        """
+        store = store or SurfaceStore()
+        if not overwrite and datetime.today().date().isoformat() in store.dates(self.ticker):
+            return False
+        store.append(self.ticker, self.chain_table(), self.stock_px)
+        return True
+
+    def spot_average_iv_surface(self, period=15, store: 'SurfaceStore' = None, record: bool = True) -> pd.DataFrame:
+        """
+        Returns the period-day average surface from the historical store on its (moneyness, tenor) grid,
+        with strikes at the current spot, in the spot_iv_surface columns. With record=True, today's
+        surface is first recorded through record_surface(), which skips days already stored.
+        """
+        store = store or SurfaceStore()
+        if record:
+            self.record_surface(store)
+        surface, n = store.average(self.ticker, period)
+
+        side, tenor, moneyness = np.meshgrid(np.arange(len(store.sides)), store.tenors, store.moneyness, indexing='ij')
+        options_df = pd.DataFrame({
+            'moneyness': moneyness.ravel(),
+            'strike': moneyness.ravel() * self.stock_px,
+            'impliedVolatility': surface.ravel().astype(np.float32),
+            'expiryDays': tenor.ravel().astype(np.int32),
+            'optionType': pd.Categorical.from_codes(side.ravel(), categories=store.sides),
+            'snapshots': n.ravel()
+        })
+        return options_df.dropna(subset=['impliedVolatility']).reset_index(drop=True)
+
+
+# --- Parametric Volatility Surface Class ---
+class SVISurface:
+    """
+    Parametric implied volatility surface fitted to a chain table (Volatility.spot_iv_surface)
+    in total variance w = iv^2 * t against log-forward-moneyness k = ln(K / (s * e^((r - b) * t))).
+
+    'SVI' fits the raw SVI slice w(k) = a + b * (rho * (k - m) + sqrt((k - m)^2 + sigma^2)) to each
+    expiration, in order of maturity, with penalties on negative variance, Lee's wing bound
+    b * (1 + |rho|) <= 4 / t, and calendar spread arbitrage against the previous slice; the surface
+    is linear in total variance between expirations. 'SSVI' fits one global surface
+    w(k, theta) = theta / 2 * (1 + rho * phi * k + sqrt((phi * k + rho)^2 + 1 - rho^2)) with the
+    power-law phi = eta / (theta^gamma * (1 + theta)^(1 - gamma)), eta * (1 + |rho|) <= 2 and a
+    non-decreasing ATM total variance theta(t), which is free of static arbitrage.
+    """
+    models = ['SVI', 'SSVI']
+
+    def __init__(self, model: str = 'SVI', min_points: int = 5):
+        if model not in self.models:
+            raise ValueError(f"Surface model must be one of {self.models}...")
+        self.model = model
+        self.min_points = min_points # Expirations with fewer quotes are skipped
+        self.params = None # SVI: one row per expiration (t, a, b, rho, m, sigma, rmse); SSVI: t, theta, rmse
+        self.global_params = None # SSVI only: {'rho', 'eta', 'gamma'}
+        self.s, self.r, self.b = None, 0.0, 0.0
+
+    def _moneyness(self, strike, t):
+        return np.log(np.asarray(strike, dtype=float) / self.s) - (self.r - self.b) * np.asarray(t, dtype=float)
+
+    @staticmethod
+    def _svi(k, a, b, rho, m, sigma):
+        return a + b * (rho * (k - m) + np.sqrt((k - m)**2 + sigma**2))
+
+    @staticmethod
+    def _ssvi(k, theta, rho, eta, gamma):
+        phi = eta / (theta**gamma * (1 + theta)**(1 - gamma))
+        return theta / 2 * (1 + rho * phi * k + np.sqrt((phi * k + rho)**2 + 1 - rho**2))
+
+    def fit(self, table: pd.DataFrame, s: float, r: float = 0.0, b: float = 0.0) -> 'SVISurface':
+        """Fits the model to the strike, impliedVolatility (%) and expiryDays columns of one side of the chain table"""
+        from scipy.optimize import least_squares
+
+        self.s, self.r, self.b = s, r, b
+        table = table[(table['impliedVolatility'] > 0) & (table['expiryDays'] > 0)]
+        t_all = table['expiryDays'].to_numpy(dtype=float) / 365
+        k_all = self._moneyness(table['strike'].to_numpy(), t_all)
+        w_all = (table['impliedVolatility'].to_numpy(dtype=float) / 100)**2 * t_all
+
+        slices = []
+        for t in np.unique(t_all):
+            k, w = k_all[t_all == t], w_all[t_all == t]
+            if len(k) >= self.min_points:
+                order = np.argsort(k)
+                slices.append((t, k[order], w[order]))
+        assert slices, f"No expiration has at least {self.min_points} quotes to fit..."
+
+        if self.model == 'SVI':
+            rows, prev = [], None
+            k_check = np.linspace(k_all.min(), k_all.max(), 25) # Strikes checked for calendar arbitrage
+            for t, k, w in slices:
+                def residuals(x):
+                    a, b_, rho, m, sigma = x
+                    penalties = [max(0.0, -(a + b_ * sigma * np.sqrt(1 - rho**2))), max(0.0, b_ * (1 + abs(rho)) - 4 / t)]
+                    calendar = np.maximum(0.0, self._svi(k_check, *prev) - self._svi(k_check, *x)) if prev is not None else []
+                    return np.r_[self._svi(k, *x) - w, 10 * np.array(penalties), 10 * np.asarray(calendar)]
+
+                x0 = [np.interp(0.0, k, w), 0.1, -0.3, 0.0, 0.1] if prev is None else prev * [t / prev_t, t / prev_t, 1, 1, 1] # Warm start
+                bounds = ([-w.max(), 0.0, -0.999, 2 * k.min() - 0.1, 1e-4], [2 * w.max(), 4 / t, 0.999, 2 * k.max() + 0.1, 5.0])
+                x0 = np.clip(x0, bounds[0], bounds[1])
+                x = least_squares(residuals, x0, bounds=bounds, loss='soft_l1', f_scale=0.1 * w.mean(), x_scale='jac', ftol=1e-6).x
+                prev, prev_t = x, t
+                rmse = np.sqrt(np.mean((np.sqrt(np.maximum(self._svi(k, *x), 0) / t) - np.sqrt(w / t))**2)) * 100
+                rows.append([t, *x, rmse])
+            self.params = pd.DataFrame(rows, columns=['t', 'a', 'b', 'rho', 'm', 'sigma', 'rmse'])
+        else:
+            t_knots = np.array([t for t, _, _ in slices])
+            theta = np.maximum.accumulate([np.interp(0.0, k, w) for _, k, w in slices]) # Non-decreasing ATM variance
+            theta_all = np.concatenate([np.full(len(k), th) for th, (_, k, _) in zip(theta, slices)])
+            k_fit = np.concatenate([k for _, k, _ in slices])
+            w_fit = np.concatenate([w for _, _, w in slices])
+
+            def residuals(x):
+                rho, u, gamma = x
+                return self._ssvi(k_fit, theta_all, rho, 2 * u / (1 + abs(rho)), gamma) - w_fit
+
+            x = least_squares(residuals, [-0.3, 0.5, 0.3], bounds=([-0.999, 0.0, 0.01], [0.999, 1.0, 0.5]), 
+                              loss='soft_l1', f_scale=0.1 * w_fit.mean()).x
+            self.global_params = {'rho': x[0], 'eta': 2 * x[1] / (1 + abs(x[0])), 'gamma': x[2]}
+            fitted = self._ssvi(k_fit, theta_all, **self.global_params)
+            t_fit = np.concatenate([np.full(len(k), t) for t, k, _ in slices])
+            errors = (np.sqrt(np.maximum(fitted, 0) / t_fit) - np.sqrt(w_fit / t_fit))**2
+            rmse = [np.sqrt(errors[t_fit == t].mean()) * 100 for t in t_knots]
+            self.params = pd.DataFrame({'t': t_knots, 'theta': theta, 'rmse': rmse})
+
+        return self
+
+    def total_variance(self, strike, t) -> np.ndarray:
+        """Returns the fitted total variance at strikes and maturities (years), broadcast together"""
+        assert self.params is not None, "Fit the surface before evaluating it..."
+        strike, t = np.broadcast_arrays(np.asarray(strike, dtype=float), np.asarray(t, dtype=float))
+        k = self._moneyness(strike, t)
+        t_knots = self.params['t'].to_numpy()
+
+        if self.model == 'SSVI':
+            # theta(t) is linear between expirations, from zero at t=0 and at constant variance rate beyond the last
+            theta_knots = self.params['theta'].to_numpy()
+            theta = np.where(t > t_knots[-1], theta_knots[-1] * t / t_knots[-1], np.interp(t, np.r_[0.0, t_knots], np.r_[0.0, theta_knots]))
+            return self._ssvi(k, np.maximum(theta, 1e-12), **self.global_params)
+
+        slice_w = np.stack([self._svi(k, *row) for row in self.params[['a', 'b', 'rho', 'm', 'sigma']].to_numpy()])
+        slice_w = np.maximum(slice_w, 0.0)
+        i = np.clip(np.searchsorted(t_knots, t) - 1, 0, len(t_knots) - 2) if len(t_knots) > 1 else np.zeros(t.shape, dtype=int)
+        j = np.minimum(i + 1, len(t_knots) - 1)
+        w_i, w_j = np.take_along_axis(slice_w, i[None], 0)[0], np.take_along_axis(slice_w, j[None], 0)[0]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = np.where(j > i, (t - t_knots[i]) / (t_knots[j] - t_knots[i]), 0.0)
+        w = w_i + weight * (w_j - w_i)
+        w = np.where(t < t_knots[0], slice_w[0] * t / t_knots[0], w) # Constant implied volatility outside the fitted expirations
+        return np.where(t > t_knots[-1], slice_w[-1] * t / t_knots[-1], w)
+
+    def implied_vol(self, days, strike) -> np.ndarray:
+        """Returns the fitted IV (%) at expiry days and strikes, in the units of the chain table"""
+        t = np.asarray(days, dtype=float) / 365
+        return np.sqrt(self.total_variance(strike, t) / t) * 100
+
+    def to_dict(self) -> dict:
+        """Compact parameter set, eg for caching the fit or passing it to pricing"""
+        return {'model': self.model, 's': self.s, 'r': self.r, 'b': self.b, 
+                'params': self.params.to_dict(orient='list'), 'global_params': self.global_params}
+
+    @classmethod
+    def from_dict(cls, record: dict) -> 'SVISurface':
+        surface = cls(record['model'])
+        surface.s, surface.r, surface.b = record['s'], record['r'], record['b']
+        surface.params = pd.DataFrame(record['params'])
+        surface.global_params = record['global_params']
+        return surface
+
+
+# --- Incremental Volatility Surface Class ---
+class SurfaceState:
+    """
+    Keeps one ticker's chain table and, per side, the Delaunay triangulation of its
+    (expiryDays, strike) points with the linear interpolator over it, so that strike and
+    expiry filters are only row masks. The triangulation is rebuilt only when the points
+    change, and the interpolator only when the IVs change (after refresh()).
+    """
+    def __init__(self, vol: Volatility, min_iv: float = 1):
+        self.vol = vol
+        self.min_iv = min_iv # IVs (%) at or below this are treated as missing quotes
+        self._table = None
+        self._triangulations = {} # {side: (points hash, Delaunay)}
+        self._interpolators = {} # {side: (IV hash, LinearNDInterpolator)}
+        self._fits = {} # {(side, model): (data hash, SVISurface)}
+
+    @property
+    def table(self) -> pd.DataFrame:
+        if self._table is None:
+            self._table = self.vol.spot_iv_surface()
+        return self._table
+
+    def refresh(self) -> list[str]:
+        """Polls the chains and returns the expirations whose quotes changed"""
+        changed = self.vol.refresh_chains()
+        if changed:
+            self._table = None
+        return changed
+
+    def mask(self, option_type: str, min_expiry: int, max_expiry: int, min_strike: float, max_strike: float) -> np.ndarray:
+        """Boolean row mask of table for one side within the expiry (days) and strike ranges"""
+        table = self.table
+        return ((table['optionType'] == option_type).to_numpy() & (table['impliedVolatility'] > self.min_iv).to_numpy() 
+                & table['expiryDays'].between(min_expiry, max_expiry).to_numpy() 
+                & table['strike'].between(min_strike, max_strike).to_numpy())
+
+    def interpolator(self, option_type: str):
+        """Linear interpolator of the side's IV over (expiryDays, strike), rebuilt only when its data changes"""
+        from scipy.spatial import Delaunay
+        from scipy.interpolate import LinearNDInterpolator
+
+        side = self.table[(self.table['optionType'] == option_type) & (self.table['impliedVolatility'] > self.min_iv)]
+        points = np.column_stack([side['expiryDays'].to_numpy(dtype=float), side['strike'].to_numpy(dtype=float)])
+        values = side['impliedVolatility'].to_numpy(dtype=float)
+
+        points_hash = hash(points.tobytes())
+        if self._triangulations.get(option_type, (None,))[0] != points_hash:
+            self._triangulations[option_type] = (points_hash, Delaunay(points))
+            self._interpolators.pop(option_type, None)
+
+        values_hash = hash(values.tobytes())
+        if self._interpolators.get(option_type, (None,))[0] != values_hash:
+            tri = self._triangulations[option_type][1]
+            self._interpolators[option_type] = (values_hash, LinearNDInterpolator(tri, values))
+        return self._interpolators[option_type][1]
+
+    def fit(self, option_type: str, model: str = 'SVI') -> SVISurface:
+        """SVI or SSVI fit of the side's IVs, refitted only when its data changes"""
+        side = self.table[(self.table['optionType'] == option_type) & (self.table['impliedVolatility'] > self.min_iv)]
+        data_hash = int(pd.util.hash_pandas_object(side[['expiryDays', 'strike', 'impliedVolatility']], index=False).sum())
+        if self._fits.get((option_type, model), (None,))[0] != data_hash:
+            self._fits[(option_type, model)] = (data_hash, SVISurface(model).fit(side, self.vol.stock_px))
+        return self._fits[(option_type, model)][1]
+
+    def grid(self, option_type: str, mask: np.ndarray, grid_size: int = 50, model: str = 'Linear') -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Evaluates the surface on a grid_size x grid_size mesh spanning the masked rows, from the cached
+        linear interpolator ('Linear') or in closed form from a cached 'SVI'/'SSVI' fit
+        """
+        rows = self.table[mask]
+        grid_expiry = np.linspace(rows['expiryDays'].min(), rows['expiryDays'].max(), grid_size)
+        grid_strike = np.linspace(rows['strike'].min(), rows['strike'].max(), grid_size)
+        X, Y = np.meshgrid(grid_expiry, grid_strike)
+        if model == 'Linear':
+            return X, Y, self.interpolator(option_type)(X, Y)
+        return X, Y, self.fit(option_type, model).implied_vol(X, Y)
+
+
+# --- Historical Surface Store Class ---
+class SurfaceStore:
+    """
+    Append-only store of daily IV surface snapshots, gridded on (moneyness K/S, tenor days) from an
+    SVI fit of each side and written as Parquet partitions directory/TICKER/date=YYYY-MM-DD/<ts>.parquet
+    (the latest file of a date wins). A per-ticker index of cumulative sums over dates answers
+    N-day averages from two rows, without reading the snapshots back.
+    """
+    def __init__(self, directory: str = '.surface_store', moneyness=None, tenors=None, model: str = 'SVI'):
+        self.directory = directory
+        self.moneyness = np.round(np.linspace(0.7, 1.3, 25) if moneyness is None else np.asarray(moneyness, dtype=float), 6)
+        self.tenors = np.array([7, 14, 30, 60, 90, 180, 365, 730] if tenors is None else tenors, dtype=int)
+        self.model = model # Surface fit used to grid the snapshots
+        self.sides = ['Call', 'Put']
+
+    def _ticker_dir(self, ticker: str) -> str:
+        return os.path.join(self.directory, ticker.upper())
+
+    def _index_path(self, ticker: str) -> str:
+        return os.path.join(self._ticker_dir(ticker), '_index.npz')
+
+    def dates(self, ticker: str) -> list[str]:
+        """Returns the stored snapshot dates (YYYY-MM-DD) in order"""
+        if not os.path.isdir(self._ticker_dir(ticker)):
+            return []
+        return sorted(d.split('=')[1] for d in os.listdir(self._ticker_dir(ticker)) if d.startswith('date='))
+
+    def grid(self, table: pd.DataFrame, s: float) -> np.ndarray:
+        """Grids one chain table (Volatility.spot_iv_surface) as IV (%) of shape (side, tenor, moneyness)"""
+        surface = np.full((len(self.sides), len(self.tenors), len(self.moneyness)), np.nan)
+        T, M = np.meshgrid(self.tenors, self.moneyness, indexing='ij')
+        for i, side in enumerate(self.sides):
+            rows = table[(table['optionType'] == side) & (table['impliedVolatility'] > 1)]
+            try:
+                surface[i] = SVISurface(self.model).fit(rows, s).implied_vol(T, M * s)
+            except (AssertionError, ValueError): # Too few quotes on this side to fit
+                pass
+        return surface
+
+    def append(self, ticker: str, table: pd.DataFrame, s: float, date: str = None) -> np.ndarray:
+        """Grids and stores the day's snapshot (today by default) and updates the average index"""
+        date = date or datetime.today().date().isoformat()
+        surface = self.grid(table, s)
+
+        side, tenor, moneyness = np.meshgrid(np.arange(len(self.sides)), self.tenors, self.moneyness, indexing='ij')
+        snapshot = pd.DataFrame({
+            'optionType': pd.Categorical.from_codes(side.ravel(), categories=self.sides),
+            'tenor': tenor.ravel().astype(np.int16),
+            'moneyness': moneyness.ravel().astype(np.float32),
+            'impliedVolatility': surface.ravel().astype(np.float32)
+        })
+        partition = os.path.join(self._ticker_dir(ticker), f"date={date}")
+        os.makedirs(partition, exist_ok=True)
+        path = os.path.join(partition, f"{time.time_ns()}.parquet")
+        snapshot.to_parquet(path + '.tmp', index=False)
+        os.replace(path + '.tmp', path)
+
+        self._update_index(ticker, date, surface)
+        return surface
+
+    def load(self, ticker: str, date: str) -> np.ndarray:
+        """Reads one stored snapshot back as IV (%) of shape (side, tenor, moneyness)"""
+        partition = os.path.join(self._ticker_dir(ticker), f"date={date}")
+        latest = max(f for f in os.listdir(partition) if f.endswith('.parquet'))
+        snapshot = pd.read_parquet(os.path.join(partition, latest))
+        return snapshot['impliedVolatility'].to_numpy(dtype=float).reshape(len(self.sides), len(self.tenors), len(self.moneyness))
+
+    # Internal helper method, reads the cumulative index as (dates, sums, counts) - not intended for external use
+    def _read_index(self, ticker: str):
+        path = self._index_path(ticker)
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as index:
+            if index['sums'].shape[1:] != (len(self.sides), len(self.tenors), len(self.moneyness)):
+                return None # Built for another grid
+            return list(index['dates']), index['sums'], index['counts']
+
+    def _write_index(self, ticker: str, dates: list, sums: np.ndarray, counts: np.ndarray):
+        path = self._index_path(ticker)
+        os.makedirs(self._ticker_dir(ticker), exist_ok=True)
+        with open(path + '.tmp', 'wb') as f:
+            np.savez(f, dates=np.array(dates), sums=sums, counts=counts)
+        os.replace(path + '.tmp', path)
+
+    def rebuild_index(self, ticker: str):
+        """Rebuilds the cumulative index from every stored partition"""
+        dates = self.dates(ticker)
+        shape = (len(self.sides), len(self.tenors), len(self.moneyness))
+        sums, counts = np.zeros((len(dates) + 1,) + shape), np.zeros((len(dates) + 1,) + shape, dtype=np.int32)
+        for i, date in enumerate(dates):
+            surface = self.load(ticker, date)
+            sums[i + 1] = sums[i] + np.nan_to_num(surface)
+            counts[i + 1] = counts[i] + np.isfinite(surface)
+        self._write_index(ticker, dates, sums, counts)
+
+    # Internal helper method, appends (or replaces the latest) date in the index - not intended for external use
+    def _update_index(self, ticker: str, date: str, surface: np.ndarray):
+        index = self._read_index(ticker)
+        if index is None or (index[0] and date < index[0][-1]): # Missing, stale or back-filled: rebuild from disk
+            return self.rebuild_index(ticker)
+
+        dates, sums, counts = index
+        if dates and date == dates[-1]: # Same day re-snapshot replaces the day's row
+            dates, sums, counts = dates[:-1], sums[:-1], counts[:-1]
+        sums = np.concatenate([sums, (sums[-1] + np.nan_to_num(surface))[None]])
+        counts = np.concatenate([counts, (counts[-1] + np.isfinite(surface))[None]])
+        self._write_index(ticker, dates + [date], sums, counts)
+
+    def average(self, ticker: str, period: int = 15, end: str = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the average surface (side, tenor, moneyness) over the snapshots of the period calendar
+        days ending at end (the latest snapshot by default), and the number of snapshots per point
+        """
+        index = self._read_index(ticker)
+        if index is None:
+            self.rebuild_index(ticker)
+            index = self._read_index(ticker)
+        dates, sums, counts = index
+        if not dates:
+            raise LookupError(f"No stored surfaces for {ticker}...")
+
+        end = end or dates[-1]
+        start = (datetime.strptime(end, '%Y-%m-%d') - pd.Timedelta(days=period)).date().isoformat()
+        hi, lo = np.searchsorted(dates, end, side='right'), np.searchsorted(dates, start, side='right')
+        n = counts[hi] - counts[lo]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(n > 0, (sums[hi] - sums[lo]) / n, np.nan), n
+
+
+# --- Volatility Scanner ---
+class RateLimiter:
+    """Thread-safe token bucket allowing rate requests per second on average, in bursts of up to burst"""
+    def __init__(self, rate: float = 10, burst: int = 10):
+        assert rate > 0 and burst > 0, "Rate and burst must be positive..."
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Blocks until a request may be sent"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class RateLimitedTicker:
+    """Ticker transport wrapper; every quote request (history, options, option_chain, info) takes a limiter token"""
+    requests = {'history', 'options', 'option_chain', 'info'}
+
+    def __init__(self, ticker, limiter: RateLimiter):
+        self._ticker = ticker
+        self._limiter = limiter
+
+    def __getattr__(self, name):
+        if name in self.requests:
+            self._limiter.acquire()
+        return getattr(self._ticker, name)
+
+
+def scan_volatility(tickers: list[str], cache: ChainCache = None, max_workers: int = 8, rate_limit: float = 10, 
+                    transport=None, **metric_kwargs):
+    """
+    Scans a watchlist with max_workers tickers in flight, sharing one rate limiter (rate_limit
+    requests per second to the data vendor) and the chain cache across them. Yields one
+    Volatility.scan_metrics() dict per ticker as soon as it completes; a ticker that fails
+    yields {'ticker', 'error'} instead of stopping the scan.
+    """
+    limiter = RateLimiter(rate_limit, burst=max(1, int(rate_limit)))
+    transport = transport or _yf_ticker
+    limited_transport = lambda ticker: RateLimitedTicker(transport(ticker), limiter)
+
+    def scan_one(ticker):
+        fetcher = AsyncFetcher(max_concurrency=4) # Chains of one ticker, still paced by the shared limiter
+        vol = Volatility(ticker, cache=cache, fetcher=fetcher, transport=limited_transport)
+        return vol.scan_metrics(**metric_kwargs)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(scan_one, ticker.upper()): ticker.upper() for ticker in dict.fromkeys(tickers)}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e: # One bad symbol (delisted, no options, vendor errors) must not end the scan
+                yield {'ticker': futures[future], 'error': str(e)}
+
+
+# --- Yield Curve Provider Class ---
+class YieldCurveProvider:
+    """
+    Serves the US Treasury curve ({days: rate}) from one snapshot shared by every page and
+    session in the process. The snapshot is refreshed from FRED once per ttl seconds and
+    persisted to path, so restarts and FRED outages fall back to the last saved curve.
+    With a fixture path, the curve is read from that local JSON file instead of FRED.
+    """
+    fred_key = '0e26fed1b95ca710abdb6bbde2ad1a8a'
+    rates_series_dict = {
+        'one_month': 'DGS1MO',
+        'three_month': 'DGS3MO',
+        'six_month': 'DGS6MO',
+        'one_year': 'DGS1',
+        'two_year': 'DGS2',
+        'three_year': 'DGS3',
+        'five_year': 'DGS5',
+        'seven_year': 'DGS7',
+        'ten_year': 'DGS10',
+        'twenty_year': 'DGS20',
+        'thirty_year': 'DGS30'
+        }
+    time_lst = [30, 90, 180, 365, 730, 1095, 1825, 2555, 3650, 7300, 10950]
+
+    def __init__(self, path: str = '.rates_cache.json', ttl: float = 86_400, fixture: str = None, timeout: float = 10, 
+                 fred_url: str = 'https://api.stlouisfed.org/fred', fetcher: AsyncFetcher = None, retry_after: float = 300):
+        self.path = path # Disk copy of the latest snapshot
+        self.ttl = ttl # Seconds a snapshot stays fresh (one day by default)
+        self.retry_after = retry_after # Seconds to wait after a failed refresh before asking FRED again
+        self.fixture = fixture # Local JSON file ({days: rate}) used instead of FRED
+        self.timeout = timeout # Seconds per FRED request
+        self.fred_url = fred_url # Base URL of the FRED API (a local server can stand in for it)
+        self.fetcher = fetcher or AsyncFetcher(max_concurrency=len(self.time_lst), timeout=timeout)
+        self._snapshot = None # (fetched_at, {days: rate})
+        self._retry_at = 0.0 # No refresh is attempted before this time after a failure
+        self._error = None # Last refresh failure, re-raised while there is no curve to serve
+        self._lock = threading.Lock()
+
+    # Internal helper method, fetches the latest observation of one series - not intended for external use
+    def _load_series(self, series_id: str) -> float:
+        url = (f'{self.fred_url}/series/observations?series_id={series_id}&api_key={self.fred_key}'
+               '&file_type=json&sort_order=desc&limit=10')
+        import requests # Imported on the first FRED request rather than with the package
+        response = requests.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        observations = [obs['value'] for obs in response.json()['observations'] if obs['value'] != '.']
+        return float(observations[0]) / 100
+
+    # Internal helper method, fetches the latest observation of every series - not intended for external use
+    def _fetch(self) -> dict:
+        rates = self.fetcher.run(self._load_series, self.rates_series_dict.values())
+        return {days: rates[series_id] for days, series_id in zip(self.time_lst, self.rates_series_dict.values())}
+
+    def _read_disk(self):
+        try:
+            with open(self.path) as f:
+                record = json.load(f)
+            return record['fetched_at'], {int(k): v for k, v in record['rates'].items()}
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_disk(self, snapshot):
+        with open(self.path + '.tmp', 'w') as f:
+            json.dump({'fetched_at': snapshot[0], 'rates': snapshot[1]}, f)
+        os.replace(self.path + '.tmp', self.path)
+
+    def get(self) -> dict:
+        """Returns the curve as {days: rate}, fetching it only when the shared snapshot is stale"""
+        if self.fixture:
+            with open(self.fixture) as f:
+                return {int(k): float(v) for k, v in json.load(f).items()}
+
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = self._read_disk()
+
+            stale = self._snapshot is None or time.time() - self._snapshot[0] > self.ttl
+            if stale and time.time() >= self._retry_at:
+                try:
+                    self._snapshot = (time.time(), self._fetch())
+                    self._error = None
+                except FetchError as e:
+                    self._retry_at, self._error = time.time() + self.retry_after, e
+                else:
+                    try:
+                        self._write_disk(self._snapshot)
+                    except OSError: # A read-only disk only costs the copy that survives restarts
+                        pass
+
+            if self._snapshot is None:
+                raise self._error # No saved curve to fall back on
+            return dict(self._snapshot[1])
+
+
+rates_provider = YieldCurveProvider() # Shared by every page and session in the process
+
+
+# --- Interest Rate Interpolation Function --- 
+def get_rates_value_dict() -> dict:
+    return rates_provider.get()
+
+# --- Yield Curve Interpolation Class ---
+class YieldCurve:
+    """
+    Yield curve built once from a {days: rate} snapshot, with sorted knot arrays for
+    vectorized rates, discount factors and forward rates at arrays of maturities (years).
+
+    Methods: 'linear' (in rate), 'log_linear' (linear in log discount factor) and
+    'monotone_cubic' (PCHIP in rate). Rates are held flat beyond the first and last knots.
+    """
+    methods = ['linear', 'log_linear', 'monotone_cubic']
+
+    def __init__(self, rate_dict: dict, method: str = 'linear'):
+        if method not in self.methods:
+            raise ValueError(f"Interpolation method must be one of {self.methods}...")
+        assert len(rate_dict) > 0, "Yield curve requires at least one rate..."
+
+        days = np.array(sorted(rate_dict), dtype=float)
+        self.times = days / 365 # Knot maturities in years
+        self.rates = np.array([rate_dict[key] for key in sorted(rate_dict)], dtype=float)
+        self.method = method
+        self._log_df = -self.rates * self.times
+        self._pchip = None
+        if method == 'monotone_cubic' and len(self.times) > 1:
+            from scipy.interpolate import PchipInterpolator
+            self._pchip = PchipInterpolator(self.times, self.rates, extrapolate=False)
+
+    @classmethod
+    def from_provider(cls, method: str = 'linear') -> 'YieldCurve':
+        """Builds the curve from the shared FRED snapshot"""
+        return cls(get_rates_value_dict(), method)
+
+    def rate(self, t, method: str = None):
+        """Returns the annual rate(s) for maturities t (years), as a float for a scalar t"""
+        method = method or self.method
+        if method not in self.methods:
+            raise ValueError(f"Interpolation method must be one of {self.methods}...")
+
+        t = np.asarray(t, dtype=float)
+        clipped = np.clip(t, self.times[0], self.times[-1]) # Flat beyond the first and last knots
+        if method == 'linear' or len(self.times) == 1:
+            rates = np.interp(clipped, self.times, self.rates)
+        elif method == 'log_linear':
+            rates = -np.interp(clipped, self.times, self._log_df) / clipped
+        else:
+            pchip = self._pchip
+            if pchip is None:
+                from scipy.interpolate import PchipInterpolator
+                pchip = PchipInterpolator(self.times, self.rates, extrapolate=False)
+            rates = pchip(clipped)
+
+        return float(rates) if rates.ndim == 0 else rates
+
+    def discount_factor(self, t, method: str = None):
+        """Returns exp(-r(t) * t) for maturities t (years)"""
+        return np.exp(-np.asarray(self.rate(t, method)) * np.asarray(t, dtype=float))
+
+    def forward_rate(self, t1, t2, method: str = None):
+        """Returns the annualized forward rate between maturities t1 < t2 (years)"""
+        t1, t2 = np.asarray(t1, dtype=float), np.asarray(t2, dtype=float)
+        assert np.all(t2 > t1), "Forward rates require t2 > t1..."
+        return (np.asarray(self.rate(t2, method)) * t2 - np.asarray(self.rate(t1, method)) * t1) / (t2 - t1)
+
+
+def interpolate_rates(rate_dict: dict, time: float) -> float:
+    return YieldCurve(rate_dict).rate(time)
+
+
+# --- Day Filter Helper Function --- 
+def day_filter(days_ls, iv_ls, start_day, end_day):
+    filtered_days = []
+    start_idx = None
+    end_idx = None
+
+    for i, day in enumerate(days_ls):
+        if day >= start_day:
+            if day <= end_day:
+                if start_idx is None:
+                    start_idx = i
+                end_idx = i 
+                filtered_days.append(day)
+    
+    if start_idx is not None and end_idx is not None:
+        filtered_iv = iv_ls[start_idx : end_idx + 1]
+    else:
+        filtered_iv = []
+    
+    return filtered_days, filtered_iv
@@ -0,0 +1,278 @@
+"""
+Heatmap layer: draws Matrix and Strategy grids with matplotlib, Plotly, or a cached PNG.
+"""
+import io
+import hashlib
+import threading
+import matplotlib
+import numpy as np
+import matplotlib.colors as mcolors
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from collections import OrderedDict
+
+from .pricing import Matrix, Strategy
+
+
+# --- Heatmap Plotting Class --- 
+class Plotting(Matrix):
+    def __init__(self, matrix, instance, strategy: str, ticker: str):
+        
+        self.matrix = matrix
+        self.instance = instance
+        self.strategy = strategy
+        self.ticker = ticker
+
+    # Internal helper method, generates the master matrix that will be plotted
+    def _get_matrix(self) -> np.ndarray:
+        if isinstance(self.matrix, np.ndarray):
+            return self.matrix
+        elif isinstance(self.matrix, list) and len(self.matrix) > 0:
+            if all(isinstance(m, np.ndarray) for m in self.matrix):
+                return np.sum(self.matrix, axis=0)
+            else:
+                raise ValueError("All elements in matrix list must be numpy arrays...")
+        else:
+            raise ValueError("Matrix must be a numpy array or a list of numpy arrays...")
+    
+    # Internal helper method, generates the formatted IV list for the graph
+    def _get_iv_list(self):
+        if isinstance(self.instance, (Matrix, Strategy)):
+            return self.instance.format_iv_list()
+        
+        if isinstance(self.instance, list):
+            iv_list = [matrix.format_iv_list() for matrix in self.instance]
+
+            iv_list_format = []
+            for lst_el in range(len(iv_list[0])):
+                iv_string = ""
+                for idx in range(len(self.instance)):
+                    if iv_string == "":
+                        iv_string = iv_list[idx][lst_el]
+                    else:
+                        iv_string += f" / {iv_list[idx][lst_el]}"
+                iv_list_format.append(iv_string)
+
+            return iv_list_format
+        
+        raise TypeError("Invalid type, must be Matrix or list of Matrix instances...")
+    
+    def heatmap(self, ax=None, cbar_kw=None, cbarlabel="", **kwargs):
+        if ax is None:
+            ax = Figure().add_subplot()
+
+        if cbar_kw is None:
+            cbar_kw = {}
+
+        cbar_kw.setdefault("shrink", 0.7)
+
+        matrix = self._get_matrix()
+
+        im = ax.imshow(np.ma.masked_invalid(matrix), **kwargs) # Non-finite cells are left blank
+
+        cbar = ax.figure.colorbar(im, ax=ax, **cbar_kw)
+        cbar.ax.set_ylabel(cbarlabel, rotation=-90, va="bottom", color='white')
+        cbar.ax.yaxis.set_tick_params(color='white')  
+        for label in cbar.ax.get_yticklabels():
+            label.set_color('white')
+
+        iv_list_format = self._get_iv_list()
+        if isinstance(self.instance, list):
+            spot_list_format = [round(x, 2) for x in self.instance[0].offset_spot_arr()]
+        else:
+            spot_list_format = [round(x, 2) for x in self.instance.offset_spot_arr()]
+
+        ax.set_xticks(range(matrix.shape[1]), labels=spot_list_format)
+        ax.set_yticks(range(matrix.shape[0]), labels=iv_list_format)
+        ax.tick_params(axis='x', colors='white')
+        ax.tick_params(axis='y', colors='white')
+
+        ax.spines[:].set_visible(False)
+        ax.grid(which="minor", color="w", linestyle='-', linewidth=3)
+        ax.tick_params(which="minor", bottom=False, left=False)
+
+        return im, cbar
+
+    def annotate_heatmap(self, im, valfmt="{x:.2f}",
+                        textcolors=("black", "black"),
+                        threshold=None, **textkw):
+        
+        matrix = self._get_matrix()
+
+        if threshold is not None:
+            threshold = im.norm(threshold)
+        else:
+            threshold = im.norm(np.max(matrix[np.isfinite(matrix)], initial=0))/2.
+
+        kw = dict(horizontalalignment="center",
+                verticalalignment="center")
+        kw.update(textkw)
+
+        if isinstance(valfmt, str):
+            valfmt = matplotlib.ticker.StrMethodFormatter(valfmt)
+
+        texts = []
+        for i in range(matrix.shape[0]):
+            for j in range(matrix.shape[1]):
+                if not np.isfinite(matrix[i, j]):
+                    continue
+                kw.update(color=textcolors[int(im.norm(matrix[i, j]) > threshold)])
+                text = im.axes.text(j, i, valfmt(matrix[i, j], None), **kw)
+                texts.append(text)
+
+        return texts
+    
+    # Internal helper method, the colors, norm, labels and number format shared by every backend
+    def _plot_spec(self, direction='Long', option_type='Call', metric='PnL') -> dict:
+        strategy_values = np.array(self._get_matrix(), dtype=float)
+        finite_values = strategy_values[np.isfinite(strategy_values)] # Non-finite cells are drawn blank
+        if not finite_values.size:
+            finite_values = np.zeros(1)
+        strategy_values = np.where(np.isfinite(strategy_values), strategy_values, np.nan)
+        vmin, vmax = np.min(finite_values), np.max(finite_values)
+        if vmin < 0 and vmax <= 0:  
+            vcenter = np.mean(finite_values)
+            colors = ["red", "orange", "yellow", "white"]
+        elif vmin < 0 and vmax > 0:  
+            vcenter = 0
+            colors = ["red", "white", "green"]
+        else:  
+            vcenter = np.mean(finite_values)
+            colors = ["white", "lightblue", "green"]
+        # Flat grids (ie the gamma of a deep in-the-money option) and a mean rounded onto a limit still need a valid norm
+        spread = max(abs(vcenter), 1.0) * 1e-6
+        if not vmin < vcenter - spread / 2:
+            vmin = vcenter - spread
+        if not vcenter + spread / 2 < vmax:
+            vmax = vcenter + spread
+
+        if self.strategy == 'Straddle':
+            title = f"PnL of {direction} Straddle for {self.ticker}"
+            ylabel = "Implied Volatility (call / put)"
+        elif self.strategy == 'Long Call Butterfly':
+            title = f"PnL of {self.strategy} for {self.ticker}"
+            ylabel = "Implied Volatility (low / atm / high)"
+        elif self.strategy == 'Short Call Butterfly':
+            title = f"PnL of {self.strategy} for {self.ticker}"
+            ylabel = "Implied Volatility (low / atm / high)"
+        elif self.strategy == 'Long Put Butterfly':
+            title = f"PnL of {self.strategy} for {self.ticker}"
+            ylabel = "Implied Volatility (low / atm / high)"
+        elif self.strategy == 'Short Put Butterfly':
+            title = f"PnL of {self.strategy} for {self.ticker}"
+            ylabel = "Implied Volatility (low / atm / high)"
+        elif self.strategy == "Iron Butterfly":
+            title = f"PnL of {self.strategy} for {self.ticker}"
+            ylabel = "Implied Volatility (low / atm (p) / atm (c) / high)"
+        elif self.strategy == "Reverse Iron Butterfly":
+            title = f"PnL of {self.strategy} for {self.ticker}"
+            ylabel = "Implied Volatility (low / atm (p) / atm (c) / high)"
+        elif isinstance(self.instance, Strategy):
+            title = f"PnL of {self.strategy} for {self.ticker}"
+            ylabel = f"Implied Volatility ({self.instance.iv_label()})"
+        else:
+            title = f"PnL for {direction} {self.ticker} {option_type} Option"
+            ylabel = "Implied Volatility"
+
+        label = metric.capitalize() if metric != 'PnL' else metric
+        spot_instance = self.instance[0] if isinstance(self.instance, list) else self.instance
+        return {
+            'values': strategy_values,
+            'colors': colors,
+            'vmin': vmin, 'vcenter': vcenter, 'vmax': vmax,
+            'decimals': 2 if metric == 'PnL' or np.max(np.abs(finite_values)) >= 1 else 4, # Greeks like gamma are small
+            'label': label,
+            'title': title.replace("PnL", label, 1),
+            'ylabel': ylabel,
+            'spot_labels': [round(x, 2) for x in spot_instance.offset_spot_arr()],
+            'iv_labels': self._get_iv_list(),
+        }
+
+    def plot(self, direction='Long', option_type='Call', metric='PnL'):
+        # A standalone Figure on its own Agg canvas, not pyplot's global figure manager, so sessions can render concurrently
+        fig = Figure(figsize=(10,10), facecolor='none')
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+
+        spec = self._plot_spec(direction, option_type, metric)
+        color_map = mcolors.LinearSegmentedColormap.from_list("Heatmap", spec['colors'])
+        norm = mcolors.TwoSlopeNorm(vmin=spec['vmin'], vcenter=spec['vcenter'], vmax=spec['vmax'])
+
+        im, cbar = self.heatmap(ax=ax, cmap=color_map, norm=norm, cbarlabel=spec['label'], cbar_kw={'shrink': 0.7})
+        texts = self.annotate_heatmap(im, valfmt=f"{{x:.{spec['decimals']}f}}", textcolors=("black", "black"))
+
+        ax.set_title(spec['title'], fontsize=20, fontweight='bold', color='white')
+        ax.set_xlabel("Spot Price", fontsize=14, color='white')
+        ax.set_ylabel(spec['ylabel'], fontsize=14, color='white')
+
+        fig.tight_layout()
+        
+        return fig
+
+    def plot_interactive(self, direction='Long', option_type='Call', metric='PnL'):
+        """
+        Plotly heatmap of the same grid: the values go to the browser as one array and the cell labels
+        are drawn client-side by a texttemplate, so a 41x41 grid costs about as much as a 9x9 one
+        """
+        import plotly.graph_objects as go # Only the pages that draw interactive heatmaps pay for plotly
+
+        spec = self._plot_spec(direction, option_type, metric)
+
+        # Piecewise color stops put vcenter at the middle color, as TwoSlopeNorm does for matplotlib
+        center = (spec['vcenter'] - spec['vmin']) / (spec['vmax'] - spec['vmin'])
+        stops = np.linspace(0, 1, len(spec['colors']))
+        stops = np.where(stops <= 0.5, stops * 2 * center, center + (stops - 0.5) * 2 * (1 - center))
+        text_size = max(8, min(14, int(14 * 9 / max(spec['values'].shape)) + 4))
+
+        fig = go.Figure(go.Heatmap(
+            z=spec['values'],
+            x=[str(spot) for spot in spec['spot_labels']],
+            y=spec['iv_labels'],
+            zmin=spec['vmin'],
+            zmax=spec['vmax'],
+            colorscale=[[float(stop), color] for stop, color in zip(stops, spec['colors'])],
+            texttemplate=f"%{{z:.{spec['decimals']}f}}",
+            textfont=dict(color='black', size=text_size),
+            colorbar=dict(title=spec['label']),
+            hovertemplate=f"Spot: %{{x}}<br>IV: %{{y}}<br>{spec['label']}: %{{z:.{spec['decimals'] + 2}f}}<extra></extra>",
+            xgap=1,
+            ygap=1,
+        ))
+        fig.update_layout(
+            title=dict(text=spec['title'], font=dict(size=20, weight='bold')),
+            xaxis=dict(title='Spot Price', type='category'),
+            yaxis=dict(title=spec['ylabel'], type='category', autorange='reversed'), # Row 0 on top, as imshow draws it
+            height=800,
+            margin=dict(l=50, r=50, b=50, t=80),
+        )
+
+        return fig
+
+    _raster_cache = OrderedDict() # {hash of grid, labels and title: PNG bytes}, shared by every session
+    _raster_lock = threading.Lock()
+    raster_cache_size = 64
+
+    def plot_image(self, direction='Long', option_type='Call', metric='PnL', dpi=100) -> bytes:
+        """
+        PNG of plot(), cached by a hash of the grid values, axis labels and title, so reruns that do
+        not change the grid (ie any widget outside the pricing inputs) skip matplotlib entirely
+        """
+        spec = self._plot_spec(direction, option_type, metric)
+        digest = hashlib.sha1(np.ascontiguousarray(spec['values'], dtype=float).tobytes())
+        digest.update(repr((spec['values'].shape, spec['spot_labels'], spec['iv_labels'], spec['title'], spec['ylabel'], dpi)).encode())
+        key = digest.hexdigest()
+
+        with Plotting._raster_lock:
+            if key in Plotting._raster_cache:
+                Plotting._raster_cache.move_to_end(key)
+                return Plotting._raster_cache[key]
+
+        fig = self.plot(direction, option_type, metric)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', dpi=dpi, transparent=True) # Nothing to close, the figure was never registered with pyplot
+
+        with Plotting._raster_lock:
+            Plotting._raster_cache[key] = buffer.getvalue()
+            while len(Plotting._raster_cache) > Plotting.raster_cache_size:
+                Plotting._raster_cache.popitem(last=False)
+        return buffer.getvalue()
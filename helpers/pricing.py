@@ -0,0 +1,1169 @@
+"""
+Pricing core: kernels, the BlackScholes, Binomial and Barone-Adesi-Whaley engines, the implied
+volatility solver, and the Matrix, Strategy and ScenarioCube grids. Only NumPy is imported with
+the module; SciPy's normal CDF and numba are loaded the first time a price needs them.
+"""
+import math
+import threading
+import importlib.util
+import numpy as np
+from collections import namedtuple, OrderedDict
+
+NUMBA_AVAILABLE = importlib.util.find_spec('numba') is not None # Optional accelerator for the pricing kernels
+
+
+# --- Compiled Kernel Layer ---
+def _norm_cdf_scalar(x: float) -> float:
+    return 0.5 * math.erfc(-x / math.sqrt(2.0))
+
+def _norm_pdf_scalar(x: float) -> float:
+    return math.exp(-0.5 * x * x) / math.sqrt(2.0 * math.pi)
+
+def _crr_recursive_scalar(s, k, r, dt, u, d, p, n, sign, american):
+    # Same node-by-node recursion as Binomial._recursive_call/_recursive_put, written for the JIT
+    C = np.empty(n + 1)
+    for j in range(n + 1):
+        C[j] = max(sign * (s * u**j * d**(n - j) - k), 0.0)
+
+    disc = math.exp(-r * dt)
+    C_delta = np.zeros(2)
+    C_gamma = np.zeros(3)
+    for i in range(n - 1, -1, -1):
+        for j in range(i + 1):
+            ev = disc * (p * C[j + 1] + (1 - p) * C[j])
+            if american:
+                C[j] = max(ev, sign * (s * u**j * d**(i - j) - k))
+            else:
+                C[j] = ev
+
+        if i == 1:
+            C_delta[0], C_delta[1] = C[0], C[1]
+        elif i == 2:
+            C_gamma[0], C_gamma[1], C_gamma[2] = C[0], C[1], C[2]
+
+    return C[0], C_delta, C_gamma
+
+def _norm_cdf(x):
+    from scipy.special import ndtr # scipy.stats.norm.cdf without the cost of importing scipy.stats
+    return ndtr(x)
+
+def _norm_pdf(x):
+    return np.exp(-0.5 * np.square(x)) / math.sqrt(2.0 * math.pi)
+
+
+class _KernelTable(dict):
+    """Kernel lookup that loads the KERNEL_BACKEND kernels (and numba with them) on first use"""
+    def __missing__(self, name):
+        set_kernel_backend(KERNEL_BACKEND)
+        return self[name]
+
+
+_NUMPY_KERNELS = {'norm_cdf': _norm_cdf, 'norm_pdf': _norm_pdf, 'crr_recursive': None}
+_kernels = _KernelTable()
+
+def set_kernel_backend(backend: str) -> str:
+    """
+    Selects the kernels used by the scalar BlackScholes methods and the recursive
+    Binomial path: 'numba' (JIT-compiled) or 'numpy' (SciPy and Python loops).
+    """
+    if backend == 'numba':
+        if not NUMBA_AVAILABLE:
+            raise ImportError("The 'numba' kernel backend requires numba to be installed...")
+        import numba
+        _kernels.update({
+            'norm_cdf': numba.njit(cache=True)(_norm_cdf_scalar),
+            'norm_pdf': numba.njit(cache=True)(_norm_pdf_scalar),
+            'crr_recursive': numba.njit(cache=True)(_crr_recursive_scalar),
+        })
+    elif backend == 'numpy':
+        _kernels.update(_NUMPY_KERNELS)
+    else:
+        raise ValueError("Kernel backend must be 'numba' or 'numpy'...")
+
+    return backend
+
+KERNEL_BACKEND = 'numpy' # Applied on the first kernel lookup; numba is opt-in since loading it costs more than it saves per scalar price
+
+
+# --- BlackScholes Option Pricing Class ---
+class BlackScholes:
+    def __init__(self, k, s, r, t, iv, b):
+        assert all(x >= 0 for x in [k, s, r, t, iv, b]), "Input parameters for BlackScholes must be greater than or equal to zero..."
+        k, s, r, t, iv, b = [float(x) for x in [k, s, r, t, iv, b]]
+
+        self.k = k # Strike
+        self.s = s # Spot
+        self.r = r # Risk free rate (annual; input in decimal form ie 5.0% --> 0.05)
+        self.t = t # Time (fraction of years; input in decimal form ie 3 months --> 0.25)
+        self.iv = iv # Implied volatility (input in decimal form ie 20.0% --> 0.20)
+        self.b = b # Dividend rate (annual; input in decimal form ie 2.0% --> 0.02)
+
+    def _d1(self) -> float:
+        return (np.log(self.s/self.k) + (self.b + self.iv**2 * 0.5) * self.t) / (np.sqrt(self.t) * self.iv)
+        
+    def _d2(self) -> float:
+        return self._d1() - self.iv * np.sqrt(self.t)
+    
+    def call_px(self) -> float:
+        return self.s * np.exp((self.b-self.r) * self.t) * _kernels['norm_cdf'](self._d1()) - self.k * np.exp(-self.r * self.t) * _kernels['norm_cdf'](self._d2())
+    
+    def put_px(self) -> float:
+        return self.k * np.exp(-self.r * self.t) * _kernels['norm_cdf'](-self._d2()) - self.s * np.exp((self.b-self.r) * self.t) * _kernels['norm_cdf'](-self._d1())
+
+    def delta(self, option_type: str = 'Call') -> float:
+        option_type = option_type.capitalize()
+        if option_type not in ['Call', 'Put']:
+            raise ValueError("Option type must be 'Call' or 'Put'...")
+        
+        if option_type == 'Call':
+            return np.exp((self.b-self.r) * self.t) * _kernels['norm_cdf'](self._d1())
+        else:
+            return -np.exp((self.b-self.r) * self.t) * _kernels['norm_cdf'](-self._d1())
+        
+    def gamma(self) -> float:
+        return (np.exp((self.b-self.r) * self.t) * _kernels['norm_pdf'](self._d1())) / (self.s * self.iv * np.sqrt(self.t))
+    
+    def vega(self) -> float:
+        return (self.s * np.exp((self.b-self.r) * self.t) * _kernels['norm_pdf'](self._d1()) * np.sqrt(self.t)) / 100 # Scales to a one percentage point change (ie 1%)
+
+    def rho(self, option_type: str = 'Call') -> float:
+        option_type = option_type.capitalize()
+        if option_type not in ['Call', 'Put']:
+            raise ValueError("Option type must be 'Call' or 'Put'...")
+        
+        if option_type == 'Call':
+            return self.t * self.k * np.exp(-self.r * self.t) * _kernels['norm_cdf'](self._d2()) / 100  # Scales to a one percentage point change (ie 1%)
+        else:
+            return -self.t * self.k * np.exp(-self.r * self.t) * _kernels['norm_cdf'](-self._d2()) / 100 # Scales to a one percentage point change (ie 1%)
+    
+    def theta(self, option_type: str = 'Call') -> float:
+        option_type = option_type.capitalize()
+        if option_type not in ['Call', 'Put']:
+            raise ValueError("Option type must be 'Call' or 'Put'...")
+        
+        term1 = -(self.s * np.exp((self.b-self.r) * self.t) * _kernels['norm_pdf'](self._d1()) * self.iv) / (2 * np.sqrt(self.t))
+        if option_type == 'Call':
+            term2 = (self.b - self.r) * self.s * np.exp((self.b-self.r) * self.t) * _kernels['norm_cdf'](self._d1()) - (self.r * self.k * np.exp(-self.r * self.t) * _kernels['norm_cdf'](self._d2()))
+            return (term1 + term2) / 365 # Scaled to represent a one day change 
+        else:
+            term2 = (self.b - self.r) * self.s * np.exp((self.b-self.r) * self.t) * _kernels['norm_cdf'](-self._d1()) + (self.r * self.k * np.exp(-self.r * self.t) * _kernels['norm_cdf'](-self._d2()))
+            return (term1 + term2) / 365 # Scaled to represent a one day change 
+        
+    def vanna(self) -> float:
+        return -np.exp((self.b-self.r) * self.t) * _kernels['norm_pdf'](self._d1()) * (self._d2() / self.iv)
+
+    def charm(self, option_type: str = 'Call') -> float:
+        option_type = option_type.capitalize()
+        if option_type not in ['Call', 'Put']:
+            raise ValueError("Option type must be 'Call' or 'Put'...")
+        
+        term1 = _kernels['norm_pdf'](self._d1()) * ((self.b / (self.iv * np.sqrt(self.t))) - (self._d2() / (2 * self.t)))
+        term2 = (self.b - self.r) * _kernels['norm_cdf'](self._d1())
+        if option_type == 'Call':
+            return -np.exp((self.b - self.r) * self.t) * (term1 + term2) / 252 # Scaled to represent trading calendar
+        else:
+            return -np.exp((self.b - self.r) * self.t) * (term1 - (self.b - self.r) * _kernels['norm_cdf'](-self._d1())) / 252 # Scaled to represent trading calendar
+        
+    def volga(self) -> float:
+        return self.vega() * (self._d1() * self._d2() / self.iv) / 100
+
+    @classmethod
+    def batch(cls, k, s, r, t, iv, b, option_type='Call') -> dict[str, np.ndarray]:
+        """
+        Prices arrays of contracts in a single pass and returns the price and all
+        eight Greeks, each broadcast to the common shape of the inputs.
+
+        option_type may be 'Call'/'Put', an array of those strings, or a boolean
+        mask where True marks a call. Greeks use the same scaling as the scalar methods.
+        """
+        sign = np.where(_call_mask(option_type), 1.0, -1.0)
+        k, s, r, t, iv, b, sign = np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in [k, s, r, t, iv, b, sign]])
+        assert all(np.all(x >= 0) for x in [k, s, r, t, iv, b]), "Input parameters for BlackScholes must be greater than or equal to zero..."
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sqrt_t = np.sqrt(t)
+            d1 = (np.log(s/k) + (b + iv**2 * 0.5) * t) / (sqrt_t * iv)
+            d2 = d1 - iv * sqrt_t
+            carry_df = np.exp((b-r) * t) # Shared discount terms
+            rate_df = np.exp(-r * t)
+            pdf_d1 = _norm_pdf(d1)
+            cdf_d1 = _norm_cdf(sign * d1) # N(d1) for calls, N(-d1) for puts
+            cdf_d2 = _norm_cdf(sign * d2)
+
+            vega = s * carry_df * pdf_d1 * sqrt_t
+            term1 = -(s * carry_df * pdf_d1 * iv) / (2 * sqrt_t)
+            term2 = (b - r) * s * carry_df * cdf_d1 - sign * r * k * rate_df * cdf_d2
+            charm_term = pdf_d1 * ((b / (iv * sqrt_t)) - (d2 / (2 * t)))
+
+            return {
+                'px': sign * (s * carry_df * cdf_d1 - k * rate_df * cdf_d2),
+                'delta': sign * carry_df * cdf_d1,
+                'gamma': (carry_df * pdf_d1) / (s * iv * sqrt_t),
+                'vega': vega / 100, # Scales to a one percentage point change (ie 1%)
+                'volga': (vega / 100) * (d1 * d2 / iv) / 100,
+                'theta': (term1 + term2) / 365, # Scaled to represent a one day change
+                'rho': sign * t * k * rate_df * cdf_d2 / 100, # Scales to a one percentage point change (ie 1%)
+                'vanna': -carry_df * pdf_d1 * (d2 / iv),
+                'charm': -carry_df * (charm_term + sign * (b - r) * cdf_d1) / 252, # Scaled to represent trading calendar
+            }
+
+
+# --- Option Type Helper Function ---
+def _call_mask(option_type) -> np.ndarray:
+    """Converts 'Call'/'Put' (or an array of them, or a boolean mask) into a boolean call mask."""
+    if isinstance(option_type, str):
+        option_type = option_type.capitalize()
+        if option_type not in ['Call', 'Put']:
+            raise ValueError("Option type must be 'Call' or 'Put'...")
+        return np.asarray(option_type == 'Call')
+
+    option_type = np.asarray(option_type)
+    if option_type.dtype == bool:
+        return option_type
+
+    option_type = np.char.capitalize(option_type.astype(str))
+    if not np.isin(option_type, ['Call', 'Put']).all():
+        raise ValueError("Option type must be 'Call' or 'Put'...")
+    return option_type == 'Call'
+
+
+# --- Binomial Option Pricing Class ---
+class Binomial:
+    DEFAULT_TOL = 0.05 # Price tolerance of adaptive (dollars per contract), used by the dashboard grids
+
+    def __init__(self, k, s, r, t, iv, b, n: int=300, style='American', calc='lin_alg'):
+        assert all(x >= 0 for x in [k, s, r, t, iv, b, n]), "Input parameters for Binomial must be greater than or equal to zero..."
+        assert style in ['American', 'European'], "style must be 'American' or 'European'..."
+        assert calc in ['lin_alg', 'recursive'], "calc must be 'lin_alg or 'recursive'..."
+        k, s, r, t, iv, b = [float(x) for x in [k, s, r, t, iv, b]]
+        n = int(n)
+        
+        self.k = k # Strike
+        self.s = s # Spot
+        self.r = r # Risk free rate (annual; input in decimal form ie 5.0% --> 0.05)
+        self.t = t # Time (fraction of years; input in decimal form ie 3 months --> 0.25)
+        self.iv = iv # Implied volatility (input in decimal form ie 20.0% --> 0.20)
+        self.b = b # Dividend rate (annual; input in decimal form ie 2.0% --> 0.02)
+        self.n = n # Number of steps
+        self.style = style
+        self.calc = calc
+        self.dt = t / n
+        self.u = np.exp(self.iv * np.sqrt(self.dt))
+        self.d = 1 / self.u
+        self.adj_r = self.r - self.b
+        self.p = (np.exp(self.adj_r * self.dt) - self.d) / (self.u - self.d)
+        self._C_delta = [0, 0] # Call or put step values for delta calculation
+        self._C_gamma = [0, 0, 0] # Call or put step values for gamma calculation
+
+    def _recursive_call(self) -> float:
+        if _kernels['crr_recursive'] is not None:
+            px, C_delta, C_gamma = _kernels['crr_recursive'](self.s, self.k, self.r, self.dt, self.u, self.d, self.p, 
+                                                             self.n, 1.0, self.style == 'American')
+            self._C_delta, self._C_gamma = list(C_delta), list(C_gamma)
+            return px
+
+        # Stock prices at maturity
+        S = np.zeros(self.n + 1)
+        for j in range(0, self.n + 1):
+            S[j] = self.s * self.u**j * self.d**(self.n - j)
+
+        # Option payoff at maturity
+        C = np.zeros(self.n + 1)
+        for j in range(0, self.n + 1):
+            C[j] = max(S[j] - self.k, 0)
+
+        # Backward recursion
+        for i in range(self.n - 1, -1, -1):
+            for j in range(0, i + 1):
+
+                ev = np.exp(-self.r*self.dt) * (self.p * C[j + 1] + (1 - self.p) * C[j])
+
+                if self.style == 'American':
+                    current_S_node = self.s * (self.u**j) * (self.d**(i - j))
+                    C[j] = max(ev, current_S_node - self.k)
+                else:
+                    C[j] = ev
+
+                # For delta and gamma calculations
+                if i == 1:
+                    self._C_delta[0] = C[0]
+                    self._C_delta[1] = C[1]
+                elif i == 2:
+                    self._C_gamma[0] = C[0] 
+                    self._C_gamma[1] = C[1] 
+                    self._C_gamma[2] = C[2]
+
+        return C[0]
+    
+    def _lin_alg_call(self) -> float:
+        px, step_one, step_two = Binomial._lattice(self.k, self.s, self.r, self.t, self.iv, self.b, 1.0, self.n, self.style)
+        self._C_delta, self._C_gamma = list(step_one[0]), list(step_two[0])
+        return px[0]
+
+    def call_px(self) -> float:
+        if self.calc == 'lin_alg':
+            return self._lin_alg_call()
+        
+        if self.calc == 'recursive':
+            return self._recursive_call()
+
+    def _recursive_put(self) -> float:
+        if _kernels['crr_recursive'] is not None:
+            px, C_delta, C_gamma = _kernels['crr_recursive'](self.s, self.k, self.r, self.dt, self.u, self.d, self.p, 
+                                                             self.n, -1.0, self.style == 'American')
+            self._C_delta, self._C_gamma = list(C_delta), list(C_gamma)
+            return px
+
+        # Stock prices at maturity
+        S = np.zeros(self.n + 1)
+        for j in range(0, self.n + 1):
+            S[j] = self.s * self.u**j * self.d**(self.n - j)
+
+        # Option payoff at maturity
+        C = np.zeros(self.n + 1)
+        for j in range(0, self.n + 1):
+            C[j] = max(self.k - S[j], 0)
+
+        # Backward recursion
+        for i in range(self.n - 1, -1, -1):
+            for j in range(0, i + 1):
+
+                ev = np.exp(-self.r*self.dt) * (self.p * C[j + 1] + (1 - self.p) * C[j])
+
+                if self.style == 'American':
+                    current_S_node = self.s * (self.u**j) * (self.d**(i - j))
+                    C[j] = max(ev, self.k - current_S_node)
+                else:
+                    C[j] = ev
+
+                # For delta and gamma calculations
+                if i == 1:
+                    self._C_delta[0] = C[0]
+                    self._C_delta[1] = C[1]
+                elif i == 2:
+                    self._C_gamma[0] = C[0] 
+                    self._C_gamma[1] = C[1] 
+                    self._C_gamma[2] = C[2]
+                    
+        return C[0]
+    
+    def _lin_alg_put(self) -> float:
+        px, step_one, step_two = Binomial._lattice(self.k, self.s, self.r, self.t, self.iv, self.b, -1.0, self.n, self.style)
+        self._C_delta, self._C_gamma = list(step_one[0]), list(step_two[0])
+        return px[0]
+    
+    def put_px(self) -> float:
+        if self.calc == 'lin_alg':
+            return self._lin_alg_put()
+        
+        if self.calc == 'recursive':
+            return self._recursive_put()
+
+    # Internal helper method, runs one backward induction for every scenario - not intended for external use
+    @staticmethod
+    def _lattice(k, s, r, t, iv, b, sign, n: int, style: str, 
+                 smooth: bool=False) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        k, s, r, t, iv, b, sign = [np.atleast_1d(x)[:, np.newaxis] for x in np.broadcast_arrays(k, s, r, t, iv, b, sign)]
+        dt = t / n
+        u = np.exp(iv * np.sqrt(dt))
+        d = 1 / u
+        p = (np.exp((r - b) * dt) - d) / (u - d)
+        disc_up = np.exp(-r * dt) * p
+        disc_down = np.exp(-r * dt) * (1 - p)
+
+        # Stock prices and option payoff at maturity (scenario x node)
+        S = s * d**np.arange(n, -1, -1) * u**np.arange(0, n + 1)
+        C = np.maximum(0, sign * (S - k))
+        buffer = np.empty_like(C)
+        step_one = np.full((C.shape[0], 2), np.nan) # Option values one and two steps in, for the Greeks
+        step_two = np.full((C.shape[0], 3), np.nan)
+        start = n - 1
+
+        # Binomial Black-Scholes: the last step is valued in closed form, which smooths convergence
+        if smooth:
+            S[:, :n] *= u
+            C[:, :n] = BaroneAdesiWhaley._european(k, S[:, :n], r, dt, iv, b, sign)[0]
+            if style == 'American':
+                np.maximum(C[:, :n], sign * (S[:, :n] - k), out=C[:, :n])
+            start = n - 2
+
+        # Backward recursion, updating the leading nodes in place
+        for i in range(start, -1, -1):
+            up = buffer[:, :i+1]
+            np.multiply(C[:, 1:i+2], disc_up, out=up)
+            C[:, :i+1] *= disc_down
+            C[:, :i+1] += up
+
+            if style == 'American':
+                S[:, :i+1] *= u # Node prices one step earlier: s * u**j * d**(i-j)
+                np.subtract(S[:, :i+1], k, out=up)
+                up *= sign
+                np.maximum(C[:, :i+1], up, out=C[:, :i+1])
+
+            if i == 2:
+                step_two[:] = C[:, :3]
+            elif i == 1:
+                step_one[:] = C[:, :2]
+
+        return C[:, 0].copy(), step_one, step_two
+
+    @classmethod
+    def batch(cls, k, s, r, t, iv, b, option_type='Call', n: int=300, style='American', 
+              greeks: bool=False) -> dict[str, np.ndarray]:
+        """
+        Prices arrays of contracts through one Cox-Ross-Rubinstein backward induction,
+        carrying every scenario as a row of a single (scenario x node) array.
+
+        Inputs broadcast like BlackScholes.batch and option_type may be 'Call'/'Put',
+        an array of those strings, or a boolean mask where True marks a call.
+
+        With greeks=True, delta, gamma and theta are read from the first tree nodes,
+        while vega and rho come from IV and rate bumps stacked into the same lattice.
+        Greeks use the same scaling as BlackScholes.
+        """
+        assert style in ['American', 'European'], "style must be 'American' or 'European'..."
+        sign = np.where(_call_mask(option_type), 1.0, -1.0)
+        k, s, r, t, iv, b, sign = np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in [k, s, r, t, iv, b, sign]])
+        assert all(np.all(x >= 0) for x in [k, s, r, t, iv, b]) and n >= 0, "Input parameters for Binomial must be greater than or equal to zero..."
+        shape = k.shape
+        k, s, r, t, iv, b, sign = [x.ravel() for x in [k, s, r, t, iv, b, sign]]
+
+        if not greeks:
+            return {'px': cls._lattice(k, s, r, t, iv, b, sign, int(n), style)[0].reshape(shape)}
+
+        assert n >= 3, "Binomial Greeks require at least three steps (gamma and theta read the second step)..."
+
+        # Base scenarios followed by IV and rate bumps, all priced in one backward induction
+        iv_bump = np.minimum(0.01, 0.5 * iv) # Keeps the lower IV bump positive (an IV of zero has no lattice)
+        iv_up, iv_down = iv + iv_bump, iv - iv_bump
+        r_up, r_down = r + 0.001, np.maximum(r - 0.001, 0)
+        stack = lambda base, *bumps: np.concatenate([base] + list(bumps))
+        px, step_one, step_two = cls._lattice(stack(k, k, k, k, k), stack(s, s, s, s, s), stack(r, r, r, r_up, r_down), 
+                                              stack(t, t, t, t, t), stack(iv, iv_up, iv_down, iv, iv), 
+                                              stack(b, b, b, b, b), stack(sign, sign, sign, sign, sign), int(n), style)
+        px = px.reshape(5, -1)
+        step_one, step_two = step_one[:len(k)], step_two[:len(k)]
+
+        dt = t / n
+        u = np.exp(iv * np.sqrt(dt))
+        d = 1 / u
+        s_up, s_down, s_uu, s_dd = s * u, s * d, s * u**2, s * d**2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            delta = (step_one[:, 1] - step_one[:, 0]) / (s_up - s_down)
+            gamma = (((step_two[:, 2] - step_two[:, 1]) / (s_uu - s)) - ((step_two[:, 1] - step_two[:, 0]) / (s - s_dd))) / (0.5 * (s_uu - s_dd))
+            theta = (step_two[:, 1] - px[0]) / (2 * dt)
+            vega = (px[1] - px[2]) / (iv_up - iv_down)
+            rho = (px[3] - px[4]) / (r_up - r_down)
+
+        return {
+            'px': px[0].reshape(shape),
+            'delta': delta.reshape(shape),
+            'gamma': gamma.reshape(shape),
+            'vega': (vega / 100).reshape(shape), # Scales to a one percentage point change (ie 1%)
+            'theta': (theta / 365).reshape(shape), # Scaled to represent a one day change
+            'rho': (rho / 100).reshape(shape), # Scales to a one percentage point change (ie 1%)
+        }
+
+    @classmethod
+    def adaptive(cls, k, s, r, t, iv, b, option_type='Call', tol: float=DEFAULT_TOL, style='American', 
+                 n: int=50, max_n: int=800) -> dict[str, np.ndarray]:
+        """
+        Prices arrays of contracts to a price tolerance instead of a fixed step count.
+
+        Each level prices a binomial Black-Scholes tree (the last step valued in closed
+        form, which removes the odd/even oscillation of plain CRR) and Richardson
+        extrapolates the n and 2n step prices. Steps double, for the unconverged
+        contracts only, until the error estimate is within tol or max_n is reached.
+        Returns the price with the step count and error estimate used.
+        """
+        assert style in ['American', 'European'], "style must be 'American' or 'European'..."
+        sign = np.where(_call_mask(option_type), 1.0, -1.0)
+        k, s, r, t, iv, b, sign = np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in [k, s, r, t, iv, b, sign]])
+        assert all(np.all(x >= 0) for x in [k, s, r, t, iv, b]) and tol > 0 and n >= 1, "Input parameters for Binomial must be greater than or equal to zero..."
+        shape = k.shape
+        inputs = [x.ravel() for x in [k, s, r, t, iv, b, sign]]
+
+        smoothed = lambda idx, steps: cls._lattice(*[x[idx] for x in inputs], steps, style, smooth=True)[0]
+
+        px, steps, error = np.full(len(inputs[0]), np.nan), np.zeros(len(inputs[0]), dtype=int), np.full(len(inputs[0]), np.nan)
+        active = np.arange(len(inputs[0]))
+        n = int(n)
+        coarse = smoothed(active, n)
+        while active.size:
+            fine = smoothed(active, 2 * n)
+            px[active] = 2 * fine - coarse # Richardson extrapolation for the 1/n convergence of the tree
+            error[active] = np.abs(fine - coarse)
+            steps[active] = 2 * n
+
+            unconverged = error[active] > tol
+            if 4 * n > max_n:
+                break
+            active, coarse = active[unconverged], fine[unconverged]
+            n *= 2
+
+        return {'px': px.reshape(shape), 'steps': steps.reshape(shape), 'error': error.reshape(shape)}
+
+    def _greeks(self, option_type: str) -> dict[str, float]:
+        greeks = Binomial.batch(self.k, self.s, self.r, self.t, self.iv, self.b, option_type, 
+                                n=self.n, style=self.style, greeks=True)
+        return {key: float(value) for key, value in greeks.items()}
+
+    def delta(self, option_type: str = 'Call') -> float:
+        return self._greeks(option_type)['delta']
+
+    def gamma(self, option_type: str = 'Call') -> float:
+        return self._greeks(option_type)['gamma']
+
+    def vega(self, option_type: str = 'Call') -> float:
+        return self._greeks(option_type)['vega']
+
+    def theta(self, option_type: str = 'Call') -> float:
+        return self._greeks(option_type)['theta']
+
+    def rho(self, option_type: str = 'Call') -> float:
+        return self._greeks(option_type)['rho']
+
+
+# --- Barone-Adesi-Whaley American Option Pricing Class ---
+class BaroneAdesiWhaley:
+    def __init__(self, k, s, r, t, iv, b):
+        assert all(x >= 0 for x in [k, s, r, t, iv, b]), "Input parameters for BaroneAdesiWhaley must be greater than or equal to zero..."
+        k, s, r, t, iv, b = [float(x) for x in [k, s, r, t, iv, b]]
+
+        self.k = k # Strike
+        self.s = s # Spot
+        self.r = r # Risk free rate (annual; input in decimal form ie 5.0% --> 0.05)
+        self.t = t # Time (fraction of years; input in decimal form ie 3 months --> 0.25)
+        self.iv = iv # Implied volatility (input in decimal form ie 20.0% --> 0.20)
+        self.b = b # Dividend rate (annual; input in decimal form ie 2.0% --> 0.02)
+
+    # Internal helper method, European price with a cost of carry of r - b (as in Binomial) - not intended for external use
+    @staticmethod
+    def _european(k, s, r, t, iv, b, sign) -> tuple[np.ndarray, np.ndarray]:
+        d1 = (np.log(s/k) + (r - b + iv**2 * 0.5) * t) / (iv * np.sqrt(t))
+        d2 = d1 - iv * np.sqrt(t)
+        px = sign * (s * np.exp(-b * t) * _norm_cdf(sign * d1) - k * np.exp(-r * t) * _norm_cdf(sign * d2))
+        return px, d1
+
+    # Internal helper method, solves for the critical spot price above (call) or below (put) which exercise is optimal
+    @staticmethod
+    def _critical_spot(k, r, t, iv, b, sign, q, iterations: int=100, tol: float=1e-6) -> np.ndarray:
+        carry = r - b
+        sqrt_t = np.sqrt(t)
+        q_inf = (-(2 * carry / iv**2 - 1) + sign * np.sqrt((2 * carry / iv**2 - 1)**2 + 8 * r / iv**2)) / 2
+        s_inf = k / (1 - 1 / q_inf)
+        h = -(carry * t + sign * 2 * iv * sqrt_t) * k / (s_inf - k)
+        s_star = s_inf + (k - s_inf) * np.exp(h) # Seed from Barone-Adesi & Whaley (1987)
+
+        active = np.ones(s_star.shape, dtype=bool)
+        for _ in range(iterations):
+            px, d1 = BaroneAdesiWhaley._european(k, s_star, r, t, iv, b, sign)
+            cdf_d1 = _norm_cdf(sign * d1)
+            rhs = px + sign * (1 - np.exp(-b * t) * cdf_d1) * s_star / q
+            slope = sign * np.exp(-b * t) * cdf_d1 * (1 - 1 / q) + sign * (1 - sign * np.exp(-b * t) * _norm_pdf(d1) / (iv * sqrt_t)) / q
+            update = (sign * k + rhs - slope * s_star) / (sign - slope)
+            update = np.where(active, update, s_star)
+            active = np.abs(sign * (s_star - k) - rhs) / k > tol
+            s_star = update
+            if not active.any():
+                break
+
+        return s_star
+
+    # Internal helper method, prices flattened arrays of contracts - not intended for external use
+    @staticmethod
+    def _price(k, s, r, t, iv, b, sign) -> np.ndarray:
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            european, _ = BaroneAdesiWhaley._european(k, s, r, t, iv, b, sign)
+            carry = r - b
+            # 2r / (iv**2 * (1 - exp(-rT))), with its limit 2 / (iv**2 * T) as r --> 0
+            m_over_k = np.where(r > 0, 2 * r / (iv**2 * -np.expm1(-r * t)), 2 / (iv**2 * t))
+            n = 2 * carry / iv**2
+            q = (-(n - 1) + sign * np.sqrt((n - 1)**2 + 4 * m_over_k)) / 2
+
+            s_star = BaroneAdesiWhaley._critical_spot(k, r, t, iv, b, sign, q)
+            _, d1_star = BaroneAdesiWhaley._european(k, s_star, r, t, iv, b, sign)
+            a = sign * (s_star / q) * (1 - np.exp(-b * t) * _norm_cdf(sign * d1_star))
+            american = np.where(sign * (s - s_star) < 0, european + a * (s / s_star)**q, sign * (s - k))
+
+            # Calls on non-dividend payers (and puts at a zero rate) are never exercised early
+            no_early_exercise = np.where(sign > 0, b <= 0, r <= 0) | (t <= 0) | (iv <= 0)
+            return np.where(no_early_exercise, european, np.maximum(american, european))
+
+    def call_px(self) -> float:
+        return float(self._price(*[np.atleast_1d(x) for x in [self.k, self.s, self.r, self.t, self.iv, self.b, 1.0]])[0])
+
+    def put_px(self) -> float:
+        return float(self._price(*[np.atleast_1d(x) for x in [self.k, self.s, self.r, self.t, self.iv, self.b, -1.0]])[0])
+
+    @classmethod
+    def batch(cls, k, s, r, t, iv, b, option_type='Call', greeks: bool=False) -> dict[str, np.ndarray]:
+        """
+        Prices arrays of American contracts with the Barone-Adesi-Whaley quadratic
+        approximation. Inputs broadcast like BlackScholes.batch.
+
+        With greeks=True, delta, gamma, vega, theta and rho are finite differences of
+        the closed form, with every bump priced in the same vectorized call.
+        Greeks use the same scaling as BlackScholes.
+        """
+        sign = np.where(_call_mask(option_type), 1.0, -1.0)
+        k, s, r, t, iv, b, sign = np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in [k, s, r, t, iv, b, sign]])
+        assert all(np.all(x >= 0) for x in [k, s, r, t, iv, b]), "Input parameters for BaroneAdesiWhaley must be greater than or equal to zero..."
+        shape = k.shape
+        k, s, r, t, iv, b, sign = [x.ravel() for x in [k, s, r, t, iv, b, sign]]
+
+        if not greeks:
+            return {'px': cls._price(k, s, r, t, iv, b, sign).reshape(shape)}
+
+        # Base contracts followed by spot, IV, rate and time bumps, priced in one call
+        ds = 0.001 * s
+        iv_up, iv_down = iv + 0.01, np.maximum(iv - 0.01, 0)
+        r_up, r_down = r + 0.001, np.maximum(r - 0.001, 0)
+        dt = np.minimum(1 / 365, t / 2)
+        stack = lambda *arrays: np.concatenate(arrays)
+        px = cls._price(stack(k, k, k, k, k, k, k, k), stack(s, s + ds, s - ds, s, s, s, s, s), 
+                        stack(r, r, r, r, r, r_up, r_down, r), stack(t, t, t, t, t, t, t, t - dt), 
+                        stack(iv, iv, iv, iv_up, iv_down, iv, iv, iv), stack(b, b, b, b, b, b, b, b), 
+                        stack(sign, sign, sign, sign, sign, sign, sign, sign)).reshape(8, -1)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return {
+                'px': px[0].reshape(shape),
+                'delta': ((px[1] - px[2]) / (2 * ds)).reshape(shape),
+                'gamma': ((px[1] - 2 * px[0] + px[2]) / ds**2).reshape(shape),
+                'vega': ((px[3] - px[4]) / (iv_up - iv_down) / 100).reshape(shape), # Scales to a one percentage point change (ie 1%)
+                'theta': ((px[7] - px[0]) / dt / 365).reshape(shape), # Scaled to represent a one day change
+                'rho': ((px[5] - px[6]) / (r_up - r_down) / 100).reshape(shape), # Scales to a one percentage point change (ie 1%)
+            }
+
+    def _greeks(self, option_type: str) -> dict[str, float]:
+        greeks = BaroneAdesiWhaley.batch(self.k, self.s, self.r, self.t, self.iv, self.b, option_type, greeks=True)
+        return {key: float(value) for key, value in greeks.items()}
+
+    def delta(self, option_type: str = 'Call') -> float:
+        return self._greeks(option_type)['delta']
+
+    def gamma(self, option_type: str = 'Call') -> float:
+        return self._greeks(option_type)['gamma']
+
+    def vega(self, option_type: str = 'Call') -> float:
+        return self._greeks(option_type)['vega']
+
+    def theta(self, option_type: str = 'Call') -> float:
+        return self._greeks(option_type)['theta']
+
+    def rho(self, option_type: str = 'Call') -> float:
+        return self._greeks(option_type)['rho']
+
+
+# --- Pricing Engine Registry ---
+ENGINES = {'BlackScholes': BlackScholes, 'Binomial': Binomial, 'BaroneAdesiWhaley': BaroneAdesiWhaley}
+
+
+def american_accuracy_report(n: int=2000, r: float=0.04, b: float=0.02) -> 'pd.DataFrame':
+    """
+    Compares BaroneAdesiWhaley against an n-step Binomial tree over a grid of
+    moneyness, time and implied volatility for calls and puts (strike of 100).
+    """
+    import pandas as pd # The report is the only pandas output of the pricing core
+
+    moneyness = np.array([0.8, 0.9, 0.95, 1.0, 1.05, 1.1, 1.2])
+    times = np.array([1/12, 0.25, 0.5, 1.0, 2.0])
+    ivs = np.array([0.15, 0.30, 0.50])
+    option_types = np.array(['Call', 'Put'])
+    grid = [x.ravel() for x in np.meshgrid(option_types, moneyness, times, ivs, indexing='ij')]
+    option_type, spot, t, iv = grid[0], grid[1].astype(float) * 100, grid[2].astype(float), grid[3].astype(float)
+
+    tree_px = Binomial.batch(100, spot, r, t, iv, b, option_type, n=n, style='American')['px']
+    baw_px = BaroneAdesiWhaley.batch(100, spot, r, t, iv, b, option_type)['px']
+
+    report = pd.DataFrame({'option_type': option_type, 'moneyness': spot / 100, 't': t, 'iv': iv, 
+                           'tree_px': tree_px, 'baw_px': baw_px})
+    report['abs_error'] = (report['baw_px'] - report['tree_px']).abs()
+    report['rel_error'] = report['abs_error'] / report['tree_px'].where(report['tree_px'] > 0.01)
+    return report
+
+
+# --- Implied Volatility Solver ---
+def implied_volatility(px, k, s, r, t, b, option_type='Call', style: str='European', tol: float=1e-6, 
+                       max_iter: int=100, n: int=100, iv_bounds: tuple=(1e-4, 5.0)) -> np.ndarray:
+    """
+    Inverts arrays of option prices into implied volatilities (decimal form) in one
+    vectorized solve. Each contract takes Newton steps with vega and falls back to
+    bisection whenever a step leaves the bracket, which shrinks as prices are seen,
+    until the volatility step is below tol.
+
+    b is the dividend yield, as in Binomial. European contracts are priced in closed
+    form (BaroneAdesiWhaley._european); with style='American' they are priced with an
+    n-step Binomial.batch lattice, using the European vega as the Newton slope.
+
+    Returns NaN where no volatility is resolved: prices outside the bracket, contracts
+    that do not converge in max_iter steps, roots within tol of iv_bounds, and roots where
+    vega is so small (ie deep in the money) that a tol change in volatility moves the
+    price by less than its rounding error.
+    """
+    assert style in ['American', 'European'], "style must be 'American' or 'European'..."
+    call_mask = _call_mask(option_type)
+    px, k, s, r, t, b, call_mask = np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in [px, k, s, r, t, b]], call_mask)
+    shape = px.shape
+    px, k, s, r, t, b, call_mask = [x.ravel() for x in [px, k, s, r, t, b, call_mask]]
+
+    def price(iv, idx):
+        european, d1 = BaroneAdesiWhaley._european(k[idx], s[idx], r[idx], t[idx], iv, b[idx], np.where(call_mask[idx], 1.0, -1.0))
+        vega = s[idx] * np.exp(-b[idx] * t[idx]) * _norm_pdf(d1) * np.sqrt(t[idx])
+        if style == 'American':
+            return Binomial.batch(k[idx], s[idx], r[idx], t[idx], iv, b[idx], call_mask[idx], n=n, style='American')['px'], vega
+        return european, vega
+
+    # Only prices inside the bracket have a solution
+    everything = np.arange(len(px))
+    lo, hi = np.full(len(px), iv_bounds[0]), np.full(len(px), iv_bounds[1])
+    if style == 'American':
+        lo = np.maximum(lo, 2 * np.abs(r - b) * np.sqrt(t / n)) # Keeps the lattice probability inside (0, 1)
+    valid = np.isfinite(px) & (px > 0) & (t > 0) & (s > 0) & (k > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        valid &= (price(lo, everything)[0] <= px) & (px <= price(hi, everything)[0])
+
+    iv = np.full(len(px), np.nan)
+    lower, upper = lo.copy(), hi.copy()
+    x = np.clip(np.sqrt(2 * np.pi / np.where(t > 0, t, 1)) * px / np.where(s > 0, s, 1), lo, hi) # Brenner-Subrahmanyam seed
+    active = np.flatnonzero(valid)
+    for _ in range(max_iter):
+        if not active.size:
+            break
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            model_px, vega = price(x[active], active)
+            diff = model_px - px[active]
+
+            hi[active] = np.where(diff > 0, x[active], hi[active])
+            lo[active] = np.where(diff < 0, x[active], lo[active])
+            step = np.where(diff == 0, x[active], x[active] - diff / vega)
+            inside = (diff == 0) | (np.isfinite(step) & (step > lo[active]) & (step < hi[active]))
+            step = np.where(inside, step, 0.5 * (lo[active] + hi[active]))
+
+        # Converged on the volatility step, so flat (low vega) prices cannot stop the solve early
+        converged = np.abs(step - x[active]) < tol
+        x[active] = step
+        iv[active[converged]] = step[converged]
+        active = active[~converged]
+
+    # Roots pinned to the bracket, or whose price barely depends on volatility, are not resolved
+    solved = np.flatnonzero(np.isfinite(iv))
+    sign = np.where(call_mask[solved], 1.0, -1.0)
+    european, d1 = BaroneAdesiWhaley._european(k[solved], s[solved], r[solved], t[solved], iv[solved], b[solved], sign)
+    spot_leg = s[solved] * np.exp(-b[solved] * t[solved])
+    vega = spot_leg * _norm_pdf(d1) * np.sqrt(t[solved])
+    resolution = 100 * np.finfo(float).eps * (2 * spot_leg * _norm_cdf(sign * d1) - sign * european) # Rounding error of the two legs
+    unresolved = (vega * tol <= resolution) | (iv[solved] - lower[solved] < tol) | (upper[solved] - iv[solved] < tol)
+    iv[solved[unresolved]] = np.nan
+
+    return iv.reshape(shape)
+
+
+# --- Memoization Layer ---
+class LRUCache:
+    """
+    Bounded least-recently-used memo shared by every session in the process, with hit and miss
+    counters. Values are computed outside the lock, so two threads missing the same key at once
+    may both compute it; arrays are stored read-only since every caller gets the same object.
+    """
+    def __init__(self, maxsize: int = 256):
+        assert maxsize >= 1, "LRUCache maxsize must be at least 1..."
+        self.maxsize = maxsize # Entries kept before the least recently used one is evicted
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = compute()
+        for array in (value.values() if isinstance(value, dict) else [value]):
+            if isinstance(array, np.ndarray):
+                array.setflags(write=False)
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def info(self) -> dict:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries), 'maxsize': self.maxsize}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+matrix_cache = LRUCache(maxsize=128) # Matrix price grids, keyed by every input that changes the grid
+greeks_cache = LRUCache(maxsize=1024) # option_greeks() results
+cube_cache = LRUCache(maxsize=32) # Strategy.scenario_cube() results, keyed by the strategy inputs and the cube axes
+grids_cache = LRUCache(maxsize=64) # Matrix and Strategy get_grids() results, keyed by the inputs, direction and metric set
+
+
+def option_greeks(k, s, r, t, iv, b, option_type='Call', style: str='European', engine: str=None, 
+                  steps: int=300) -> dict[str, float]:
+    """
+    Price and Greeks (delta, gamma, vega, volga, theta, rho, vanna, charm) of one contract,
+    memoized in greeks_cache on (k, s, r, t, iv, b, style, engine, steps, option_type). American
+    contracts take the price, delta, gamma, vega, theta and rho from the engine (Binomial by default).
+    """
+    option_type, style = option_type.capitalize(), style.capitalize()
+    engine = (engine or 'Binomial') if style == 'American' else 'BlackScholes'
+    key = tuple(float(x) for x in [k, s, r, t, iv, b]) + (style, engine, int(steps), option_type)
+
+    def compute():
+        greeks = BlackScholes.batch(k, s, r, t, iv, b, option_type)
+        if style == 'American':
+            engine_kwargs = {'style': style, 'n': steps} if engine == 'Binomial' else {}
+            greeks.update(ENGINES[engine].batch(k, s, r, t, iv, b, option_type, greeks=True, **engine_kwargs))
+        return {name: float(value) for name, value in greeks.items()}
+
+    return dict(greeks_cache.get_or_compute(key, compute))
+
+
+# --- Matrix PnL Generation Class ---
+GREEK_GRIDS = ['delta', 'gamma', 'vega', 'theta', 'vanna', 'charm'] # Greeks drawn as heatmaps next to the PnL
+GRID_LEVEL_FLOOR = 0.01 # Lowest IV and spot level as a fraction of the base (a 25% step on a 9-level grid reaches zero)
+MIN_TIME = 1 / (365 * 24) # Time to expiry (one hour) that grids at or past expiry are priced at
+
+
+class Matrix:
+    def __init__(self, spot, px, iv, k, r, t, b, option_type: str, style: str='European', 
+                 spot_step: float=0.05, iv_step: float=0.05, grid_size: int=9, engine: str=None, 
+                 steps: int=300, tol: float=None):
+        
+        assert all(x >= 0 for x in [spot, px, k, r, t, b, spot_step, iv_step]), "Input parameters for Matrix must be greater than or equal to zero..."
+
+        if not isinstance(grid_size, int) or grid_size < 1 or grid_size % 2 == 0:
+            raise ValueError("Grid size must be a positive odd integer...")
+
+        option_type = option_type.capitalize()
+        if option_type not in ['Call', 'Put']:
+            raise ValueError("Option type must be 'Call' or 'Put'...")
+        
+        style = style.capitalize()
+        if style not in ['American', 'European']:
+            raise ValueError("Contract type must be 'American' or 'European'...")
+
+        if engine is None:
+            engine = 'BlackScholes' if style == 'European' else 'Binomial'
+        if engine not in {'European': ['BlackScholes', 'Binomial'], 'American': ['Binomial', 'BaroneAdesiWhaley']}[style]:
+            raise ValueError("Engine must be 'BlackScholes' or 'Binomial' for European, or 'Binomial' or 'BaroneAdesiWhaley' for American...")
+
+        self.spot = spot # Spot price of the asset
+        self.px = px # Spot price of the option
+        self.iv = iv # Implied volatility of the option (decimal, ie 20% --> 0.20)
+        self.k = k # Strike price
+        self.r = r # Risk free rate (annual in decimal, ie 4.5% --> 0.045)
+        self.t = t # Time (years in decimal, ie 6 months --> 0.50)
+        self.b = b # Dividend yield (decimal, ie 3.5% --> 0.035)
+        self.option_type = option_type # Type of option (call or put)
+        self.style = style
+        self.spot_step = spot_step # Used to adjust the dashboard output
+        self.iv_step = iv_step # Used to adjust the dashboard output
+        self.grid_size = grid_size # Number of spot and IV levels, centered on the base values
+        self.engine = engine # Pricing engine used for the PnL grid
+        self.steps = steps # Binomial steps, used when no tolerance is given
+        self.tol = tol # Binomial price tolerance; when set, the step count adapts per cell
+        self.convergence = None # Binomial steps and error estimates used by the last adaptive grid
+        self.direction = None
+
+    def _offsets(self) -> np.ndarray:
+        half = self.grid_size // 2
+        return np.arange(-half, half + 1)
+    
+    def offset_spot_arr(self) -> np.ndarray:
+        return np.maximum(self.spot + (self.spot_step * self.spot) * self._offsets(), GRID_LEVEL_FLOOR * self.spot)
+    
+    def offset_iv_arr(self) -> np.ndarray:
+        return np.maximum(self.iv + (self.iv_step * self.iv) * self._offsets(), GRID_LEVEL_FLOOR * self.iv)
+ 
+    def format_iv_list(self) -> list:
+        return [f"{round(x*100,1)}%" for x in self.offset_iv_arr()]
+    
+    # Internal helper method, prices the grid on a matrix_cache miss - not intended for external use
+    def _price_grid(self) -> dict[str, np.ndarray]:
+        spot_list = self.offset_spot_arr()
+        iv_list = self.offset_iv_arr()    
+
+        # Rows are IV levels and columns are spot levels, priced in one broadcast
+        if self.engine == 'Binomial' and self.tol is not None:
+            result = Binomial.adaptive(self.k, spot_list[np.newaxis, :], self.r, self.t, iv_list[:, np.newaxis], 
+                                       self.b, self.option_type, tol=self.tol, style=self.style)
+            return {'px': result['px'], 'steps': result['steps'], 'error': result['error']}
+
+        engine_kwargs = {'style': self.style, 'n': self.steps} if self.engine == 'Binomial' else {}
+        return {'px': ENGINES[self.engine].batch(self.k, spot_list[np.newaxis, :], self.r, self.t, 
+                                                 iv_list[:, np.newaxis], self.b, self.option_type, **engine_kwargs)['px']}
+
+    def cache_key(self) -> tuple:
+        """Every input that changes the price grid (the option price and direction only shift the PnL)"""
+        steps = ('tol', self.tol) if self.engine == 'Binomial' and self.tol is not None else ('steps', self.steps)
+        return (tuple(float(x) for x in [self.k, self.spot, self.r, self.t, self.iv, self.b]) + 
+                (self.style, self.engine) + steps + (self.option_type, self.spot_step, self.iv_step, self.grid_size))
+
+    def get_matrix(self, direction="Long") -> np.ndarray:
+        grid = matrix_cache.get_or_compute(self.cache_key(), self._price_grid)
+        if 'steps' in grid:
+            self.convergence = {'steps': grid['steps'], 'error': grid['error']}
+
+        px = grid['px']
+        matrix = px - self.px if direction == "Long" else self.px - px
+        self.direction = direction
+
+        return matrix
+
+    def get_grids(self, direction="Long") -> dict[str, np.ndarray]:
+        """
+        Returns the PnL grid and the delta, gamma, vega, theta, vanna and charm grids over the same
+        IV x spot levels, signed by direction. Black-Scholes grids come from one batch that shares
+        d1/d2 with the PnL; American engines supply delta, gamma, vega and theta from their batch.
+        The grids are memoized in grids_cache on cache_key() plus the premium, direction and metric set.
+        """
+        key = self.cache_key() + (float(self.px), direction, tuple(GREEK_GRIDS))
+        grids = grids_cache.get_or_compute(key, lambda: self._grids(direction))
+        self.direction = direction
+
+        return dict(grids)
+
+    # Internal helper method, computes the grids on a grids_cache miss - not intended for external use
+    def _grids(self, direction) -> dict[str, np.ndarray]:
+        spot_list = self.offset_spot_arr()[np.newaxis, :]
+        iv_list = self.offset_iv_arr()[:, np.newaxis]
+        grids = BlackScholes.batch(self.k, spot_list, self.r, self.t, iv_list, self.b, self.option_type)
+
+        sign = 1 if direction == "Long" else -1
+        if self.engine == 'BlackScholes':
+            pnl = sign * (grids['px'] - self.px)
+        else:
+            pnl = self.get_matrix(direction)
+            if self.style == 'American':
+                engine_kwargs = {'style': self.style, 'n': self.steps} if self.engine == 'Binomial' else {}
+                grids.update(ENGINES[self.engine].batch(self.k, spot_list, self.r, self.t, iv_list, self.b, 
+                                                        self.option_type, greeks=True, **engine_kwargs))
+
+        return {'PnL': pnl, **{greek: sign * grids[greek] for greek in GREEK_GRIDS}}
+
+
+# --- Multi-Leg Strategy Class ---
+Leg = namedtuple('Leg', ['option_type', 'k', 'qty', 'iv', 'px', 't', 'label'], defaults=[None, None])
+
+
+class Strategy:
+    """
+    PnL grid of any list of legs, Leg(option_type, k, qty, iv, px, t=None, label=None), where qty is
+    signed (positive long, negative short), px is the premium paid or received per contract, and t
+    defaults to the strategy's expiry. Every leg, spot level and IV level is priced in one broadcast
+    of shape (leg, IV level, spot level); each leg's IVs are offset by iv_step around its own IV.
+    """
+    def __init__(self, legs: list, spot, r, t, b, style: str='European', spot_step: float=0.05, 
+                 iv_step: float=0.05, grid_size: int=9, engine: str=None, steps: int=300, tol: float=None):
+        legs = [leg if isinstance(leg, Leg) else Leg(*leg) for leg in legs]
+        assert legs, "Strategy requires at least one leg..."
+        assert all(x >= 0 for x in [spot, r, t, b, spot_step, iv_step]), "Input parameters for Strategy must be greater than or equal to zero..."
+        assert all(x >= 0 for leg in legs for x in [leg.k, leg.iv, leg.px]), "Leg strikes, IVs and premiums must be greater than or equal to zero..."
+
+        if not isinstance(grid_size, int) or grid_size < 1 or grid_size % 2 == 0:
+            raise ValueError("Grid size must be a positive odd integer...")
+
+        style = style.capitalize()
+        if style not in ['American', 'European']:
+            raise ValueError("Contract type must be 'American' or 'European'...")
+
+        if engine is None:
+            engine = 'BlackScholes' if style == 'European' else 'Binomial'
+        if engine not in {'European': ['BlackScholes', 'Binomial'], 'American': ['Binomial', 'BaroneAdesiWhaley']}[style]:
+            raise ValueError("Engine must be 'BlackScholes' or 'Binomial' for European, or 'Binomial' or 'BaroneAdesiWhaley' for American...")
+
+        self.legs = legs
+        self.spot = spot # Spot price of the asset
+        self.r = r # Risk free rate (annual in decimal, ie 4.5% --> 0.045)
+        self.t = t # Default time to expiry of the legs (years in decimal)
+        self.b = b # Dividend yield (decimal, ie 3.5% --> 0.035)
+        self.style = style
+        self.spot_step = spot_step # Used to adjust the dashboard output
+        self.iv_step = iv_step # Used to adjust the dashboard output
+        self.grid_size = grid_size # Number of spot and IV levels, centered on the base values
+        self.engine = engine # Pricing engine used for the PnL grid
+        self.steps = steps # Binomial steps, used when no tolerance is given
+        self.tol = tol # Binomial price tolerance; when set, the step count adapts per cell
+        self.convergence = None # Binomial steps and error estimates used by the last adaptive grid
+
+        # Leg attributes as (leg, 1, 1) columns that broadcast against the (IV level, spot level) grid
+        column = lambda values: np.asarray(values, dtype=float).reshape(-1, 1, 1)
+        self._k = column([leg.k for leg in legs])
+        self._qty = column([leg.qty for leg in legs])
+        self._iv = column([leg.iv for leg in legs])
+        self._px = column([leg.px for leg in legs])
+        self._t = column([self.t if leg.t is None else leg.t for leg in legs])
+        self._call = _call_mask([leg.option_type for leg in legs]).reshape(-1, 1, 1)
+
+    def _offsets(self) -> np.ndarray:
+        half = self.grid_size // 2
+        return np.arange(-half, half + 1)
+
+    def offset_spot_arr(self) -> np.ndarray:
+        return np.maximum(self.spot + (self.spot_step * self.spot) * self._offsets(), GRID_LEVEL_FLOOR * self.spot)
+
+    def offset_iv_arr(self) -> np.ndarray:
+        """IV levels of every leg, shaped (leg, IV level)"""
+        return np.maximum(self._iv + (self.iv_step * self._iv) * self._offsets()[:, np.newaxis], GRID_LEVEL_FLOOR * self._iv)[:, :, 0]
+
+    def format_iv_list(self) -> list:
+        return [" / ".join(f"{round(x*100,1)}%" for x in level) for level in self.offset_iv_arr().T]
+
+    def iv_label(self) -> str:
+        """Leg labels in the order of format_iv_list, ie 'low / atm / high'"""
+        return " / ".join(leg.label or f"{leg.option_type.lower()} {leg.k:g}" for leg in self.legs)
+
+    def leg_matrices(self) -> np.ndarray:
+        """Per-contract PnL of every leg (before quantities), shaped (leg, IV level, spot level)"""
+        spot = self.offset_spot_arr()[np.newaxis, np.newaxis, :]
+        iv = self.offset_iv_arr()[:, :, np.newaxis]
+
+        if self.engine == 'Binomial' and self.tol is not None:
+            result = Binomial.adaptive(self._k, spot, self.r, self._t, iv, self.b, self._call, tol=self.tol, style=self.style)
+            self.convergence = {'steps': result['steps'], 'error': result['error']}
+            px = result['px']
+        else:
+            engine_kwargs = {'style': self.style, 'n': self.steps} if self.engine == 'Binomial' else {}
+            px = ENGINES[self.engine].batch(self._k, spot, self.r, self._t, iv, self.b, self._call, **engine_kwargs)['px']
+
+        return px - self._px
+
+    def get_matrix(self) -> np.ndarray:
+        """Strategy PnL with rows as IV levels and columns as spot levels"""
+        return np.sum(self.leg_matrices() * self._qty, axis=0)
+
+    def get_grids(self) -> dict[str, np.ndarray]:
+        """
+        PnL, delta, gamma, vega, theta, vanna and charm grids of the strategy, computed and memoized
+        in grids_cache like Matrix.get_grids (the legs' signed quantities carry the direction)
+        """
+        key = self.cache_key() + ('Strategy', tuple(GREEK_GRIDS))
+        return dict(grids_cache.get_or_compute(key, self._grids))
+
+    # Internal helper method, computes the grids on a grids_cache miss - not intended for external use
+    def _grids(self) -> dict[str, np.ndarray]:
+        spot = self.offset_spot_arr()[np.newaxis, np.newaxis, :]
+        iv = self.offset_iv_arr()[:, :, np.newaxis]
+        grids = BlackScholes.batch(self._k, spot, self.r, self._t, iv, self.b, self._call)
+
+        if self.engine == 'BlackScholes':
+            leg_pnl = grids['px'] - self._px
+        else:
+            leg_pnl = self.leg_matrices()
+            if self.style == 'American':
+                engine_kwargs = {'style': self.style, 'n': self.steps} if self.engine == 'Binomial' else {}
+                grids.update(ENGINES[self.engine].batch(self._k, spot, self.r, self._t, iv, self.b, self._call, 
+                                                        greeks=True, **engine_kwargs))
+
+        grids['PnL'] = leg_pnl
+        return {name: np.sum(grids[name] * self._qty, axis=0) for name in ['PnL'] + GREEK_GRIDS}
+
+    def greeks(self) -> dict[str, float]:
+        """
+        Quantity-weighted Greeks of the strategy at the base spot and IVs. American strategies take
+        delta, gamma, vega, theta and rho from the selected engine and the rest from Black-Scholes.
+        """
+        k, qty, iv, t, call = [x.ravel() for x in [self._k, self._qty, self._iv, self._t, self._call]]
+        leg_greeks = BlackScholes.batch(k, self.spot, self.r, t, iv, self.b, call)
+        if self.style == 'American':
+            engine_kwargs = {'style': self.style, 'n': self.steps} if self.engine == 'Binomial' else {}
+            leg_greeks.update(ENGINES[self.engine].batch(k, self.spot, self.r, t, iv, self.b, call, greeks=True, **engine_kwargs))
+
+        return {greek: float(np.sum(leg_greeks[greek] * qty)) 
+                for greek in ['delta', 'gamma', 'vega', 'volga', 'theta', 'rho', 'vanna', 'charm']}
+
+    def cache_key(self) -> tuple:
+        """Every input that changes the strategy's PnL grids, like Matrix.cache_key plus each leg"""
+        steps = ('tol', self.tol) if self.engine == 'Binomial' and self.tol is not None else ('steps', self.steps)
+        legs = tuple((leg.option_type.capitalize(), float(leg.k), float(leg.qty), float(leg.iv), float(leg.px), 
+                      None if leg.t is None else float(leg.t)) for leg in self.legs)
+        return (legs, float(self.spot), float(self.r), float(self.t), float(self.b), self.style, self.engine) + steps + \
+               (self.spot_step, self.iv_step, self.grid_size)
+
+    def scenario_cube(self, days=None, rates=None) -> 'ScenarioCube':
+        """
+        Prices the strategy over (IV level, spot level, days forward, rate) once; see ScenarioCube.
+        Cubes are memoized in cube_cache, so asking again for earlier inputs returns the priced cube.
+        """
+        axes = (None if days is None else tuple(np.atleast_1d(days).tolist()), 
+                None if rates is None else tuple(np.atleast_1d(rates).astype(float).tolist()))
+        return cube_cache.get_or_compute(self.cache_key() + axes, lambda: ScenarioCube(self, days, rates))
+
+
+# --- Scenario Cube Class ---
+class ScenarioCube:
+    """
+    Strategy PnL over every (IV level, spot level, days forward, rate) scenario, priced in one
+    engine batch and kept in memory so any 2-D slice or days-forward frame is an index lookup.
+    Days forward shorten every leg's time to expiry (legs past expiry are worth their intrinsic
+    value). Binomial engines use the strategy's tolerance (adaptive steps) when it is set.
+    """
+    axes = ['iv', 'spot', 'day', 'rate']
+
+    def __init__(self, strategy: Strategy, days=None, rates=None):
+        self.strategy = strategy
+        self.days = np.atleast_1d(np.asarray([0] if days is None else days, dtype=int)) # Days forward from today
+        self.rates = np.atleast_1d(np.asarray([strategy.r] if rates is None else rates, dtype=float))
+        assert np.all(self.days >= 0) and np.all(self.rates >= 0), "Days forward and rates must be greater than or equal to zero..."
+        self.spots = strategy.offset_spot_arr()
+        self.ivs = strategy.offset_iv_arr() # (leg, IV level)
+
+        # Legs on axis 0, then (IV level, spot level, day, rate)
+        expand = lambda x: x[..., np.newaxis, np.newaxis]
+        spot = self.spots[np.newaxis, np.newaxis, :, np.newaxis, np.newaxis]
+        iv = self.ivs[:, :, np.newaxis, np.newaxis, np.newaxis]
+        t = np.maximum(expand(strategy._t) - self.days[:, np.newaxis] / 365, MIN_TIME) # Expired legs price at (about) intrinsic value
+        r = self.rates[np.newaxis, np.newaxis, np.newaxis, np.newaxis, :]
+
+        inputs = [expand(strategy._k), spot, r, t, iv, strategy.b, expand(strategy._call)]
+        if strategy.engine == 'Binomial' and strategy.tol is not None:
+            px = Binomial.adaptive(*inputs, tol=strategy.tol, style=strategy.style)['px']
+        else:
+            engine_kwargs = {'style': strategy.style, 'n': strategy.steps} if strategy.engine == 'Binomial' else {}
+            px = ENGINES[strategy.engine].batch(*inputs, **engine_kwargs)['px']
+        self.pnl = np.sum((px - expand(strategy._px)) * expand(strategy._qty), axis=0)
+        self.pnl.setflags(write=False) # Cubes are shared through cube_cache
+
+    def _index(self, axis: str, value) -> int:
+        if axis == 'day':
+            return int(np.abs(self.days - value).argmin())
+        if axis == 'rate':
+            return int(np.abs(self.rates - value).argmin())
+        half = self.strategy.grid_size // 2 # IV and spot levels are offsets from the base level
+        if int(value) != value or not -half <= value <= half:
+            raise ValueError(f"{axis} must be an integer level offset between {-half} and {half}...")
+        return half + int(value)
+
+    def slice(self, rows: str = 'iv', cols: str = 'spot', **at) -> np.ndarray:
+        """
+        Returns the PnL over two axes ('iv', 'spot', 'day', 'rate'), with the others fixed by at:
+        day and rate take the nearest value in the cube, iv and spot a level offset from the base
+        (ie spot=2 is two spot steps up). Unfixed axes sit at the base level, today, and the strategy rate.
+        """
+        if rows not in self.axes or cols not in self.axes or rows == cols:
+            raise ValueError(f"rows and cols must be two different axes of {self.axes}...")
+        fixed = {'iv': 0, 'spot': 0, 'day': 0, 'rate': self.strategy.r}
+        fixed.update(at)
+
+        index = tuple(slice(None) if axis in [rows, cols] else self._index(axis, fixed[axis]) for axis in self.axes)
+        matrix = self.pnl[index]
+        return matrix if self.axes.index(rows) < self.axes.index(cols) else matrix.T
+
+    def frame(self, day: int, rate: float = None) -> np.ndarray:
+        """IV x spot PnL grid (the Matrix layout) at the nearest stored days forward"""
+        return self.slice('iv', 'spot', day=day, rate=self.strategy.r if rate is None else rate)
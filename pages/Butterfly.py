@@ -283,6 +283,15 @@ if "butterfly_style" not in st.session_state:
 style = st.sidebar.selectbox("Style:", ["European", "American"], index=["European", "American"].index(st.session_state.butterfly_style))
 st.session_state.butterfly_style = style
 
+# American Pricing Engine
+if "butterfly_engine" not in st.session_state:
+    st.session_state.butterfly_engine = 'Binomial'
+engine_labels = {"Binomial": "Binomial (CRR)", "BaroneAdesiWhaley": "Barone-Adesi-Whaley"}
+engine = st.sidebar.selectbox("American Engine:", list(engine_labels), format_func=engine_labels.get, 
+                              index=list(engine_labels).index(st.session_state.butterfly_engine), disabled=style != 'American')
+st.session_state.butterfly_engine = engine
+engine = engine if style == 'American' else None
+
 # Spot Step Slider
 spot_step_raw_value = st.sidebar.slider('Spot Step Slider:',
                              min_value=1,
@@ -303,6 +312,20 @@ iv_step_raw_value = st.sidebar.slider('IV Step Slider:',
 iv_step = iv_step_raw_value / 100
 st.session_state.iv_step = iv_step
 
+# Heatmap Metric
+heatmap_metrics = ['PnL', 'Delta', 'Gamma', 'Vega', 'Theta', 'Vanna', 'Charm']
+if "butterfly_heatmap" not in st.session_state:
+    st.session_state.butterfly_heatmap = 'PnL'
+heatmap_metric = st.sidebar.selectbox("Heatmap:", heatmap_metrics, index=heatmap_metrics.index(st.session_state.butterfly_heatmap))
+st.session_state.butterfly_heatmap = heatmap_metric
+
+# Heatmap Renderer
+heatmap_renderers = ['Interactive', 'Image']
+if "butterfly_renderer" not in st.session_state:
+    st.session_state.butterfly_renderer = 'Interactive'
+renderer = st.sidebar.selectbox("Heatmap Renderer:", heatmap_renderers, index=heatmap_renderers.index(st.session_state.butterfly_renderer))
+st.session_state.butterfly_renderer = renderer
+
 
 # --- Streamlit App Output & Validation --- 
 validation_errors = []
@@ -376,50 +399,29 @@ if validation_errors:
         st.error(error)
     st.warning("Please correct the inputs to view the dashboard...")
 else:
-    # Greek Calculation
-    try:
-        low_bs = BlackScholes(k=low_strike, s=spot, r=rate, t=time, iv=low_iv, b=dividend_yield)
-        atm_bs = BlackScholes(k=atm_strike, s=spot, r=rate, t=time, iv=atm_iv, b=dividend_yield)
-
-        if sub_strategy in ["Iron Butterfly", "Reverse Iron Butterfly"]:
-            atm_2_bs = BlackScholes(k=atm_strike_2, s=spot, r=rate, t=time, iv=atm_iv_2, b=dividend_yield)
-            high_bs = BlackScholes(k=high_strike, s=spot, r=rate, t=time, iv=high_iv, b=dividend_yield)
-        elif sub_strategy in ["Long Call Butterfly", "Short Call Butterfly", "Long Put Butterfly", "Short Put Butterfly"]:
-            high_bs = BlackScholes(k=high_strike, s=spot, r=rate, t=time, iv=high_iv, b=dividend_yield)
-            atm_2_bs = None
-        else:
-            atm_2_bs = None
-            high_bs = None
+    # Strategy Legs
+    if sub_strategy in ["Long Call Butterfly", "Short Call Butterfly",
+                        "Long Put Butterfly", "Short Put Butterfly"]:
+        sign = 1 if "Long" in sub_strategy else -1
+        legs = [Leg(option_type, low_strike, sign, low_iv, low_px, label='low'), 
+                Leg(option_type, atm_strike, -2 * sign, atm_iv, atm_px, label='atm'), 
+                Leg(option_type, high_strike, sign, high_iv, high_px, label='high')]
+    else:
+        sign = -1 if "Reverse" in sub_strategy else 1
+        legs = [Leg('Put', low_strike, sign, low_iv, low_px, label='low'), 
+                Leg('Put', atm_strike, -sign, atm_iv, atm_px, label='atm (p)'), 
+                Leg('Call', atm_strike_2, -sign, atm_iv_2, atm_px_2, label='atm (c)'), 
+                Leg('Call', high_strike, sign, high_iv, high_px, label='high')]
 
+    try:
+        butterfly = Strategy(legs, spot=spot, r=rate, t=time, b=dividend_yield, style=style, 
+                             spot_step=spot_step, iv_step=iv_step, engine=engine, tol=Binomial.DEFAULT_TOL)
+        greeks = butterfly.greeks()
     except:
         st.error(f"Error calculating Black Scholes values...")
         st.stop() 
 
-
-    delta, gamma, vega, theta, rho, vanna, charm, volga = [0.0] * 8
-
-    if sub_strategy in ["Long Call Butterfly", "Short Call Butterfly",
-                        "Long Put Butterfly", "Short Put Butterfly"]:
-        sign = 1 if "Long" in sub_strategy else -1
-        delta = sign * (low_bs.delta(option_type=option_type) - atm_bs.delta(option_type=option_type)*2 + high_bs.delta(option_type=option_type))
-        gamma = sign * (low_bs.gamma() - atm_bs.gamma()*2 + high_bs.gamma())
-        vega = sign * (low_bs.vega() - atm_bs.vega()*2 + high_bs.vega())
-        theta = sign * (low_bs.theta(option_type=option_type) - atm_bs.theta(option_type=option_type)*2 + high_bs.theta(option_type=option_type))
-        rho = sign * (low_bs.rho(option_type=option_type) - atm_bs.rho(option_type=option_type)*2 + high_bs.rho(option_type=option_type))
-        vanna = sign * (low_bs.vanna() - atm_bs.vanna()*2 + high_bs.vanna())
-        charm = sign * (low_bs.charm(option_type=option_type) - atm_bs.charm(option_type=option_type)*2 + high_bs.charm(option_type=option_type))
-        volga = sign * (low_bs.volga() - atm_bs.volga()*2 + high_bs.volga())
-
-    elif sub_strategy in ["Iron Butterfly", "Reverse Iron Butterfly"]:
-        sign = -1 if "Reverse" in sub_strategy else 1
-        delta = sign * (low_bs.delta(option_type='Put') - atm_bs.delta(option_type='Put') - atm_2_bs.delta(option_type='Call') + high_bs.delta(option_type='Call'))
-        gamma = sign * (low_bs.gamma() - atm_bs.gamma() - atm_2_bs.gamma() + high_bs.gamma())
-        vega = sign * (low_bs.vega() - atm_bs.vega() - atm_2_bs.vega() + high_bs.vega())
-        theta = sign * (low_bs.theta(option_type='Put') - atm_bs.theta(option_type='Put') - atm_2_bs.theta(option_type='Call') + high_bs.theta(option_type='Call'))
-        rho = sign * (low_bs.rho(option_type='Put') - atm_bs.rho(option_type='Put') - atm_2_bs.rho(option_type='Call') + high_bs.rho(option_type='Call'))
-        vanna = sign * (low_bs.vanna() - atm_bs.vanna() - atm_2_bs.vanna() + high_bs.vanna())
-        charm = sign * (low_bs.charm(option_type='Put') - atm_bs.charm(option_type='Put') - atm_2_bs.charm(option_type='Call') + high_bs.charm(option_type='Call'))
-        volga = sign * (low_bs.volga() - atm_bs.volga() - atm_2_bs.volga() + high_bs.volga())
+    delta, gamma, vega, theta, rho, vanna, charm, volga = [greeks[g] for g in ['delta', 'gamma', 'vega', 'theta', 'rho', 'vanna', 'charm', 'volga']]
 
     col1, col2 = st.columns([1,4])
     # Greeks Output
@@ -462,96 +464,17 @@ else:
         st.caption("Greeks represent the size and direction for the initial strategy.")
 
     # Graph Generation
-    matrix_list = None
-    instance_list = None
     try:
-        if sub_strategy == "Long Call Butterfly":
-            low = Matrix(spot, low_px, low_iv, low_strike, rate, time, 
-                         dividend_yield, 'Call', style, spot_step, iv_step)
-            atm = Matrix(spot, atm_px, atm_iv, atm_strike, rate, time, 
-                         dividend_yield, 'Call', style, spot_step, iv_step)
-            high = Matrix(spot, high_px, high_iv, high_strike, rate, time,
-                          dividend_yield, 'Call', style, spot_step, iv_step)
-            try:
-                matrix_list = process_butterfly(low, atm, high, 'Long', 'Short', 'Long')
-            except:
-                matrix_list = [low.get_matrix(direction='Long'), atm.get_matrix(direction='Short')*2, high.get_matrix(direction='Long')]
-            instance_list = [low, atm, high]
-        elif sub_strategy == "Short Call Butterfly":
-            low = Matrix(spot, low_px, low_iv, low_strike, rate, time, 
-                         dividend_yield, 'Call', style, spot_step, iv_step)
-            atm = Matrix(spot, atm_px, atm_iv, atm_strike, rate, time, 
-                         dividend_yield, 'Call', style, spot_step, iv_step)
-            high = Matrix(spot, high_px, high_iv, high_strike, rate, time, 
-                          dividend_yield, 'Call', style, spot_step, iv_step)
-            try:
-                matrix_list = process_butterfly(low, atm, high, 'Short', 'Long', 'Short')
-            except:
-                matrix_list = [low.get_matrix('Short'), atm.get_matrix('Long')*2, high.get_matrix('Short')]
-            instance_list = [low, atm, high]
-        elif sub_strategy == "Long Put Butterfly":
-            low = Matrix(spot, low_px, low_iv, low_strike, rate, time, 
-                         dividend_yield, 'Put', style, spot_step, iv_step)
-            atm = Matrix(spot, atm_px, atm_iv, atm_strike, rate, time, 
-                         dividend_yield, 'Put', style, spot_step, iv_step)
-            high = Matrix(spot, high_px, high_iv, high_strike, rate, time, 
-                          dividend_yield, 'Put', style, spot_step, iv_step)
-            try:
-                matrix_list = process_butterfly(low, atm, high, 'Long', 'Short', 'Long')
-            except:
-                matrix_list = [low.get_matrix('Long'), atm.get_matrix('Short')*2, high.get_matrix('Long')]
-            instance_list = [low, atm, high]
-        elif sub_strategy == "Short Put Butterfly":
-            low = Matrix(spot, low_px, low_iv, low_strike, rate, time, 
-                         dividend_yield, 'Put', style, spot_step, iv_step)
-            atm = Matrix(spot, atm_px, atm_iv, atm_strike, rate, time, 
-                         dividend_yield, 'Put', style, spot_step, iv_step)
-            high = Matrix(spot, high_px, high_iv, high_strike, rate, time, 
-                          dividend_yield, 'Put', style, spot_step, iv_step)
-            try:
-                matrix_list = process_butterfly(low, atm, high, 'Short', 'Long', 'Short')
-            except:
-                matrix_list = [low.get_matrix('Short'), atm.get_matrix('Long')*2, high.get_matrix('Short')]
-            instance_list = [low, atm, high]
-        elif sub_strategy == "Iron Butterfly":
-            low = Matrix(spot, low_px, low_iv, low_strike, rate, time, 
-                         dividend_yield, 'Put', style, spot_step, iv_step)
-            atm = Matrix(spot, atm_px, atm_iv, atm_strike, rate, time, 
-                         dividend_yield, 'Put', style, spot_step, iv_step)
-            atm_2 = Matrix(spot, atm_px_2, atm_iv_2, atm_strike_2, rate, time, 
-                           dividend_yield, 'Call', style, spot_step, iv_step)
-            high = Matrix(spot, high_px, high_iv, high_strike, rate, time, 
-                          dividend_yield, 'Call', style, spot_step, iv_step)
-            try:
-                matrix_list = process_iron_butterfly(low, atm, atm_2, high, 'Long', 'Short', 'Long')
-            except:
-                matrix_list = [low.get_matrix('Long'), atm.get_matrix('Short'), atm_2.get_matrix('Short'), high.get_matrix('Long')]
-            instance_list = [low, atm, atm_2, high]
-        elif sub_strategy == "Reverse Iron Butterfly":
-            low = Matrix(spot, low_px, low_iv, low_strike, rate, time, 
-                         dividend_yield, 'Put', style, spot_step, iv_step)
-            atm = Matrix(spot, atm_px, atm_iv, atm_strike, rate, time, 
-                         dividend_yield, 'Put', style, spot_step, iv_step)
-            atm_2 = Matrix(spot, atm_px_2, atm_iv_2, atm_strike_2, rate, time, 
-                           dividend_yield, 'Call', style, spot_step, iv_step)
-            high = Matrix(spot, high_px, high_iv, high_strike, rate, time, 
-                          dividend_yield, 'Call', style, spot_step, iv_step)
-            try:
-                matrix_list = process_iron_butterfly(low, atm, atm_2, high, 'Short', 'Long', 'Short')
-            except:
-                matrix_list = [low.get_matrix('Short'), atm.get_matrix('Long'), atm_2.get_matrix('Long'), high.get_matrix('Short')]
-            instance_list = [low, atm, atm_2, high]
+        grids = butterfly.get_grids()
+        matrix = grids[heatmap_metric if heatmap_metric == 'PnL' else heatmap_metric.lower()]
     except:
         st.error(f"Error generating graph...")
         st.stop()
 
     # Graph Output
     with col2:
-            if matrix_list is None:
-                raise ValueError("No matrix list generated...")
-            elif instance_list is None:
-                raise ValueError("No instance list generated...")
-            else:
-                plot_instance = Plotting(matrix_list, instance_list, sub_strategy, ticker)
-                fig = plot_instance.plot()
-                st.pyplot(fig, clear_figure=True)
\ No newline at end of file
+        plot_instance = Plotting(matrix, butterfly, sub_strategy, ticker)
+        if renderer == 'Interactive':
+            st.plotly_chart(plot_instance.plot_interactive(metric=heatmap_metric), use_container_width=True)
+        else:
+            st.image(plot_instance.plot_image(metric=heatmap_metric))
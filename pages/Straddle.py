@@ -3,7 +3,6 @@ from helpers import *
 import streamlit as st
 from datetime import datetime
 from datetime import timedelta
-from concurrent.futures import ThreadPoolExecutor
 
 # --- Streamlit App Input & Layout --- 
 # Title
@@ -191,6 +190,15 @@ if "straddle_style" not in st.session_state:
 style = st.sidebar.selectbox("Style:", ["European", "American"], index=["European", "American"].index(st.session_state.straddle_style))
 st.session_state.straddle_style = style
 
+# American Pricing Engine
+if "straddle_engine" not in st.session_state:
+    st.session_state.straddle_engine = 'Binomial'
+engine_labels = {"Binomial": "Binomial (CRR)", "BaroneAdesiWhaley": "Barone-Adesi-Whaley"}
+engine = st.sidebar.selectbox("American Engine:", list(engine_labels), format_func=engine_labels.get, 
+                              index=list(engine_labels).index(st.session_state.straddle_engine), disabled=style != 'American')
+st.session_state.straddle_engine = engine
+engine = engine if style == 'American' else None
+
 # Spot Step Slider
 if "spot_step" not in st.session_state:
     st.session_state.spot_step = 0.10
@@ -215,6 +223,19 @@ iv_step_raw_value = st.sidebar.slider('IV Step Slider:',
 iv_step = iv_step_raw_value / 100
 st.session_state.iv_step = iv_step
 
+# Heatmap Metric
+heatmap_metrics = ['PnL', 'Delta', 'Gamma', 'Vega', 'Theta', 'Vanna', 'Charm']
+if "straddle_heatmap" not in st.session_state:
+    st.session_state.straddle_heatmap = 'PnL'
+heatmap_metric = st.sidebar.selectbox("Heatmap:", heatmap_metrics, index=heatmap_metrics.index(st.session_state.straddle_heatmap))
+st.session_state.straddle_heatmap = heatmap_metric
+
+# Heatmap Renderer
+heatmap_renderers = ['Interactive', 'Image']
+if "straddle_renderer" not in st.session_state:
+    st.session_state.straddle_renderer = 'Interactive'
+renderer = st.sidebar.selectbox("Heatmap Renderer:", heatmap_renderers, index=heatmap_renderers.index(st.session_state.straddle_renderer))
+st.session_state.straddle_renderer = renderer
 
 # --- Streamlit App Output --- 
 if all(v is not None for v in [spot, call_px, put_px, call_iv, put_iv, strike, rate, 
@@ -222,17 +243,16 @@ if all(v is not None for v in [spot, call_px, put_px, call_iv, put_iv, strike, r
                                ticker, direction, spot_step, iv_step]):
     if all(v >= 0 for v in [spot, call_px, put_px, call_iv, put_iv, strike, rate, 
                             time, dividend_yield, call_quantity, put_quantity]):
+        # Strategy Legs
+        sign = 1 if direction == 'Long' else -1
+        straddle = Strategy(legs=[Leg('Call', strike, sign * call_quantity, call_iv, call_px, label='call'), 
+                                  Leg('Put', strike, sign * put_quantity, put_iv, put_px, label='put')], 
+                            spot=spot, r=rate, t=time, b=dividend_yield, style=style, 
+                            spot_step=spot_step, iv_step=iv_step, engine=engine, tol=Binomial.DEFAULT_TOL)
+
         # Greek Calculation
-        call_blackScholes = BlackScholes(k=strike, s=spot,r=rate, t=time, iv=call_iv, b=dividend_yield)
-        put_blackScholes = BlackScholes(k=strike, s=spot,r=rate, t=time, iv=put_iv, b=dividend_yield)
-        delta = call_blackScholes.delta(option_type='CALL')*call_quantity + put_blackScholes.delta(option_type='PUT')*put_quantity
-        gamma = call_blackScholes.gamma()*call_quantity + put_blackScholes.gamma()*put_quantity
-        vega = call_blackScholes.vega()*call_quantity + put_blackScholes.vega()*put_quantity
-        theta = call_blackScholes.theta(option_type='CALL')*call_quantity + put_blackScholes.theta(option_type='PUT')*put_quantity
-        rho = call_blackScholes.rho(option_type='CALL')*call_quantity + put_blackScholes.rho(option_type='PUT')*put_quantity
-        vanna = call_blackScholes.vanna()*call_quantity + put_blackScholes.vanna()*put_quantity
-        charm = call_blackScholes.charm(option_type='CALL')*call_quantity + put_blackScholes.charm(option_type='PUT')*put_quantity
-        volga = call_blackScholes.volga()*call_quantity + put_blackScholes.volga()*put_quantity
+        greeks = straddle.greeks()
+        delta, gamma, vega, theta, rho, vanna, charm, volga = [greeks[g] for g in ['delta', 'gamma', 'vega', 'theta', 'rho', 'vanna', 'charm', 'volga']]
 
         col1, col2 = st.columns([1,4])
         # Greeks Output
@@ -276,29 +296,14 @@ if all(v is not None for v in [spot, call_px, put_px, call_iv, put_iv, strike, r
 
         # Graph Output
         with col2:
-            call_matrix_instance = Matrix(spot=spot, px=call_px, iv=call_iv, k=strike, r=rate, t=time, 
-                                          b=dividend_yield, option_type='Call', style=style, 
-                                          spot_step=spot_step, iv_step=iv_step)
-            put_matrix_instance = Matrix(spot=spot, px=put_px, iv=put_iv, k=strike, r=rate, t=time, 
-                                         b=dividend_yield, option_type='Put', style=style, 
-                                         spot_step=spot_step, iv_step=iv_step)
-        
-            try:
-               with ThreadPoolExecutor(max_workers=2) as executor:
-                    call_future = executor.submit(call_matrix_instance.get_matrix, direction=direction)
-                    put_future = executor.submit(put_matrix_instance.get_matrix, direction=direction)
-                    call_matrix = call_future.result() * call_quantity
-                    put_matrix = put_future.result() * put_quantity
-            except:
-                call_matrix = call_matrix_instance.get_matrix(direction=direction) * call_quantity
-                put_matrix = put_matrix_instance.get_matrix(direction=direction) * put_quantity
-
-            plot_instance = Plotting(matrix=[call_matrix, put_matrix], 
-                                    instance=[call_matrix_instance, put_matrix_instance], 
-                                    strategy='Straddle', ticker=ticker)
-
-            fig = plot_instance.plot(direction=direction)
-            st.pyplot(fig, clear_figure=True)
+            grids = straddle.get_grids()
+            plot_instance = Plotting(matrix=grids[heatmap_metric if heatmap_metric == 'PnL' else heatmap_metric.lower()], 
+                                     instance=straddle, strategy='Straddle', ticker=ticker)
+
+            if renderer == 'Interactive':
+                st.plotly_chart(plot_instance.plot_interactive(direction=direction, metric=heatmap_metric), use_container_width=True)
+            else:
+                st.image(plot_instance.plot_image(direction=direction, metric=heatmap_metric))
     else:
         st.warning("Inputs must be greater than or equal to zero...")
 else:
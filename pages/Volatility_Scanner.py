@@ -0,0 +1,69 @@
+import pandas as pd
+import streamlit as st
+from helpers import scan_volatility, ChainCache
+
+# --- Streamlit App Input & Layout ---
+# Title
+st.set_page_config(page_title="Options Strategy App", layout="wide")
+st.title("Volatility Scanner")
+st.markdown("<hr style='border: 1px solid white;'>", unsafe_allow_html=True)
+
+# Sidebar
+st.sidebar.header("Scanner Inputs")
+
+# Watchlist Input
+if "scanner_watchlist" not in st.session_state:
+    st.session_state.scanner_watchlist = "SPY, QQQ, IWM, AAPL, MSFT, NVDA, AMZN, TSLA"
+watchlist = st.sidebar.text_area("Watchlist (comma or newline separated):", value=st.session_state.scanner_watchlist)
+st.session_state.scanner_watchlist = watchlist
+tickers = [ticker.strip().upper() for ticker in watchlist.replace('\n', ',').split(',') if ticker.strip()]
+
+# Sort Selection
+sort_columns = {"ATM IV": 'atm_iv', "Term Slope": 'term_slope', "Skew": 'skew'}
+if "scanner_sort" not in st.session_state:
+    st.session_state.scanner_sort = "ATM IV"
+sort_by = st.sidebar.selectbox("Rank By:", list(sort_columns), index=list(sort_columns).index(st.session_state.scanner_sort))
+st.session_state.scanner_sort = sort_by
+
+# Sidebar header
+st.sidebar.header('Dashboard Settings')
+
+# Concurrent Tickers
+if "scanner_workers" not in st.session_state:
+    st.session_state.scanner_workers = 8
+max_workers = st.sidebar.number_input("Tickers in Flight:", min_value=1, max_value=32, value=st.session_state.scanner_workers)
+st.session_state.scanner_workers = max_workers
+
+# Request Rate
+if "scanner_rate" not in st.session_state:
+    st.session_state.scanner_rate = 10.0
+rate_limit = st.sidebar.number_input("Requests per Second:", min_value=0.5, max_value=100.0, value=st.session_state.scanner_rate)
+st.session_state.scanner_rate = rate_limit
+
+# --- Streamlit App Ouput ---
+scan_columns = ['ticker', 'spot', 'atm_iv', 'long_iv', 'term_slope', 'skew', 'expirations', 'error']
+
+def format_scan(rows):
+    # Error rows only carry ticker and error, so every column is present before sorting
+    scan_df = pd.DataFrame(rows).reindex(columns=scan_columns).set_index('ticker')
+    ranked = scan_df.sort_values(sort_columns[sort_by], ascending=False, na_position='last')
+    for column in ['atm_iv', 'long_iv', 'term_slope', 'skew']:
+        ranked[column] = ranked[column] * 100 # IV points
+    return ranked
+
+if not tickers:
+    st.warning("Enter at least one ticker to scan...")
+elif st.sidebar.button("Run Scan"):
+    progress = st.progress(0.0)
+    table = st.empty()
+    rows = []
+    for row in scan_volatility(tickers, cache=ChainCache(), max_workers=int(max_workers), rate_limit=float(rate_limit)):
+        rows.append(row)
+        progress.progress(len(rows) / len(tickers), text=f"Scanned {len(rows)} of {len(tickers)} tickers")
+        table.dataframe(format_scan(rows), use_container_width=True)
+    st.session_state.scanner_results = rows
+    st.caption("IV columns are in volatility points; term slope is IV(90D) - IV(30D) and skew is IV(90% put) - IV(110% call) near 30D")
+elif st.session_state.get("scanner_results"):
+    st.dataframe(format_scan(st.session_state.scanner_results), use_container_width=True)
+else:
+    st.info("Press \"Run Scan\" to rank the watchlist...")
@@ -1,9 +1,8 @@
 import numpy as np
 import pandas as pd
 import streamlit as st
-from helpers import Volatility
+from helpers import Volatility, ChainCache, SurfaceState
 import plotly.graph_objects as go
-from scipy.interpolate import griddata
 
 # --- Streamlit App Input & Layout --- 
 # Title
@@ -26,12 +25,30 @@ if "surface_option_type" not in st.session_state:
 option_type = st.sidebar.selectbox("Option Type:", ["Call", "Put"], index=["Call", "Put"].index(st.session_state.surface_option_type))
 st.session_state.surface_option_type = option_type
 
+# IV Source Selection
+iv_sources = {"Vendor": ('vendor', 'European'), "Model (European)": ('model', 'European'), "Model (American)": ('model', 'American')}
+if "surface_iv_source" not in st.session_state:
+    st.session_state.surface_iv_source = "Vendor"
+iv_source = st.sidebar.selectbox("IV Source:", list(iv_sources), index=list(iv_sources).index(st.session_state.surface_iv_source))
+st.session_state.surface_iv_source = iv_source
+
 # Validation
 options_df = pd.DataFrame()
 if ticker and option_type:
-    vol = Volatility(ticker=ticker)
-    options_df = vol.spot_iv_surface(option_type)
-    px = vol.last_px()
+    # The chain table and triangulations persist across reruns; a new state is built only for a new ticker or IV source
+    state_key = (ticker, iv_source)
+    if st.session_state.get("surface_state_key") != state_key:
+        vol = Volatility(ticker=ticker, iv_source=iv_sources[iv_source][0], style=iv_sources[iv_source][1], cache=ChainCache(ttl=60))
+        st.session_state.surface_state = SurfaceState(vol)
+        st.session_state.surface_state_key = state_key
+    surface_state = st.session_state.surface_state
+
+    if st.sidebar.button("Refresh Quotes"):
+        changed = surface_state.refresh()
+        st.sidebar.caption(f"Updated {len(changed)} expiration(s)" if changed else "No quotes changed since the last refresh")
+
+    options_df = surface_state.table
+    px = surface_state.vol.stock_px
 else:
     st.warning("Please enter a ticker and option type to plot...")
 
@@ -81,11 +98,18 @@ if min_strike > max_strike:
 # Meshgrid Toggle
 on = st.sidebar.toggle("Activate Meshgrid")
 
+# Surface Fit Selection
+surface_fits = {"SVI (per expiry)": 'SVI', "SSVI (global)": 'SSVI', "Linear (raw points)": 'Linear'}
+if "surface_fit" not in st.session_state:
+    st.session_state.surface_fit = "SVI (per expiry)"
+surface_fit = st.sidebar.selectbox("Surface Fit:", list(surface_fits), index=list(surface_fits).index(st.session_state.surface_fit), 
+                                   disabled=not on)
+st.session_state.surface_fit = surface_fit
+
 # --- Streamlit App Ouput --- 
 if not options_df.empty:
-    options_df = options_df[(options_df['expiryDays'] >= int(min_expiry)) & (options_df['expiryDays'] <= int(max_expiry))].copy()
-    options_df = options_df[(options_df['strike'] >= int(min_strike)) & (options_df['strike'] <= int(max_strike))].copy()
-    options_df = options_df[(options_df['impliedVolatility'] > 1)].copy()
+    mask = surface_state.mask(option_type, int(min_expiry), int(max_expiry), int(min_strike), int(max_strike))
+    options_df = options_df[mask]
 
     if options_df.empty:
         st.warning("No data available for the selected filters. Please adjust the ranges...")
@@ -109,14 +133,8 @@ if not options_df.empty:
         if on:
             if len(options_df) > 3: 
                 try:
-                    grid_expiry = np.linspace(options_df['expiryDays'].min(), options_df['expiryDays'].max(), 50)
-                    grid_strike = np.linspace(options_df['strike'].min(), options_df['strike'].max(), 50)
-                    X, Y = np.meshgrid(grid_expiry, grid_strike)
-
-                    Z = griddata((options_df['expiryDays'], options_df['strike']),
-                                options_df['impliedVolatility'],
-                                (X, Y),
-                                method='linear')
+                    model = surface_fits[surface_fit]
+                    X, Y, Z = surface_state.grid(option_type, mask, grid_size=50 if model == 'Linear' else 100, model=model)
 
                     if np.isfinite(Z).any():
                         fig.add_trace(go.Surface(
@@ -148,6 +166,7 @@ if not options_df.empty:
             ),
             height=1000,
             margin=dict(l=50, r=50, b=50, t=50),
+            uirevision=ticker # Keeps the camera when only the filters change
         )
 
         st.plotly_chart(fig, use_container_width=True)
@@ -26,6 +26,13 @@ frwd_period = st.sidebar.number_input("Forward Period (days):",
                                       value=st.session_state.term_frwd_period)
 st.session_state.term_frwd_period = frwd_period
 
+# IV Source Selection
+iv_sources = {"Vendor": ('vendor', 'European'), "Model (European)": ('model', 'European'), "Model (American)": ('model', 'American')}
+if "term_iv_source" not in st.session_state:
+    st.session_state.term_iv_source = "Vendor"
+iv_source = st.sidebar.selectbox("IV Source:", list(iv_sources), index=list(iv_sources).index(st.session_state.term_iv_source))
+st.session_state.term_iv_source = iv_source
+
 # Sidebar 
 st.sidebar.header("Dashboard Settings")
 
@@ -70,7 +77,8 @@ st.session_state.term_pct_band = pct_band
 if all(v is not None for v in [ticker, pct_band, frwd_period]):
     col1, col2 = st.columns([3,3])
 
-    vol = Volatility(ticker=ticker, pct_band=pct_band, frwd_period=int(frwd_period))
+    vol = Volatility(ticker=ticker, pct_band=pct_band, frwd_period=int(frwd_period), 
+                     iv_source=iv_sources[iv_source][0], style=iv_sources[iv_source][1], cache=ChainCache())
 
     spot_call_iv_ls, spot_put_iv_ls = vol.spot_iv()
     expiration_days_ls = vol.cutoff_expiration_days_dates()[1]
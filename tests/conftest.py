@@ -0,0 +1,66 @@
+import collections
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import helpers.data
+from helpers import BlackScholes
+
+Chain = collections.namedtuple('Chain', ['calls', 'puts'])
+
+
+class FakeTicker:
+    """
+    Offline stand-in for yfinance.Ticker: a spot of 100 with calls and puts on a smile for four
+    expirations. Quote requests are counted in requests, and iv_shift ({expiry: shift}) moves
+    the IVs of single expirations to simulate new quotes.
+    """
+    spot = 100.0
+    days = [10, 40, 100, 200]
+    strikes = np.arange(70.0, 135.0, 5.0)
+    requests = collections.Counter()
+    iv_shift = {}
+
+    def __init__(self, ticker: str):
+        self.ticker = ticker
+        self.info = {'dividendYield': 1.0}
+
+    @property
+    def options(self):
+        self.requests['options'] += 1
+        return tuple((date.today() + timedelta(days=d)).isoformat() for d in self.days)
+
+    def history(self, period='1d'):
+        self.requests['history'] += 1
+        return pd.DataFrame({'Close': [self.spot]})
+
+    def option_chain(self, expiry: str):
+        self.requests['option_chain'] += 1
+        t = (date.fromisoformat(expiry) - date.today()).days / 365
+
+        def side(option_type):
+            iv = 0.2 + 0.4 * np.log(self.strikes / self.spot)**2 + 0.02 * (option_type == 'Put') + self.iv_shift.get(expiry, 0.0)
+            px = BlackScholes.batch(self.strikes, self.spot, 0.04, t, iv, 0.04, option_type)['px']
+            return pd.DataFrame({
+                'contractSymbol': [f"{self.ticker}{expiry}{option_type[0]}{k:g}" for k in self.strikes],
+                'strike': self.strikes,
+                'lastPrice': px,
+                'bid': px * 0.99,
+                'ask': px * 1.01,
+                'volume': 10.0 * np.arange(1, len(self.strikes) + 1),
+                'openInterest': 100.0 * np.arange(len(self.strikes), 0, -1),
+                'impliedVolatility': iv
+            })
+
+        return Chain(side('Call'), side('Put'))
+
+
+@pytest.fixture
+def fake_ticker(monkeypatch):
+    """Routes every quote request of the data layer to FakeTicker"""
+    FakeTicker.requests.clear()
+    monkeypatch.setattr(FakeTicker, 'iv_shift', {})
+    monkeypatch.setattr(helpers.data, '_yf_ticker', FakeTicker)
+    return FakeTicker
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from helpers import (BlackScholes, LRUCache, Leg, Matrix, Strategy, cube_cache, greeks_cache, grids_cache,
+                     matrix_cache, option_greeks)
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    for key in [1, 2, 1, 3, 2]:
+        cache.get_or_compute(key, lambda: key)
+
+    assert cache.info() == {'hits': 1, 'misses': 4, 'size': 2, 'maxsize': 2}
+    assert list(cache._entries) == [3, 2]
+
+
+def test_matrix_grid_is_shared_across_premium_and_direction():
+    matrix_cache.clear()
+    long = Matrix(600, 20, 0.25, 650, 0.04, 0.5, 0.017, 'Put').get_matrix('Long')
+    short = Matrix(600, 25, 0.25, 650, 0.04, 0.5, 0.017, 'Put').get_matrix('Short')
+
+    np.testing.assert_allclose(long + 20, 25 - short)
+    assert matrix_cache.info()['hits'] == 1
+
+
+def test_grids_are_memoized_by_inputs_and_direction():
+    grids_cache.clear()
+    matrix = lambda px: Matrix(600, px, 0.25, 650, 0.04, 0.5, 0.017, 'Put')
+    first = matrix(20).get_grids('Long')
+    first['PnL'] = None
+
+    again = matrix(20).get_grids('Long')
+    short = matrix(20).get_grids('Short')
+    repriced = matrix(25).get_grids('Long')
+
+    np.testing.assert_allclose(short['delta'], -again['delta'])
+    np.testing.assert_allclose(repriced['PnL'], again['PnL'] - 5)
+    assert not again['PnL'].flags.writeable
+    assert grids_cache.info() == {'hits': 1, 'misses': 3, 'size': 3, 'maxsize': grids_cache.maxsize}
+
+
+def test_strategy_grids_are_memoized_by_inputs():
+    grids_cache.clear()
+    strategy = lambda qty: Strategy([Leg('Call', 650, qty, 0.25, 3.0), Leg('Put', 550, qty, 0.3, 4.0)], 600, 0.04, 0.5, 0.017)
+
+    first = strategy(1).get_grids()
+    again = strategy(1).get_grids()
+    short = strategy(-1).get_grids()
+
+    assert again is not first and again['gamma'] is first['gamma']
+    np.testing.assert_allclose(short['PnL'], -first['PnL'])
+    assert grids_cache.info()['hits'] == 1
+
+
+def test_option_greeks_are_memoized_and_copied():
+    greeks_cache.clear()
+    first = option_greeks(650, 600, 0.04, 0.5, 0.25, 0.017, 'put')
+    first['delta'] = 0.0
+
+    again = option_greeks(650, 600, 0.04, 0.5, 0.25, 0.017, 'Put')
+
+    assert again['delta'] == pytest.approx(BlackScholes(650, 600, 0.04, 0.5, 0.25, 0.017).delta('Put'))
+    assert greeks_cache.info()['hits'] == 1
+
+
+def test_scenario_cube_is_memoized_by_inputs():
+    cube_cache.clear()
+    strategy = lambda iv: Strategy([Leg('Call', 650, 1, iv, 3.0)], 600, 0.04, 0.5, 0.017)
+
+    first = strategy(0.25).scenario_cube(days=[0, 10, 20])
+    strategy(0.30).scenario_cube(days=[0, 10, 20])
+    again = strategy(0.25).scenario_cube(days=[0, 10, 20])
+
+    assert again is first
+    assert cube_cache.info()['hits'] == 1 and cube_cache.info()['misses'] == 2
+    assert not first.pnl.flags.writeable
@@ -0,0 +1,250 @@
+import asyncio
+import collections
+import json
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers import (AsyncFetcher, ChainCache, FetchError, RateLimiter, SVISurface, SurfaceState, SurfaceStore,
+                     Underlying, Volatility, YieldCurve, YieldCurveProvider, interpolate_rates, scan_volatility)
+
+
+def test_chain_cache_round_trips_a_chain(tmp_path, fake_ticker):
+    cache = ChainCache(str(tmp_path))
+    chain = fake_ticker('SPY').option_chain('2030-01-18')
+
+    cache.put_chain('SPY', '2030-01-18', chain.calls, chain.puts)
+    cached = cache.get_chain('SPY', '2030-01-18')
+
+    pd.testing.assert_frame_equal(cached.calls, chain.calls)
+    pd.testing.assert_frame_equal(cached.puts, chain.puts)
+    assert cache.get_chain('SPY', '2030-02-15') is None
+
+
+def test_underlying_serves_repeat_requests_from_the_cache(tmp_path, fake_ticker):
+    cache = ChainCache(str(tmp_path))
+    expiry = Underlying('SPY', cache).expirations()[0]
+
+    for _ in range(2):
+        underlying = Underlying('SPY', cache)
+        underlying.expirations()
+        underlying.option_chain(expiry)
+
+    assert fake_ticker.requests['options'] == 1 and fake_ticker.requests['option_chain'] == 1
+    offline = Underlying('SPY', ChainCache(str(tmp_path), ttl=0, offline=True))
+    assert len(offline.option_chain(expiry).calls) == len(fake_ticker.strikes)
+
+
+def test_volatility_fetches_each_chain_once(fake_ticker):
+    vol = Volatility('SPY')
+
+    call_iv, put_iv = vol.forward_iv()
+    vol.spot_iv()
+    vol.forward_iv()
+
+    assert len(call_iv) == len(put_iv) == len(fake_ticker.days) - 1
+    assert fake_ticker.requests['options'] == 1
+    assert fake_ticker.requests['option_chain'] == len(fake_ticker.days)
+
+
+def test_yield_curve_provider_shares_one_daily_snapshot(tmp_path, monkeypatch):
+    fetches = []
+    monkeypatch.setattr(YieldCurveProvider, '_fetch', lambda self: fetches.append(1) or {30: 0.05, 365: 0.04})
+    path = str(tmp_path / 'rates.json')
+
+    provider = YieldCurveProvider(path=path)
+    assert provider.get() == provider.get() == {30: 0.05, 365: 0.04}
+    assert YieldCurveProvider(path=path).get() == {30: 0.05, 365: 0.04} # Served from the disk snapshot
+    assert len(fetches) == 1
+
+
+def test_yield_curve_provider_reads_a_fixture(tmp_path):
+    fixture = tmp_path / 'curve.json'
+    fixture.write_text(json.dumps({'30': 0.05, '365': 0.04}))
+
+    assert YieldCurveProvider(path=str(tmp_path / 'rates.json'), fixture=str(fixture)).get() == {30: 0.05, 365: 0.04}
+
+
+def test_yield_curve_interpolates_between_knots():
+    rates = {30: 0.05, 365: 0.04, 730: 0.035}
+    curve = YieldCurve(rates)
+    t = np.array([0.01, 30 / 365, 0.5, 1.0, 1.5, 5.0])
+
+    expected = np.interp(t, np.array([30, 365, 730]) / 365, [0.05, 0.04, 0.035])
+    np.testing.assert_allclose(curve.rate(t), expected)
+    assert curve.rate(1.5) == pytest.approx(interpolate_rates(rates, 1.5))
+    np.testing.assert_allclose(curve.discount_factor(t), np.exp(-expected * t))
+
+
+@pytest.mark.parametrize('method', ['linear', 'log_linear', 'monotone_cubic'])
+def test_yield_curve_methods_hit_the_knots(method):
+    curve = YieldCurve({30: 0.05, 365: 0.04, 730: 0.035}, method)
+
+    np.testing.assert_allclose(curve.rate(np.array([30, 365, 730]) / 365), [0.05, 0.04, 0.035])
+    assert curve.forward_rate(1.0, 2.0) == pytest.approx(0.03)
+
+
+def test_async_fetcher_retries_failed_keys():
+    attempts = collections.Counter()
+
+    def flaky(key):
+        attempts[key] += 1
+        if attempts[key] < 2:
+            raise ConnectionError(key)
+        return key * 2
+
+    assert AsyncFetcher(retries=2, backoff=0).run(flaky, [1, 2, 3]) == {1: 2, 2: 4, 3: 6}
+    assert attempts == {1: 2, 2: 2, 3: 2}
+
+
+def test_async_fetcher_keeps_partial_results_on_failure():
+    def transport(key):
+        if key == 'bad':
+            raise ConnectionError(key)
+        return key.upper()
+
+    with pytest.raises(FetchError) as error:
+        AsyncFetcher(retries=1, backoff=0).run(transport, ['a', 'bad', 'b'])
+
+    assert error.value.results == {'a': 'A', 'b': 'B'}
+    assert list(error.value.errors) == ['bad']
+
+
+def test_async_fetcher_limits_concurrency():
+    in_flight, peak = [0], [0]
+
+    async def transport(key):
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        await asyncio.sleep(0.01)
+        in_flight[0] -= 1
+        return key
+
+    assert len(AsyncFetcher(max_concurrency=3).run(transport, range(12))) == 12
+    assert peak[0] == 3
+
+
+def test_async_fetcher_keeps_timed_out_threads_within_the_limit():
+    in_flight, peak, lock = [0], [0], threading.Lock()
+
+    def transport(key):
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        time.sleep(0.3 if key == 'hung' else 0.01)
+        with lock:
+            in_flight[0] -= 1
+        return key
+
+    with pytest.raises(FetchError) as error:
+        AsyncFetcher(max_concurrency=2, timeout=0.05, retries=1, backoff=0).run(transport, ['hung', 'a', 'b', 'c'])
+
+    assert error.value.results == {'a': 'a', 'b': 'b', 'c': 'c'}
+    assert isinstance(error.value.errors['hung'], TimeoutError)
+    assert peak[0] == 2 # The abandoned attempt kept its slot until its thread returned
+
+
+def test_chain_table_holds_both_sides_of_every_expiry(fake_ticker):
+    vol = Volatility('SPY')
+
+    table = vol.chain_table()
+    calls = vol.spot_iv_surface('Call')
+
+    assert len(table) == 2 * len(fake_ticker.days) * len(fake_ticker.strikes)
+    assert (calls['optionType'] == 'Call').all() and len(calls) == len(table) // 2
+    assert table['expiryDate'].nunique() == len(fake_ticker.days)
+    put_ivs = table.loc[table['optionType'] == 'Put', 'impliedVolatility'].to_numpy()
+    np.testing.assert_allclose(put_ivs - calls['impliedVolatility'].to_numpy(), 2.0, atol=1e-4) # Percent
+
+
+def test_atm_iv_table_weights_the_band_by_volume(fake_ticker):
+    vol = Volatility('SPY', pct_band=0.06)
+    expiry = vol.expirations_dates()[0]
+    calls = fake_ticker('SPY').option_chain(expiry).calls
+    band = calls[(calls['strike'] > 94) & (calls['strike'] < 106)]
+
+    atm = vol.atm_iv_table()
+
+    assert len(atm) == 2 * len(fake_ticker.days)
+    row = atm[(atm['optionType'] == 'Call')].iloc[0]
+    assert row['volumeWeightedIV'] == pytest.approx(np.average(band['impliedVolatility'], weights=band['volume']), rel=1e-6)
+    assert row['atmIV'] == pytest.approx(0.2, rel=1e-6)
+    assert vol.spot_iv()[0][0] == row['volumeWeightedIV']
+
+
+def test_surface_state_refreshes_only_changed_expirations(fake_ticker):
+    state = SurfaceState(Volatility('SPY'))
+    mask = state.mask('Call', 0, 365, 80, 120)
+    before = state.grid('Call', mask, grid_size=10)[2]
+    expiry = state.vol.expirations_dates()[1]
+
+    assert state.refresh() == []
+    fake_ticker.iv_shift[expiry] = 0.05
+    assert state.refresh() == [expiry]
+
+    shifted = state.table[state.table['expiryDate'].astype(str) == expiry]
+    np.testing.assert_allclose(shifted['impliedVolatility'].min(), 25.0, rtol=1e-6)
+    after = state.grid('Call', state.mask('Call', 0, 365, 80, 120), grid_size=10)[2]
+    assert np.nanmax(after - before) > 0
+
+
+def smile_table(shift: float = 0.0) -> pd.DataFrame:
+    """Both sides of a chain table from a 100 spot on an SSVI surface with a flat 20% ATM term structure, IVs shifted by shift (%)"""
+    days, strike = [x.ravel() for x in np.meshgrid([20, 60, 120, 250], np.arange(70.0, 135.0, 5.0), indexing='ij')]
+    w = SVISurface._ssvi(np.log(strike / 100), 0.04 * days / 365, rho=-0.3, eta=1.0, gamma=0.5)
+    side = pd.DataFrame({'strike': strike, 'impliedVolatility': np.sqrt(w / (days / 365)) * 100 + shift, 'expiryDays': days})
+    return pd.concat([side.assign(optionType='Call'), side.assign(optionType='Put')], ignore_index=True)
+
+
+@pytest.mark.parametrize('model', ['SVI', 'SSVI'])
+def test_svi_surface_fits_a_smile(model):
+    table = smile_table()
+    calls = table[table['optionType'] == 'Call']
+
+    surface = SVISurface(model).fit(calls, s=100)
+
+    np.testing.assert_allclose(surface.implied_vol(calls['expiryDays'], calls['strike']), calls['impliedVolatility'], atol=1.0)
+    restored = SVISurface.from_dict(surface.to_dict())
+    np.testing.assert_allclose(restored.implied_vol([45, 90], [95, 105]), surface.implied_vol([45, 90], [95, 105]))
+
+
+def test_surface_store_averages_daily_snapshots(tmp_path):
+    store = SurfaceStore(str(tmp_path))
+    first = store.append('SPY', smile_table(), 100, date='2024-03-01')
+    second = store.append('SPY', smile_table(shift=2.0), 100, date='2024-03-04')
+
+    surface, n = store.average('SPY', period=15)
+
+    assert store.dates('SPY') == ['2024-03-01', '2024-03-04']
+    np.testing.assert_allclose(store.load('SPY', '2024-03-04'), second)
+    np.testing.assert_allclose(surface, (first + second) / 2)
+    assert np.all(n[np.isfinite(surface)] == 2)
+    np.testing.assert_allclose(store.average('SPY', period=1)[0], second) # Only the last snapshot in range
+
+
+def test_scan_volatility_reports_every_ticker(fake_ticker):
+    class Delisted(fake_ticker):
+        @property
+        def options(self):
+            raise LookupError(f"{self.ticker} has no options")
+
+    transport = lambda ticker: Delisted(ticker) if ticker == 'GONE' else fake_ticker(ticker)
+
+    rows = {row['ticker']: row for row in scan_volatility(['spy', 'QQQ', 'GONE', 'SPY'], max_workers=2, transport=transport)}
+
+    assert sorted(rows) == ['GONE', 'QQQ', 'SPY']
+    assert 'error' in rows['GONE']
+    assert rows['SPY']['atm_iv'] == pytest.approx(0.21, rel=1e-6) # Mean of the call and put ATM IVs
+    assert rows['SPY']['skew'] > 0 and rows['SPY']['expirations'] == len(fake_ticker.days)
+
+
+def test_rate_limiter_paces_requests():
+    limiter = RateLimiter(rate=50, burst=5)
+    start = time.monotonic()
+    for _ in range(15):
+        limiter.acquire()
+
+    assert time.monotonic() - start >= 10 / 50 * 0.9
@@ -0,0 +1,30 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loaded_modules(code: str) -> list[str]:
+    """Runs code in a fresh interpreter and returns the heavy modules it imported"""
+    heavy = ['pandas', 'matplotlib', 'yfinance', 'requests', 'scipy.optimize']
+    script = f"import sys\n{code}\nprint([m for m in {heavy!r} if m in sys.modules])"
+    result = subprocess.run([sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True, check=True)
+    return eval(result.stdout.strip().splitlines()[-1])
+
+
+def test_package_import_is_lazy():
+    assert loaded_modules("import helpers") == []
+
+
+def test_pricing_names_load_only_the_pricing_layer():
+    assert loaded_modules("from helpers import BlackScholes, Matrix\nMatrix(600, 20, 0.25, 650, 0.04, 0.5, 0.017, 'Call').get_matrix()") == []
+    assert 'pandas' in loaded_modules("from helpers import Volatility")
+
+
+def test_star_import_exposes_every_layer():
+    namespace = {}
+    exec("from helpers import *", namespace)
+
+    for name in ['np', 'BlackScholes', 'Strategy', 'Volatility', 'YieldCurve', 'Plotting']:
+        assert name in namespace
@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+
+matplotlib = pytest.importorskip('matplotlib')
+matplotlib.use('Agg')
+
+from helpers import GREEK_GRIDS, Leg, Matrix, Plotting, Strategy
+
+
+@pytest.fixture
+def put_matrix():
+    return Matrix(600, 20, 0.25, 650, 0.04, 0.5, 0.017, 'Put')
+
+
+def test_image_renderer_caches_the_png(put_matrix):
+    plot = Plotting(put_matrix.get_matrix(), put_matrix, 'Single', 'SPY')
+
+    first = plot.plot_image(option_type='Put')
+
+    assert first.startswith(b'\x89PNG')
+    assert plot.plot_image(option_type='Put') is first
+    assert Plotting(put_matrix.get_matrix('Short'), put_matrix, 'Single', 'SPY').plot_image('Short', 'Put') is not first
+
+
+def test_interactive_renderer_draws_the_grid(put_matrix):
+    pytest.importorskip('plotly')
+    grid = put_matrix.get_matrix()
+
+    figure = Plotting(grid, put_matrix, 'Single', 'SPY').plot_interactive(option_type='Put')
+
+    np.testing.assert_allclose(np.asarray(figure.data[0].z, dtype=float), grid)
+
+
+def test_image_renderer_draws_from_threads_without_pyplot(put_matrix):
+    import sys
+    from concurrent.futures import ThreadPoolExecutor
+
+    Plotting._raster_cache.clear()
+    plots = [Plotting(put_matrix.get_matrix(direction), put_matrix, 'Single', 'SPY') for direction in ('Long', 'Short')] * 4
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        images = list(pool.map(lambda plot: plot.plot_image(option_type='Put', dpi=40), plots))
+
+    assert all(image.startswith(b'\x89PNG') for image in images)
+    assert len(set(images)) == 2
+    if 'matplotlib.pyplot' in sys.modules:
+        import matplotlib.pyplot as plt
+        assert not plt.get_fignums() # Figures never reach pyplot's global registry
+
+
+@pytest.fixture
+def max_iv_step_matrix():
+    # At the slider maximum (25%) the lowest of the 9 IV levels would be exactly zero
+    return Matrix(600, 3, 0.25, 650, 0.04, 0.5, 0.017, 'Call', iv_step=0.25, spot_step=0.25)
+
+
+def test_grid_levels_stay_positive_at_max_step(max_iv_step_matrix):
+    assert np.all(max_iv_step_matrix.offset_iv_arr() > 0)
+    assert np.all(max_iv_step_matrix.offset_spot_arr() > 0)
+
+
+@pytest.mark.parametrize('style,engine', [('European', None), ('American', 'Binomial'), ('American', 'BaroneAdesiWhaley')])
+def test_greek_grids_are_finite_at_max_iv_step(style, engine):
+    matrix = Matrix(600, 3, 0.25, 650, 0.04, 0.5, 0.017, 'Call', style, iv_step=0.25, engine=engine, tol=0.05)
+
+    grids = matrix.get_grids()
+
+    for name in ['PnL'] + GREEK_GRIDS:
+        assert np.all(np.isfinite(grids[name])), name
+
+
+def test_strategy_greek_grids_are_finite_at_max_iv_step():
+    legs = [Leg('Call', 650, 1, 0.25, 3.0), Leg('Put', 650, 1, 0.25, 50.0)]
+    grids = Strategy(legs, 600, 0.04, 0.5, 0.017, iv_step=0.25).get_grids()
+
+    for name in ['PnL'] + GREEK_GRIDS:
+        assert np.all(np.isfinite(grids[name])), name
+
+
+@pytest.mark.parametrize('metric', ['PnL'] + GREEK_GRIDS)
+def test_image_renderer_at_max_iv_step(max_iv_step_matrix, metric):
+    plot = Plotting(max_iv_step_matrix.get_grids()[metric], max_iv_step_matrix, 'Single', 'SPY')
+
+    assert plot.plot_image(metric=metric).startswith(b'\x89PNG')
+
+
+@pytest.mark.parametrize('metric', ['PnL'] + GREEK_GRIDS)
+def test_interactive_renderer_at_max_iv_step(max_iv_step_matrix, metric):
+    pytest.importorskip('plotly')
+    plot = Plotting(max_iv_step_matrix.get_grids()[metric], max_iv_step_matrix, 'Single', 'SPY')
+
+    plot.plot_interactive(metric=metric).to_json()
+
+
+@pytest.mark.parametrize('grid', [
+    np.where(np.arange(81).reshape(9, 9) < 9, np.nan, np.arange(81.0).reshape(9, 9) - 40), # NaN row, like an IV=0 lattice
+    np.full((9, 9), np.nan),
+    np.full((9, 9), 2.5),
+    np.zeros((9, 9)),
+    np.where(np.eye(9, dtype=bool), np.inf, 1.0),
+], ids=['nan-row', 'all-nan', 'flat', 'zeros', 'inf'])
+def test_renderers_handle_degenerate_grids(max_iv_step_matrix, grid):
+    plot = Plotting(grid, max_iv_step_matrix, 'Single', 'SPY')
+
+    spec = plot._plot_spec()
+    assert spec['vmin'] < spec['vcenter'] < spec['vmax']
+    assert plot.plot_image().startswith(b'\x89PNG')
+    pytest.importorskip('plotly')
+    plot.plot_interactive().to_json()
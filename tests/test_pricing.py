@@ -0,0 +1,256 @@
+import numpy as np
+import pytest
+
+from helpers import (BaroneAdesiWhaley, Binomial, BlackScholes, GREEK_GRIDS, Leg, Matrix, Strategy,
+                     implied_volatility, set_kernel_backend)
+
+
+@pytest.mark.parametrize('option_type', ['Call', 'Put'])
+def test_black_scholes_batch_matches_scalar_methods(option_type):
+    spots, ivs = np.array([540.0, 600.0, 660.0]), np.array([0.15, 0.25, 0.40])
+    batch = BlackScholes.batch(650, spots, 0.04, 0.5, ivs, 0.017, option_type)
+
+    for i, (s, iv) in enumerate(zip(spots, ivs)):
+        bs = BlackScholes(650, s, 0.04, 0.5, iv, 0.017)
+        px = bs.call_px() if option_type == 'Call' else bs.put_px()
+        np.testing.assert_allclose(batch['px'][i], px)
+        np.testing.assert_allclose(batch['delta'][i], bs.delta(option_type))
+        np.testing.assert_allclose(batch['gamma'][i], bs.gamma())
+        np.testing.assert_allclose(batch['vega'][i], bs.vega())
+        np.testing.assert_allclose(batch['theta'][i], bs.theta(option_type))
+        np.testing.assert_allclose(batch['rho'][i], bs.rho(option_type))
+
+
+def test_black_scholes_batch_broadcasts_option_types():
+    batch = BlackScholes.batch(650, 600, 0.04, 0.5, 0.25, 0.017, ['Call', 'Put'])
+    call = BlackScholes.batch(650, 600, 0.04, 0.5, 0.25, 0.017, 'Call')['px']
+    put = BlackScholes.batch(650, 600, 0.04, 0.5, 0.25, 0.017, 'Put')['px']
+
+    np.testing.assert_allclose(batch['px'], [call, put])
+
+
+def test_matrix_prices_every_cell_of_the_grid():
+    matrix = Matrix(600, 20, 0.25, 650, 0.04, 0.5, 0.017, 'Put', grid_size=7)
+    long = matrix.get_matrix('Long')
+
+    assert long.shape == (7, 7)
+    for i, iv in enumerate(matrix.offset_iv_arr()):
+        for j, spot in enumerate(matrix.offset_spot_arr()):
+            np.testing.assert_allclose(long[i, j], BlackScholes(650, spot, 0.04, 0.5, iv, 0.017).put_px() - 20)
+    np.testing.assert_allclose(matrix.get_matrix('Short'), -long)
+
+
+@pytest.mark.parametrize('style', ['American', 'European'])
+def test_binomial_batch_matches_scalar_tree(style):
+    spots = np.array([90.0, 100.0, 110.0])
+    batch = Binomial.batch(100, spots, 0.04, 0.5, 0.3, 0.02, ['Call', 'Put', 'Put'], n=200, style=style)['px']
+
+    scalar = [Binomial(100, 90, 0.04, 0.5, 0.3, 0.02, n=200, style=style, calc='recursive').call_px(), 
+              Binomial(100, 100, 0.04, 0.5, 0.3, 0.02, n=200, style=style, calc='recursive').put_px(), 
+              Binomial(100, 110, 0.04, 0.5, 0.3, 0.02, n=200, style=style, calc='recursive').put_px()]
+    np.testing.assert_allclose(batch, scalar)
+
+
+@pytest.mark.parametrize('option_type', ['Call', 'Put'])
+def test_binomial_lattice_greeks_converge_to_black_scholes(option_type):
+    # Black-Scholes takes the cost of carry and the tree the dividend yield, so b=r against b=0 prices the same stock
+    spots = np.array([90.0, 100.0, 110.0])
+    tree = Binomial.batch(100, spots, 0.04, 0.5, 0.3, 0.0, option_type, n=1000, style='European', greeks=True)
+    closed = BlackScholes.batch(100, spots, 0.04, 0.5, 0.3, 0.04, option_type)
+
+    np.testing.assert_allclose(tree['delta'], closed['delta'], atol=2e-3)
+    np.testing.assert_allclose(tree['gamma'], closed['gamma'], rtol=2e-2)
+    np.testing.assert_allclose(tree['vega'], closed['vega'], rtol=1e-2)
+    np.testing.assert_allclose(tree['theta'], closed['theta'], rtol=2e-2)
+    np.testing.assert_allclose(tree['rho'], closed['rho'], rtol=1e-2)
+
+
+def test_barone_adesi_whaley_tracks_the_american_tree():
+    spots = np.array([80.0, 90.0, 100.0, 110.0, 120.0])
+    for option_type in ['Call', 'Put']:
+        baw = BaroneAdesiWhaley.batch(100, spots, 0.04, 0.5, 0.3, 0.02, option_type)['px']
+        tree = Binomial.batch(100, spots, 0.04, 0.5, 0.3, 0.02, option_type, n=1000, style='American')['px']
+        european = Binomial.batch(100, spots, 0.04, 0.5, 0.3, 0.02, option_type, n=1000, style='European')['px']
+
+        np.testing.assert_allclose(baw, tree, rtol=5e-3, atol=0.02)
+        assert np.all(baw >= european - 1e-2)
+
+
+def test_barone_adesi_whaley_call_without_dividend_is_european():
+    baw = BaroneAdesiWhaley(100, 95, 0.04, 0.5, 0.3, 0.0)
+    european = BaroneAdesiWhaley._european(100, 95, 0.04, 0.5, 0.3, 0.0, 1.0)[0]
+
+    np.testing.assert_allclose(baw.call_px(), european)
+
+
+def test_binomial_adaptive_meets_its_tolerance():
+    spots = np.array([80.0, 95.0, 100.0, 105.0, 120.0])
+    reference = Binomial.batch(100, spots, 0.04, 0.5, 0.3, 0.02, 'Put', n=4000, style='American')['px']
+
+    result = Binomial.adaptive(100, spots, 0.04, 0.5, 0.3, 0.02, 'Put', tol=0.005, style='American')
+
+    np.testing.assert_allclose(result['px'], reference, atol=0.005)
+    assert np.all(result['error'] <= 0.005) and np.all(result['steps'] <= 800)
+
+
+@pytest.mark.parametrize('batch', [Binomial.batch, Binomial.adaptive])
+def test_binomial_rejects_negative_inputs(batch):
+    with pytest.raises(AssertionError):
+        batch(100, np.array([95.0, -1.0]), 0.04, 0.5, 0.3, 0.02, 'Put')
+
+
+def test_kernel_backends_agree():
+    pytest.importorskip('numba')
+    prices = {}
+    for backend in ['numba', 'numpy']:
+        set_kernel_backend(backend)
+        bs = BlackScholes(650, 600, 0.04, 0.5, 0.25, 0.017)
+        tree = Binomial(100, 95, 0.04, 0.5, 0.3, 0.02, n=200, calc='recursive')
+        prices[backend] = [bs.call_px(), bs.put_px(), bs.delta('Put'), tree.call_px(), tree.put_px()]
+
+    np.testing.assert_allclose(prices['numba'], prices['numpy'])
+
+
+def test_unknown_kernel_backend_is_rejected():
+    with pytest.raises(ValueError):
+        set_kernel_backend('fortran')
+
+
+@pytest.mark.parametrize('option_type', ['Call', 'Put'])
+@pytest.mark.parametrize('b', [0.0, 0.02])
+def test_implied_volatility_round_trip_american(option_type, b):
+    k, s, r, t = np.array([90.0, 100.0, 110.0]), 100.0, 0.045, 0.5
+    px = Binomial.batch(k, s, r, t, 0.25, b, option_type, n=100, style='American')['px']
+
+    iv = implied_volatility(px, k, s, r, t, b, option_type, style='American', n=100)
+
+    np.testing.assert_allclose(iv, 0.25, atol=1e-5)
+
+
+def test_implied_volatility_is_nan_without_a_solution():
+    # Below intrinsic value, zero and missing prices have no implied volatility
+    px = np.array([5.0, 0.0, np.nan, 14.0])
+
+    iv = implied_volatility(px, 90.0, 100.0, 0.045, 0.5, 0.0, 'Call')
+
+    assert np.all(np.isnan(iv[:3])) and np.isfinite(iv[3])
+
+
+@pytest.mark.parametrize('style', ['European', 'American'])
+def test_single_leg_strategy_matches_matrix(style):
+    matrix = Matrix(600, 20, 0.25, 650, 0.04, 0.5, 0.017, 'Put', style)
+    strategy = Strategy([Leg('Put', 650, 1, 0.25, 20)], 600, 0.04, 0.5, 0.017, style)
+
+    np.testing.assert_allclose(strategy.get_matrix(), matrix.get_matrix('Long'))
+    np.testing.assert_allclose(Strategy([Leg('Put', 650, -1, 0.25, 20)], 600, 0.04, 0.5, 0.017, style).get_matrix(), 
+                               matrix.get_matrix('Short'))
+
+
+def test_strategy_sums_its_legs():
+    legs = [Leg('Call', 95, 1, 0.2, 4.0), Leg('Call', 100, -2, 0.25, 2.0), Leg('Call', 105, 1, 0.3, 1.0)]
+    strategy = Strategy(legs, 100, 0.04, 0.25, 0.0)
+
+    expected = sum(leg.qty * (BlackScholes.batch(leg.k, strategy.offset_spot_arr()[np.newaxis, :], 0.04, 0.25, 
+                                                 strategy.offset_iv_arr()[i][:, np.newaxis], 0.0, 'Call')['px'] - leg.px) 
+                   for i, leg in enumerate(legs))
+    np.testing.assert_allclose(strategy.get_matrix(), expected)
+    assert strategy.greeks()['delta'] == pytest.approx(sum(leg.qty * BlackScholes(leg.k, 100, 0.04, 0.25, leg.iv, 0.0).delta('Call') 
+                                                           for leg in legs))
+
+
+def test_scenario_cube_frames_match_the_strategy_grid():
+    strategy = Strategy([Leg('Call', 100, 1, 0.2, 5.0), Leg('Put', 95, -1, 0.22, 2.0)], spot=100, r=0.04, t=0.5, b=0.01)
+    cube = strategy.scenario_cube(days=[0, 30, 60], rates=[0.03, 0.04])
+
+    assert cube.pnl.shape == (9, 9, 3, 2)
+    np.testing.assert_allclose(cube.frame(0), strategy.get_matrix())
+    later = Strategy(strategy.legs, spot=100, r=0.03, t=0.5 - 30 / 365, b=0.01)
+    np.testing.assert_allclose(cube.frame(31, rate=0.03), later.get_matrix())
+    np.testing.assert_array_equal(cube.slice('day', 'rate', iv=1, spot=-2), cube.pnl[5, 2])
+
+
+def test_scenario_cube_level_offsets_index_from_the_base():
+    cube = Strategy([Leg('Call', 100, 1, 0.2, 5.0)], spot=100, r=0.04, t=0.5, b=0.01).scenario_cube(days=[0, 30])
+
+    np.testing.assert_array_equal(cube.slice('iv', 'day', spot=-4), cube.pnl[:, 0, :, 0])
+    np.testing.assert_array_equal(cube.slice('iv', 'day', spot=4), cube.pnl[:, -1, :, 0])
+
+
+def test_greek_grids_come_from_the_pnl_batch():
+    matrix = Matrix(600, 20, 0.25, 650, 0.04, 0.5, 0.017, 'Call')
+
+    grids = matrix.get_grids('Short')
+    closed = BlackScholes.batch(650, matrix.offset_spot_arr()[np.newaxis, :], 0.04, 0.5, 
+                                matrix.offset_iv_arr()[:, np.newaxis], 0.017, 'Call')
+
+    assert set(grids) == {'PnL', *GREEK_GRIDS}
+    np.testing.assert_allclose(grids['PnL'], matrix.get_matrix('Short'))
+    for greek in GREEK_GRIDS:
+        np.testing.assert_allclose(grids[greek], -closed[greek])
+
+
+def test_strategy_greek_grids_weight_legs_by_quantity():
+    legs = [Leg('Call', 650, 1, 0.25, 30.0), Leg('Put', 650, 1, 0.25, 50.0)]
+    strategy = Strategy(legs, 600, 0.04, 0.5, 0.017)
+
+    grids = strategy.get_grids()
+
+    np.testing.assert_allclose(grids['PnL'], strategy.get_matrix())
+    center = grids['delta'][4, 4]
+    assert center == pytest.approx(sum(BlackScholes.batch(650, 600, 0.04, 0.5, 0.25, 0.017, leg.option_type)['delta'] for leg in legs))
+
+
+@pytest.mark.parametrize('option_type', ['Call', 'Put'])
+@pytest.mark.parametrize('b', [0.0, 0.02])
+def test_implied_volatility_round_trip_european(option_type, b):
+    k, s, r, t = np.array([90.0, 100.0, 110.0]), 100.0, 0.045, 0.5
+    sign = 1.0 if option_type == 'Call' else -1.0
+    px = BaroneAdesiWhaley._european(k, s, r, t, 0.25, b, sign)[0]
+
+    iv = implied_volatility(px, k, s, r, t, b, option_type)
+
+    np.testing.assert_allclose(iv, 0.25, atol=1e-5)
+
+
+def test_implied_volatility_styles_agree_without_early_exercise():
+    # A call on a non-dividend stock is never exercised early, so both styles invert to the same IV
+    k, s, r, t = np.array([90.0, 100.0, 110.0]), 100.0, 0.045, 0.5
+    px = BaroneAdesiWhaley._european(k, s, r, t, 0.25, 0.0, 1.0)[0]
+
+    european = implied_volatility(px, k, s, r, t, 0.0, 'Call')
+    american = implied_volatility(px, k, s, r, t, 0.0, 'Call', style='American', n=400)
+
+    np.testing.assert_allclose(european, american, atol=5e-3)
+
+
+@pytest.mark.parametrize('k,t,iv,option_type', [
+    (150.0, 0.5, 0.10, 'Put'),
+    (130.0, 0.5, 0.10, 'Put'),
+    (60.0, 0.25, 0.20, 'Put'),
+    (55.0, 0.25, 0.20, 'Put'),
+    (100.0, 1 / 365, 0.25, 'Call'),
+    (103.0, 1 / 365, 0.25, 'Call'),
+    (95.0, 2 / 365, 0.25, 'Put'),
+], ids=['deep-itm', 'itm', 'deep-otm-1e-7', 'deep-otm-1e-9', 'expiry-atm', 'expiry-otm', 'expiry-put'])
+def test_implied_volatility_resolves_ill_conditioned_quotes(k, t, iv, option_type):
+    sign = 1.0 if option_type == 'Call' else -1.0
+    px = BaroneAdesiWhaley._european(k, 100.0, 0.04, t, iv, 0.0, sign)[0]
+
+    np.testing.assert_allclose(implied_volatility(px, k, 100.0, 0.04, t, 0.0, option_type), iv, atol=1e-6)
+
+
+def test_implied_volatility_is_nan_where_unresolved():
+    px = [BaroneAdesiWhaley._european(50.0, 100.0, 0.04, 0.5, 0.10, 0.0, 1.0)[0], # Vega ~1e-21, flat in volatility
+          BaroneAdesiWhaley._european(100.0, 100.0, 0.04, 0.5, 5.0, 0.0, 1.0)[0]] # Root on the upper bound
+    american = Binomial.batch(150.0, 100.0, 0.04, 0.5, 0.2, 0.0, 'Put', n=100, style='American')['px'] # Exercised now
+
+    assert np.all(np.isnan(implied_volatility(px, [50.0, 100.0], 100.0, 0.04, 0.5, 0.0, 'Call')))
+    assert np.isnan(implied_volatility(american, 150.0, 100.0, 0.04, 0.5, 0.0, 'Put', style='American', n=100))
+
+
+@pytest.mark.parametrize('offset', [-5, 5, 1.5])
+def test_scenario_cube_rejects_out_of_range_levels(offset):
+    cube = Strategy([Leg('Call', 100, 1, 0.2, 5.0)], spot=100, r=0.04, t=0.5, b=0.01).scenario_cube(days=[0, 30])
+
+    with pytest.raises(ValueError):
+        cube.slice('iv', 'day', spot=offset)